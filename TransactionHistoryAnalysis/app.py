@@ -1,10 +1,12 @@
 # app.py
 import streamlit as st
 import os
-import time
 import shutil
 import re
 from app_agents import AppAgentOrchestrator
+from event_worker import EventWorker
+from run_journal import list_runs
+from ingest import ingest_csv
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -24,10 +26,32 @@ AVATARS = {
 # --- Session State Initialization ---
 if "messages" not in st.session_state:
     st.session_state.messages = []
-if "run_generator" not in st.session_state:
-    st.session_state.run_generator = None
+if "worker" not in st.session_state:
+    st.session_state.worker = None
 if "analysis_running" not in st.session_state:
     st.session_state.analysis_running = False
+if "dataset" not in st.session_state:
+    st.session_state.dataset = None
+
+# --- Previous Runs (journaled under runs/) ---
+with st.sidebar:
+    st.subheader("Previous Runs")
+    previous_runs = list_runs()
+    run_labels = {run["run_id"]: f"{run['run_id']} ({run['status']}): {run['user_prompt'][:40]}" for run in previous_runs}
+    selected_run_id = st.selectbox(
+        "Select a run",
+        options=[None] + list(run_labels),
+        format_func=lambda run_id: "—" if run_id is None else run_labels[run_id]
+    )
+    resume_button = st.button(
+        "⏯️ Resume Run",
+        disabled=selected_run_id is None or st.session_state.analysis_running
+    )
+    build_on_selected_run = st.checkbox(
+        "Start the new analysis from this run's state",
+        disabled=selected_run_id is None,
+        help="Reuses the selected run's outputs and latest report; only the objective changes."
+    )
 
 # --- UI Rendering ---
 st.title("Abound B2B Credit Assessment")
@@ -41,7 +65,17 @@ uploaded_file = st.file_uploader(
 )
 
 if uploaded_file:
-    st.success(f"File '{uploaded_file.name}' uploaded successfully!")
+    # Parse the CSV once at upload time; agents load the typed Parquet copy instead
+    upload_key = (uploaded_file.name, uploaded_file.size)
+    if st.session_state.dataset is None or st.session_state.dataset.get("upload_key") != list(upload_key):
+        os.makedirs("data", exist_ok=True)
+        save_path = os.path.join("data", uploaded_file.name)
+        with open(save_path, "wb") as f:
+            f.write(uploaded_file.getvalue())
+        with st.spinner("Ingesting dataset..."):
+            st.session_state.dataset = {**ingest_csv(save_path), "upload_key": list(upload_key)}
+    dataset = st.session_state.dataset
+    st.success(f"File '{uploaded_file.name}' uploaded successfully! Ingested {dataset['rows']:,} rows into `{dataset['parquet_path']}`.")
 
 # --- Step 2: Define Analytical Objective ---
 st.subheader("2. Define the Analytical Objective 🎯")
@@ -62,8 +96,60 @@ start_button = st.button(
 
 st.divider()
 
-# --- Display existing chat messages ---
-for msg in st.session_state.messages:
+# --- Report and image caches ---
+# Keyed by path and mtime so reruns reuse parsed reports and image bytes until a file changes
+def file_mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def parse_report(path, mtime):
+    """Splits a markdown report into ("text", markdown) and ("image", caption, path) segments."""
+    with open(path, 'r', encoding='utf-8') as f:
+        report_content = f.read()
+    segments = []
+    text_chunk = []
+    for line in report_content.split('\n'):
+        image_match = re.match(r'!\[(.*)\]\((.*)\)', line.strip())
+        if image_match:
+            if text_chunk:
+                segments.append(("text", "\n".join(text_chunk)))
+                text_chunk = []
+            image_path = image_match.group(2).lstrip('./').lstrip('/') # Robust path correction
+            segments.append(("image", image_match.group(1), image_path))
+        else:
+            text_chunk.append(line)
+    if text_chunk:
+        segments.append(("text", "\n".join(text_chunk)))
+    return segments
+
+@st.cache_data(show_spinner=False, max_entries=512)
+def load_image(path, mtime):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def render_image(path, caption=None):
+    mtime = file_mtime(path)
+    if mtime is None:
+        st.error(f"Image not found at path: {path}")
+    else:
+        st.image(load_image(path, mtime), caption=caption)
+
+def render_report(path):
+    mtime = file_mtime(path)
+    if mtime is None:
+        st.error(f"Report not found at path: {path}")
+        return
+    for segment in parse_report(path, mtime):
+        if segment[0] == "text":
+            st.markdown(segment[1], unsafe_allow_html=True)
+        else:
+            render_image(segment[2], caption=segment[1])
+
+# --- Chat message rendering ---
+def render_message(msg):
     avatar_path = AVATARS.get(msg["author"])
     if avatar_path and not os.path.exists(avatar_path):
         avatar_path = None
@@ -78,34 +164,19 @@ for msg in st.session_state.messages:
         elif msg["type"] == "attachment":
             st.markdown(f"**Attachment:** {msg['content']}")
             if msg["path"].endswith(('.png', '.jpg')):
-                st.image(msg["path"])
+                render_image(msg["path"])
             elif msg["path"].endswith('.md'):
-                with open(msg["path"], 'r', encoding='utf-8') as f:
-                    report_content = f.read()
-                
                 with st.expander("View Report"):
-                    lines_buffer = report_content.split('\n')
-                    text_chunk = []
-                    for line in lines_buffer:
-                        image_match = re.match(r'!\[(.*)\]\((.*)\)', line.strip())
-                        if image_match:
-                            if text_chunk:
-                                st.markdown("\n".join(text_chunk), unsafe_allow_html=True)
-                                text_chunk = []
-                            caption = image_match.group(1)
-                            path = image_match.group(2)
-                            image_path = path.lstrip('./').lstrip('/') # Robust path correction
-                            if os.path.exists(image_path):
-                                st.image(image_path, caption=caption)
-                            else:
-                                st.error(f"Image not found at path: {image_path}")
-                        else:
-                            text_chunk.append(line)
-                    if text_chunk:
-                        st.markdown("\n".join(text_chunk), unsafe_allow_html=True)
+                    render_report(msg["path"])
+        elif msg["type"] == "error":
+            st.error(msg["content"])
         else: # System messages
             st.markdown(f"*{msg['content']}*")
 
+# --- Display existing chat messages ---
+for msg in st.session_state.messages:
+    render_message(msg)
+
 # --- App Execution Logic ---
 if start_button and uploaded_file and st.session_state.user_prompt:
     # Cleanup logic for a new run
@@ -113,31 +184,45 @@ if start_button and uploaded_file and st.session_state.user_prompt:
         shutil.rmtree("output")
     os.makedirs("output")
     
-    # Save the uploaded file locally
-    os.makedirs("data", exist_ok=True)
-    save_path = os.path.join("data", uploaded_file.name)
-    with open(save_path, "wb") as f:
-        f.write(uploaded_file.getvalue())
+    # The upload was already saved and ingested when it arrived
+    save_path = st.session_state.dataset["csv_path"]
     
     st.session_state.messages = []
     st.session_state.analysis_running = True
     
     orchestrator = AppAgentOrchestrator()
-    st.session_state.run_generator = orchestrator.run(save_path, st.session_state.user_prompt)
+    base_run_id = selected_run_id if build_on_selected_run else None
+    st.session_state.worker = EventWorker(orchestrator.run(save_path, st.session_state.user_prompt, base_run_id=base_run_id,
+                                                           dataset=st.session_state.dataset))
     
     st.session_state.messages.append({"type": "system", "author": "System", "content": f"Orchestrator initialized. Starting analysis on `{uploaded_file.name}` with the objective: '{st.session_state.user_prompt}'..."})
     st.rerun()
 
-# Main generator loop to process agent events
+if resume_button and selected_run_id:
+    # The journal restores the run's files into output/ and replays its events
+    if os.path.exists("output"):
+        shutil.rmtree("output")
+    os.makedirs("output")
+
+    st.session_state.messages = []
+    st.session_state.analysis_running = True
+
+    orchestrator = AppAgentOrchestrator()
+    st.session_state.worker = EventWorker(orchestrator.run(None, None, resume_run_id=selected_run_id))
+    st.rerun()
+
+# Render agent events as the background worker produces them; earlier events were drawn above
 if st.session_state.analysis_running:
-    try:
-        event = next(st.session_state.run_generator)
-        st.session_state.messages.append(event)
-        time.sleep(1) 
-        st.rerun()
-    except StopIteration:
+    worker = st.session_state.worker
+    while not worker.finished:
+        for event in worker.drain():
+            st.session_state.messages.append(event)
+            render_message(event)
+
+    st.session_state.analysis_running = False
+    # A failed run already showed its error event; only a clean finish gets the success banner
+    if worker.error is None:
         final_message = {"type": "system", "author": "System", "content": "✅ **Workflow Complete!** All cycles finished."}
         st.session_state.messages.append(final_message)
-        st.session_state.analysis_running = False
         st.balloons()
-        st.rerun()
\ No newline at end of file
+    st.rerun()
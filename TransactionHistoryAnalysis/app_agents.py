@@ -5,12 +5,16 @@ import glob
 import re
 from langchain_core.messages import AIMessage, ToolMessage, SystemMessage, HumanMessage
 from langchain_google_vertexai import ChatVertexAI
-from langchain_experimental.tools import PythonREPLTool
 from langchain_community.agent_toolkits import FileManagementToolkit
 
 from agent_tools import get_statistician_tools
 from graph_builder import create_agent_workflow
 from rag_agent import RAGAgent
+from llm_cache import get_llm_cache
+from usage_tracking import get_usage_tracker, write_usage_summary, call_config
+from run_journal import RunJournal, messages_to_records, records_to_messages
+from kernel import PythonKernel
+from ingest import ingest_csv, dataset_context, format_profile
 import config
 
 def summarize_tool_output(output: str, max_length: int = 1500) -> str:
@@ -23,11 +27,41 @@ def summarize_tool_output(output: str, max_length: int = 1500) -> str:
         return truncated_output + "\n\n... [Output truncated for brevity] ..."
     return output
 
+def _shingles(text: str, size: int = 3) -> set:
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return set()
+    return {tuple(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+
+def result_similarity(text_a: str, text_b: str) -> float:
+    """Jaccard similarity of word trigrams; 1.0 means the two results carry the same information."""
+    shingles_a, shingles_b = _shingles(text_a), _shingles(text_b)
+    if not shingles_a or not shingles_b:
+        return 0.0
+    return len(shingles_a & shingles_b) / len(shingles_a | shingles_b)
+
+def output_snapshot(directory: str = "output") -> dict:
+    """Modification time and size of every file in the output directory, to detect new or rewritten files."""
+    if not os.path.exists(directory):
+        return {}
+    snapshot = {}
+    for fname in os.listdir(directory):
+        path = os.path.join(directory, fname)
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            snapshot[fname] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
 class AppAgentOrchestrator:
     """Orchestrates the multi-agent workflow for the Streamlit app."""
     def __init__(self):
         # General purpose model for reasoning and planning agents
-        self.llm = ChatVertexAI(project=config.PROJECT_ID, model_name=config.MODEL_NAME)
+        # Identical prompts (e.g. when re-running after a crash) are served from the on-disk cache
+        llm_cache = get_llm_cache()
+        # Every model call is logged with its tokens, latency and calling role
+        self.usage_tracker = get_usage_tracker()
+        self.llm = ChatVertexAI(project=config.PROJECT_ID, model_name=config.MODEL_NAME, cache=llm_cache,
+                                callbacks=[self.usage_tracker])
         self.senior_agent = self.llm
         self.statistician_agent = self.llm
         self.finalizer_agent = self.llm
@@ -36,7 +70,9 @@ class AppAgentOrchestrator:
         self.software_engineer_agent = ChatVertexAI(
             project=config.PROJECT_ID,
             model_name="codestral-2501", # From the Model ID in your screenshot
-            publisher="mistralai"       # From the Model ID in your screenshot
+            publisher="mistralai",      # From the Model ID in your screenshot
+            cache=llm_cache,
+            callbacks=[self.usage_tracker]
         )
         # ******************************************************
         
@@ -47,12 +83,17 @@ class AppAgentOrchestrator:
             raise
         statistician_reporter_tools = get_statistician_tools()
         self.statistician_reporter_agent = create_agent_workflow(self.llm, statistician_reporter_tools)
+        self.journal = None
+        self.dataset = None
+        # One persistent execution kernel per orchestrator keeps imports and DataFrames warm
+        self.kernel = PythonKernel()
 
-    def run_engineer_analyst_loop(self, statistician_directive: str):
+    def run_engineer_analyst_loop(self, statistician_directive: str, cycle_num: int = None, turn: int = None):
         """
         Runs the new inner loop between the Software Engineer and the Analyst.
         The SE writes code, the Analyst executes it. If it fails, the SE tries to fix it.
         This loop runs for a maximum of 5 attempts.
+        cycle_num and turn tag the engineer's model calls in the usage log.
         """
         yield {"type": "system", "author": "System", "content": "🎬 Kicking off Engineer & Analyst Sub-Workflow..."}
 
@@ -60,7 +101,7 @@ class AppAgentOrchestrator:
         engineer_conversation_history = []
         code_to_execute = ""
         final_output = ""
-        files_before = set(os.listdir("output")) if os.path.exists("output") else set()
+        files_before = output_snapshot()
 
         engineer_system_prompt = SystemMessage(
             content="""You are a senior Python Software Engineer. Your sole purpose is to convert a natural language directive from a Bayesian Data Scientist into a single, executable Python script.
@@ -71,10 +112,15 @@ class AppAgentOrchestrator:
             3.  **Plotting:** Any script that generates a plot MUST begin with the `matplotlib.use('Agg')` code block to prevent GUI errors in the backend.
             4.  **Output Handling:** The script should NOT print large DataFrames. It should perform its task and print a single, simple confirmation message upon successful completion.
             5.  **Error Correction:** If you are shown a script and a traceback, your task is to identify the error, correct the script, and provide the complete, corrected code block as your response.
+            6.  **Persistent Session:** Scripts run in a persistent Python session. `pd`, `np`, `matplotlib` and `plt` are already imported, and variables from earlier scripts remain defined. Reuse the DataFrames listed as already loaded instead of re-reading large files from disk.
             """
         )
 
-        initial_prompt = HumanMessage(content=f"Please write the Python code to accomplish the following task:\n\n{statistician_directive}")
+        initial_prompt = HumanMessage(
+            content=f"Please write the Python code to accomplish the following task:\n\n{statistician_directive}"
+                    f"\n\n**Dataset:** load `{self.dataset['parquet_path']}` with `pd.read_parquet` rather than reading the CSV."
+                    f"\n\n**DataFrames already loaded in the session:**\n{self.kernel.describe()}"
+        )
         engineer_conversation_history.append(initial_prompt)
 
         for attempt in range(5): # This loop runs for 5 iterations as requested
@@ -83,7 +129,10 @@ class AppAgentOrchestrator:
             # 1. Engineer writes or corrects the code
             yield {"type": "system", "author": "System", "content": "🧠 Software Engineer is writing the code..."}
             # This call now uses the specialized DeepSeek Coder model
-            engineer_response = self.software_engineer_agent.invoke([engineer_system_prompt] + engineer_conversation_history)
+            engineer_response = self.software_engineer_agent.invoke(
+                [engineer_system_prompt] + engineer_conversation_history,
+                config=call_config("Software Engineer", cycle=cycle_num, turn=turn, attempt=attempt + 1)
+            )
             engineer_response_text = str(engineer_response.content)
 
             code_match = re.search(r"```python\n(.*?)```", engineer_response_text, re.DOTALL)
@@ -99,8 +148,7 @@ class AppAgentOrchestrator:
             # 2. Analyst executes the code
             yield {"type": "system", "author": "System", "content": f"🛠️ Analyst is executing the code..."}
             try:
-                stateless_repl = PythonREPLTool()
-                analyst_tool_output = stateless_repl.invoke(code_to_execute)
+                analyst_tool_output = self.kernel.execute(code_to_execute)
 
                 if "Traceback" in analyst_tool_output or "Error" in analyst_tool_output:
                      raise Exception(analyst_tool_output)
@@ -129,8 +177,10 @@ class AppAgentOrchestrator:
                 engineer_conversation_history.append(correction_prompt)
 
         # 3. Finalize and return results from this inner loop
-        files_after = set(os.listdir("output")) if os.path.exists("output") else set()
-        new_files = files_after - files_before
+        files_after = output_snapshot()
+        new_files = set(files_after) - set(files_before)
+        # Any new or rewritten file (CSV exports, tables, plots) counts as progress for convergence detection
+        changed_files = sorted(fname for fname, stamp in files_after.items() if files_before.get(fname) != stamp)
         plots_generated = [f"output/{fname}" for fname in new_files if fname.endswith(('.png', '.jpg', '.jpeg'))]
 
         for plot_path in plots_generated:
@@ -140,32 +190,65 @@ class AppAgentOrchestrator:
             "directive_code": code_to_execute,
             "result_summary": summarize_tool_output(final_output),
             "full_result": final_output,
-            "plots": plots_generated
+            "plots": plots_generated,
+            "changed_files": changed_files
         }
 
-    def run_statistician_loop(self, high_level_directive: str, cycle_num: int, previous_report_content: str):
+    def _checkpoint_turn(self, cycle_num: int, next_turn: int, high_level_directive: str, previous_report_content: str,
+                         supplemental_rag_context: str, conversation_history: list, structured_log: list,
+                         stale_turns: int = 0):
+        """Journals the statistician loop state after a completed turn so it can resume without replaying LLM calls."""
+        self.journal.checkpoint(cycle={
+            "cycle_num": cycle_num,
+            "next_turn": next_turn,
+            "stale_turns": stale_turns,
+            "high_level_directive": high_level_directive,
+            "previous_report_content": previous_report_content,
+            "rag_context": supplemental_rag_context,
+            "history": messages_to_records(conversation_history),
+            "structured_log": structured_log,
+        })
+
+    def run_statistician_loop(self, high_level_directive: str, cycle_num: int, previous_report_content: str,
+                              resume_state: dict = None):
         """
         Runs the iterative sub-workflow for the Statistician.
         The Statistician now only provides natural language directives for the engineer.
+        The loop ends before config.MAX_STATISTICIAN_TURNS once the Statistician reports DONE, gives no
+        directive, or its turns stop producing new results or plots.
+        resume_state is a journaled turn checkpoint to continue from.
         """
-        yield {"type": "system", "author": "System", "content": f"🔬 Kicking off Statistician Sub-Workflow (Cycle {cycle_num})"}
+        if resume_state:
+            # Continue after the last completed turn; the RAG context and history come from the journal
+            yield {"type": "system", "author": "System", "content": f"⏯️ Resuming Statistician Sub-Workflow (Cycle {cycle_num}) at turn {resume_state['next_turn'] + 1}"}
+            statistician_conversation_history = records_to_messages(resume_state["history"])
+            structured_log = resume_state["structured_log"]
+            supplemental_rag_context = resume_state["rag_context"]
+            start_turn = resume_state["next_turn"]
+            stale_turns = resume_state.get("stale_turns", 0)
+        else:
+            yield {"type": "system", "author": "System", "content": f"🔬 Kicking off Statistician Sub-Workflow (Cycle {cycle_num})"}
 
-        # State management for this middle loop
-        statistician_conversation_history = []
-        structured_log = []
+            # State management for this middle loop
+            statistician_conversation_history = []
+            structured_log = []
+            start_turn = 0
+            stale_turns = 0
 
-        # RAG context retrieval is unchanged
-        yield {"type": "system", "author": "System", "content": f"📚 Consulting Bayesian textbook with query: '{high_level_directive[:100]}...'"}
-        try:
-            supplemental_rag_context = self.rag_agent.answer(high_level_directive)
-            yield {"type": "reasoning", "author": "System", "content": f"**Retrieved Context:**\n\n{supplemental_rag_context}"}
-        except Exception as e:
-            error_message = f"Failed to query RAG agent: {e}"
-            yield {"type": "system", "author": "System", "content": f"⚠️ {error_message}"}
-            supplemental_rag_context = error_message
+            # RAG context retrieval is unchanged
+            yield {"type": "system", "author": "System", "content": f"📚 Consulting Bayesian textbook with query: '{high_level_directive[:100]}...'"}
+            try:
+                supplemental_rag_context = self.rag_agent.answer(high_level_directive)
+                yield {"type": "reasoning", "author": "System", "content": f"**Retrieved Context:**\n\n{supplemental_rag_context}"}
+            except Exception as e:
+                error_message = f"Failed to query RAG agent: {e}"
+                yield {"type": "system", "author": "System", "content": f"⚠️ {error_message}"}
+                supplemental_rag_context = error_message
+            self._checkpoint_turn(cycle_num, 0, high_level_directive, previous_report_content,
+                                  supplemental_rag_context, statistician_conversation_history, structured_log)
 
-        for i in range(5): # This loop runs for 5 iterations
-            yield {"type": "system", "author": "System", "content": f"🔄 Statistician Cycle {i + 1}/5"}
+        for i in range(start_turn, config.MAX_STATISTICIAN_TURNS):
+            yield {"type": "system", "author": "System", "content": f"🔄 Statistician Cycle {i + 1}/{config.MAX_STATISTICIAN_TURNS}"}
 
             try:
                 directory_listing = os.listdir("output")
@@ -181,6 +264,7 @@ class AppAgentOrchestrator:
 
             full_context = (
                 f"**High-Level Directive for this Cycle:**\n{high_level_directive}\n\n"
+                f"**Dataset:**\n{dataset_context(self.dataset)}\n\n"
                 f"**Previous Cycle's Report (for context and schema reference):**\n{previous_report_content}\n\n"
                 f"**Current Contents of `output` Directory (Your Long-Term Memory):**\n{directory_listing}\n\n"
                 f"**Supplemental Context from Bayesian Analysis Textbook:**\n{supplemental_rag_context}\n\n"
@@ -206,9 +290,14 @@ class AppAgentOrchestrator:
                 3.  **Gather Evidence (The Directive Plan):** (Describe the goal of the analytical step you want the engineer to perform. Be clear and specific.)
                 4.  **Articulate Your Posterior Belief:** (Describe how the evidence you plan to gather will update your beliefs.)
 
+                ## Status
+                (Write exactly `CONTINUE` or `DONE`. Write `DONE` when the evidence gathered so far already answers the high-level directive; in that case leave the Directive section empty.)
+
                 ## Directive
                 (Provide a clear, natural language instruction for the Software Engineer. For example: "Load the 'transactions.csv' file from the 'output' directory. Calculate the total monthly spending and save the result to a new CSV file named 'monthly_spending.csv' in the 'output' directory.")
                 ```
+
+                Do not repeat an analysis that is already in the session history; if nothing new remains to be learned for this directive, report `DONE`.
                 """
             )
 
@@ -216,7 +305,9 @@ class AppAgentOrchestrator:
             if statistician_conversation_history:
                  messages_for_statistician.extend(statistician_conversation_history)
 
-            statistician_response = self.statistician_agent.invoke(messages_for_statistician)
+            statistician_response = self.statistician_agent.invoke(
+                messages_for_statistician, config=call_config("Statistician", cycle=cycle_num, turn=i + 1)
+            )
             statistician_response_text = str(statistician_response.content)
             statistician_conversation_history.append(AIMessage(content=statistician_response_text))
 
@@ -228,25 +319,56 @@ class AppAgentOrchestrator:
                 reasoning = re.sub(r"(?i)##\s*.*Reasoning.*", "", reasoning_text).strip() or "Reasoning section was empty."
             else:
                 reasoning = statistician_response_text.strip()
+            status_match = re.search(r"##\s*Status\s*\n\s*`?(CONTINUE|DONE)", statistician_response_text, re.IGNORECASE)
+            reasoning = re.sub(r"(?is)##\s*Status\s*\n.*?(?=\n##|$)", "", reasoning).strip() or reasoning
 
             yield {"type": "reasoning", "author": "Statistician", "content": reasoning}
 
-            if not directive_for_engineer:
-                yield {"type": "system", "author": "System", "content": "⚠️ Statistician did not provide a directive. Skipping execution."}
-                continue
-            
-            # Delegate coding and debugging to the new inner loop
-            engineer_loop_results = yield from self.run_engineer_analyst_loop(directive_for_engineer)
-
-            structured_log.append({
-                "directive": engineer_loop_results["directive_code"],
-                "result": engineer_loop_results["full_result"],
-                "plots": engineer_loop_results["plots"]
-            })
-            
-            # Update the Statistician's conversation history with the summary from the coding team
-            summary_for_stat = f"Task complete. Output summary:\n{engineer_loop_results['result_summary']}"
-            statistician_conversation_history.append(HumanMessage(content=summary_for_stat))
+            converged = False
+            if status_match and status_match.group(1).upper() == "DONE":
+                yield {"type": "system", "author": "System", "content": "🏁 Statistician reports the directive is answered. Ending the sub-workflow early."}
+                converged = True
+            elif not directive_for_engineer:
+                yield {"type": "system", "author": "System", "content": "⚠️ Statistician did not provide a directive. Ending the sub-workflow."}
+                converged = True
+            else:
+                previous_turns = [(entry.get("request", ""), entry["result"]) for entry in structured_log]
+                # Delegate coding and debugging to the new inner loop
+                engineer_loop_results = yield from self.run_engineer_analyst_loop(directive_for_engineer, cycle_num, i + 1)
+
+                structured_log.append({
+                    "request": directive_for_engineer,
+                    "directive": engineer_loop_results["directive_code"],
+                    "result": engineer_loop_results["full_result"],
+                    "plots": engineer_loop_results["plots"]
+                })
+                self.journal.record_directive_result(cycle_num, i + 1, directive_for_engineer,
+                                                     engineer_loop_results["full_result"], engineer_loop_results["plots"])
+
+                # Update the Statistician's conversation history with the summary from the coding team
+                summary_for_stat = f"Task complete. Output summary:\n{engineer_loop_results['result_summary']}"
+                statistician_conversation_history.append(HumanMessage(content=summary_for_stat))
+
+                # No new information: an earlier turn asked for the same thing and got the same answer,
+                # and no output file was created or rewritten. Short confirmations from unrelated
+                # steps look alike, so the statistician's directive must repeat as well.
+                similarity = max((min(result_similarity(directive_for_engineer, request),
+                                      result_similarity(engineer_loop_results["full_result"], result))
+                                  for request, result in previous_turns), default=0.0)
+                if similarity >= config.CONVERGENCE_SIMILARITY and not engineer_loop_results["changed_files"]:
+                    stale_turns += 1
+                else:
+                    stale_turns = 0
+                if stale_turns >= config.MAX_STALE_TURNS:
+                    yield {"type": "system", "author": "System", "content": f"🏁 The last {stale_turns} turns repeated earlier directives and results ({similarity:.0%} similar) without new output files. Ending the sub-workflow early."}
+                    converged = True
+
+            # A converged cycle resumes straight at report writing
+            next_turn = config.MAX_STATISTICIAN_TURNS if converged else i + 1
+            self._checkpoint_turn(cycle_num, next_turn, high_level_directive, previous_report_content,
+                                  supplemental_rag_context, statistician_conversation_history, structured_log, stale_turns)
+            if converged:
+                break
 
         yield {"type": "system", "author": "System", "content": "✍️  Statistician is writing the cycle report..."}
         
@@ -285,46 +407,127 @@ class AppAgentOrchestrator:
         report_filename = f"intermediate_report_cycle_{cycle_num}.md"
         final_prompt_for_stat = f"{summary_input}\n\nSave the report to '{report_filename}'."
         stat_inputs = {"messages": [("system", summary_prompt), ("user", final_prompt_for_stat)]}
-        self.statistician_reporter_agent.invoke(stat_inputs)
+        self.statistician_reporter_agent.invoke(stat_inputs, config=call_config("Statistician Reporter", cycle=cycle_num))
         
         report_path = f"output/{report_filename}"
         if os.path.exists(report_path):
             with open(report_path, "r", encoding='utf-8') as f:
                 report_content = f.read()
+            self.journal.record_cycle_report(cycle_num, report_content, all_figures_this_cycle)
             yield {"type": "attachment", "author": "Statistician", "content": f"Generated report: `{os.path.basename(report_path)}`", "path": report_path}
             return report_content, all_figures_this_cycle
         else:
             return "Error: Failed to produce a report.", []
 
-    def run(self, local_csv_path: str, user_prompt: str):
-        yield {"type": "system", "author": "System", "content": "🎬 Kicking off the Main Workflow..."}
-        
-        safe_local_path = local_csv_path.replace('\\', '/')
-        next_directive_for_statistician = (
-            f"The user has uploaded the dataset located at '{safe_local_path}'. "
-            f"Their primary analytical objective is: '{user_prompt}'"
-        )
-        
-        all_generated_plots = []
-        report_from_previous_cycle = "This is the first cycle. No previous report exists."
+    def run(self, local_csv_path: str, user_prompt: str, resume_run_id: str = None, base_run_id: str = None,
+            dataset: dict = None):
+        """
+        Runs the main workflow, journaling every event under a run ID.
+        resume_run_id continues an interrupted run from its last completed statistician turn;
+        base_run_id starts a new objective from a prior run's outputs and latest report.
+        dataset is the ingestion result for the upload (see ingest.py); it is computed here if omitted.
+        """
+        if resume_run_id:
+            self.journal = RunJournal(resume_run_id)
+            meta = self.journal.meta()
+            local_csv_path, user_prompt = meta["csv_path"], meta["user_prompt"]
+            dataset = meta.get("dataset")
+            # Restore the run's files, then replay its events up to the last checkpoint so the UI shows
+            # its history; later events are dropped because the resumed run emits them again
+            self.journal.restore_output()
+            self.journal.rewind()
+            yield from self.journal.events()
+            self.journal.set_status("running")
+        else:
+            self.journal = RunJournal()
+            if base_run_id:
+                RunJournal(base_run_id).restore_output(as_base=True)
+            self.usage_tracker.reset()
+            dataset = dataset or ingest_csv(local_csv_path)
+            self.journal.start(local_csv_path, user_prompt, parent_run_id=base_run_id, dataset=dataset)
+        # Runs journaled before ingestion/profiling existed are (re-)ingested on resume
+        self.dataset = dataset if dataset and "profile" in dataset else ingest_csv(local_csv_path)
+        # A new session must not see DataFrames or variables left over from an earlier run or dataset
+        self.kernel.reset()
+
+        for event in self._run_cycles(local_csv_path, user_prompt, base_run_id):
+            self.journal.record_event(event)
+            yield event
+        self.journal.sync_output()
+        self.journal.set_status("complete")
+        self.kernel.shutdown()
+
+    def _run_cycles(self, local_csv_path: str, user_prompt: str, base_run_id: str = None):
+        outer_state = self.journal.state.get("outer")
+        if outer_state:
+            yield {"type": "system", "author": "System", "content": f"⏯️ Resuming run `{self.journal.run_id}` at Outer Cycle {outer_state['next_cycle']}/{config.MAX_OUTER_CYCLES}..."}
+            start_cycle = outer_state["next_cycle"]
+            next_directive_for_statistician = outer_state["next_directive"]
+            all_generated_plots = outer_state["all_generated_plots"]
+            report_from_previous_cycle = outer_state["report_from_previous_cycle"]
+        else:
+            yield {"type": "system", "author": "System", "content": "🎬 Kicking off the Main Workflow..."}
+
+            safe_local_path = local_csv_path.replace('\\', '/')
+            next_directive_for_statistician = (
+                f"The user has uploaded the dataset located at '{safe_local_path}' "
+                f"(load the typed copy at '{self.dataset['parquet_path']}' with `pd.read_parquet`). "
+                f"Their primary analytical objective is: '{user_prompt}'"
+            )
+
+            all_generated_plots = []
+            # The upload-time profile stands in for the schema handover so cycle 1 can go straight to analysis
+            report_from_previous_cycle = (
+                "This is the first cycle. No previous report exists, but the dataset was profiled at upload.\n\n"
+                f"## Data Schema Handover\n{format_profile(self.dataset['profile'])}"
+            )
+            start_cycle = 1
+
+            base_state = RunJournal(base_run_id).state.get("outer") if base_run_id else None
+            if base_state:
+                # New objective on the same dataset: start from the prior run's latest report and figures
+                yield {"type": "system", "author": "System", "content": f"📂 Continuing from the state of run `{base_run_id}`."}
+                report_from_previous_cycle = base_state["report_from_previous_cycle"]
+                all_generated_plots = list(base_state["all_generated_plots"])
+
+            self.journal.checkpoint(cycle=None, outer={
+                "next_cycle": start_cycle,
+                "next_directive": next_directive_for_statistician,
+                "all_generated_plots": all_generated_plots,
+                "report_from_previous_cycle": report_from_previous_cycle,
+            })
+
+        for i in range(start_cycle, config.MAX_OUTER_CYCLES + 1):
+            yield {"type": "system", "author": "System", "content": f"👑 Outer Cycle {i}/{config.MAX_OUTER_CYCLES}"}
+
+            cycle_state = self.journal.state.get("cycle")
+            resume_state = cycle_state if cycle_state and cycle_state["cycle_num"] == i else None
 
-        for i in range(1, 6):
-            yield {"type": "system", "author": "System", "content": f"👑 Outer Cycle {i}/5"}
-            
             # Updated to call the new statistician loop
             report_from_statistician, figures_from_last_cycle = yield from self.run_statistician_loop(
-                next_directive_for_statistician, i, report_from_previous_cycle
+                next_directive_for_statistician, i, report_from_previous_cycle, resume_state
             )
             
+            # No new information: the report repeats the previous cycle's and no new figures were produced
+            new_figures = set(figures_from_last_cycle) - set(all_generated_plots)
+            objective_satisfied = (
+                i > 1 and not new_figures
+                and result_similarity(report_from_statistician, report_from_previous_cycle) >= config.CONVERGENCE_SIMILARITY
+            )
+            if objective_satisfied:
+                yield {"type": "system", "author": "System", "content": f"🏁 Cycle {i} repeated the previous cycle's findings without new figures. Stopping early."}
+
             report_from_previous_cycle = report_from_statistician
 
             if figures_from_last_cycle:
                 all_generated_plots.extend(figures_from_last_cycle)
 
-            if i < 5:
+            if i < config.MAX_OUTER_CYCLES and not objective_satisfied:
                 yield {"type": "system", "author": "System", "content": "🧠 Senior Analyst is reviewing the report..."}
                 
-                senior_input_message = HumanMessage(content=report_from_statistician)
+                senior_input_message = HumanMessage(
+                    content=f"{report_from_statistician}\n\n## Dataset Profile (computed at upload)\n{format_profile(self.dataset['profile'])}"
+                )
                 senior_reasoning_prompt = SystemMessage(
                     content="""You are a Principal Analyst AI, a master of synthesis and strategic reasoning. Your function is to lead a data analysis by forming a deep understanding of the provided dataset and the user's objective. You are loyal only to empirical evidence and the pursuit of truth within the data.
 
@@ -340,7 +543,7 @@ class AppAgentOrchestrator:
                     **STEP 0: GROUNDING & SCHEMA VERIFICATION (CRITICAL FIRST STEP)**
                     - Before all else, your first action is one of **curiosity and discovery**.
                     - If the report provides a `## Data Schema Handover` section, you MUST locate it. This is your **ground truth**. Explicitly list the datasets and their exact column names in your reasoning.
-                    - **If no schema is provided** (e.g., this is the first cycle or the last report failed), your reasoning MUST reflect this knowledge gap. Your primary goal is to **discover the schema**. Your proposed directive in Step 4 must therefore be to instruct your team to perform a basic data inspection (`df.info()`, `df.head()`, `df.describe()`) to establish this factual baseline. **Do not propose any other analysis until the schema is known.**
+                    - **If the report has no schema handover** (e.g., the last report failed), use the `## Dataset Profile (computed at upload)` appended to it. It lists every column of the uploaded dataset with its dtype, null rate, cardinality, date range, quantiles and top categories, and is equally authoritative. **Do not spend a cycle on basic data inspection** (`df.info()`, `df.head()`, `df.describe()`); the profile already provides that baseline, so proceed directly to substantive analysis.
 
                     **STEP 1: SYNTHESIZE THE CURRENT STATE OF KNOWLEDGE**
                     - Synthesize the most critical, business-relevant insights from the latest report and any accompanying visuals. What is the single most important, undeniable fact we have learned so far?
@@ -355,24 +558,50 @@ class AppAgentOrchestrator:
 
                     **STEP 4: PROPOSE THE NEXT DIRECTIVE**
                     - Based on the verified data schemas from Step 0 and the analytical task from Step 3, draft a clear, high-level plan for the next directive you will issue to your team.
+
+                    **STEP 5: DECLARE WHETHER THE OBJECTIVE IS SATISFIED**
+                    - If the evidence gathered so far already supports a confident decision on the user's objective and further cycles would only repeat earlier work, say so.
+                    - End your response with a final line that reads exactly `OBJECTIVE_SATISFIED: YES` or `OBJECTIVE_SATISFIED: NO`.
                     """
                 )            
-                reasoning_response = self.senior_agent.invoke([senior_reasoning_prompt, senior_input_message])
+                reasoning_response = self.senior_agent.invoke(
+                    [senior_reasoning_prompt, senior_input_message], config=call_config("Senior Analyst", cycle=i)
+                )
                 reasoning_text = str(reasoning_response.content)
                 
                 yield {"type": "reasoning", "author": "Senior Analyst", "content": reasoning_text}
 
-                senior_directive_prompt = SystemMessage(content="Based on the reasoning, extract the final directive.")
-                directive_response = self.senior_agent.invoke([senior_directive_prompt, HumanMessage(content=reasoning_text)])
-                next_directive_for_statistician = str(directive_response.content)
-                
-                yield {"type": "directive", "author": "Senior Analyst", "content": next_directive_for_statistician}
+                if re.search(r"OBJECTIVE_SATISFIED:\s*\**\s*YES", reasoning_text, re.IGNORECASE):
+                    yield {"type": "system", "author": "System", "content": f"🏁 Senior Analyst considers the objective satisfied after cycle {i}. Stopping early."}
+                    objective_satisfied = True
+                else:
+                    senior_directive_prompt = SystemMessage(content="Based on the reasoning, extract the final directive.")
+                    directive_response = self.senior_agent.invoke(
+                        [senior_directive_prompt, HumanMessage(content=reasoning_text)], config=call_config("Senior Analyst", cycle=i)
+                    )
+                    next_directive_for_statistician = str(directive_response.content)
+
+                    yield {"type": "directive", "author": "Senior Analyst", "content": next_directive_for_statistician}
+
+            # A satisfied objective resumes straight at the final summary
+            self.journal.checkpoint(cycle=None, outer={
+                "next_cycle": config.MAX_OUTER_CYCLES + 1 if objective_satisfied else i + 1,
+                "next_directive": next_directive_for_statistician,
+                "all_generated_plots": all_generated_plots,
+                "report_from_previous_cycle": report_from_previous_cycle,
+            })
+            if objective_satisfied:
+                break
 
         yield {"type": "system", "author": "System", "content": "📝 Synthesizing Final Business Report..."}
         
         self.run_final_summary(all_generated_plots, user_prompt)
         
         yield {"type": "attachment", "author": "System", "content": "Generated final report: `final_business_report.md`", "path": "output/final_business_report.md"}
+
+        usage_summary_path = write_usage_summary()
+        if usage_summary_path:
+            yield {"type": "attachment", "author": "System", "content": f"LLM token and latency usage: `{os.path.basename(usage_summary_path)}`", "path": usage_summary_path}
     
     def run_final_summary(self, all_plot_paths: list, user_prompt: str):
         """A non-yielding version of the final summary that now accepts the user_prompt."""
@@ -431,7 +660,9 @@ class AppAgentOrchestrator:
             f"Here is the complete list of available plot filenames for embedding in my report:\n{plot_list_markdown}"
         )
 
-        final_summary = self.finalizer_agent.invoke([final_summary_prompt, HumanMessage(content=final_context)]).content
+        final_summary = self.finalizer_agent.invoke(
+            [final_summary_prompt, HumanMessage(content=final_context)], config=call_config("Finalizer")
+        ).content
         final_report_tools = FileManagementToolkit(root_dir="./output", selected_tools=["write_file"]).get_tools()
         final_report_tools[0].invoke({"file_path": "final_business_report.md", "text": final_summary})
         
@@ -2,5 +2,37 @@
 
 PROJECT_ID = "..."
 MODEL_NAME = "gemini-2.5-flash" # Or your preferred Gemini model
-MAX_TURNS = 10 # Used for the outer loop, though we've fixed it to 5 cycles.
+MAX_TURNS = 10 # Recursion budget for the statistician reporter graph
+MAX_OUTER_CYCLES = 5 # Upper bound on senior analyst cycles; the run stops earlier once the objective is satisfied
+MAX_STATISTICIAN_TURNS = 5 # Upper bound on statistician turns per cycle; the cycle stops earlier once it converges
 MAX_CORRECTION_ATTEMPTS = 3 # The number of times the intelligent analyst can try to fix its own code
+
+# Persistent LLM response cache (kept outside output/, which is cleared for each run)
+LLM_CACHE_ENABLED = True
+LLM_CACHE_PATH = "cache/llm_cache.sqlite"
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 3600
+LLM_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Per-call token/latency log and its per-role summary, written next to final_business_report.md
+USAGE_LOG_PATH = "output/llm_usage.jsonl"
+USAGE_SUMMARY_PATH = "output/llm_usage_summary.md"
+
+# Run journals used to resume interrupted workflows (kept outside output/)
+RUNS_DIR = "runs"
+
+# Persistent analysis kernel limits (per execution for time/CPU, per process for memory)
+KERNEL_TIMEOUT_SECONDS = 300
+KERNEL_CPU_SECONDS = 300
+KERNEL_MEMORY_MB = 8192
+
+# Upload ingestion: typed Parquet copies of uploaded CSVs
+INGEST_DIR = "data/ingested"
+INGEST_MIN_PARSE_RATIO = 0.95 # Share of non-null values that must parse for a dtype conversion
+INGEST_MAX_CATEGORIES = 1000
+PROFILE_QUANTILES = [0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0]
+PROFILE_TOP_VALUES = 5
+
+# Convergence detection: a turn that repeats an earlier directive and result without new or changed
+# output files (or a cycle report that repeats the previous one without new plots) is stale
+CONVERGENCE_SIMILARITY = 0.9 # Word-trigram Jaccard similarity at which a directive or result counts as a repeat
+MAX_STALE_TURNS = 2 # Consecutive stale statistician turns before the cycle is cut short
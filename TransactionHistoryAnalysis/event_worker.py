@@ -0,0 +1,48 @@
+# event_worker.py
+
+import queue
+import threading
+
+
+class EventWorker:
+    """
+    Runs an orchestrator event generator on a background thread and feeds its events into a
+    queue, so the Streamlit script can render them as they arrive instead of advancing the
+    generator one event per rerun. The worker lives in session state and survives reruns.
+    """
+    _DONE = object()
+
+    def __init__(self, event_generator):
+        self.events = queue.Queue()
+        self.finished = False
+        self.error = None
+        self._thread = threading.Thread(target=self._run, args=(event_generator,), daemon=True)
+        self._thread.start()
+
+    def _run(self, event_generator):
+        try:
+            for event in event_generator:
+                self.events.put(event)
+        except Exception as e:
+            self.error = e
+            self.events.put({"type": "error", "author": "System", "content": f"❌ Workflow failed: {e}"})
+        finally:
+            self.events.put(self._DONE)
+
+    def drain(self, timeout: float = 0.5) -> list:
+        """
+        Returns every pending event, waiting up to `timeout` seconds for the first one.
+        Sets `finished` once the generator is exhausted and all its events have been returned.
+        """
+        pending = []
+        try:
+            item = self.events.get(timeout=timeout)
+            while True:
+                if item is self._DONE:
+                    self.finished = True
+                    break
+                pending.append(item)
+                item = self.events.get_nowait()
+        except queue.Empty:
+            pass
+        return pending
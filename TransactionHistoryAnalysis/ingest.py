@@ -0,0 +1,179 @@
+# ingest.py
+
+import hashlib
+import json
+import os
+import re
+
+import pandas as pd
+
+import config
+
+DATE_HINTS = ("date", "time", "timestamp", "day", "month", "created", "posted")
+CURRENCY_CHARS = r"[,\s$€£¥₹]"
+INGEST_VERSION = 2 # Bump when conversions change so cached Parquet copies are rebuilt
+
+# Columns named like identifiers keep their text form (leading zeros, long IDs beyond float precision)
+IDENTIFIER_HINTS = {"id", "account", "acct", "zip", "zipcode", "postal", "postcode", "code", "phone", "iban",
+                    "card", "sku", "mcc", "routing"}
+
+
+def _file_hash(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _parse_ratio(parsed: pd.Series, original: pd.Series) -> float:
+    non_null = original.notna().sum()
+    return parsed.notna().sum() / non_null if non_null else 0.0
+
+
+def _is_identifier(series: pd.Series, name: str) -> bool:
+    """ID, account, ZIP or code columns: named like one, or digit strings a float would corrupt."""
+    words = re.split(r"[^a-z0-9]+", re.sub(r"([a-z])([A-Z])", r"\1_\2", name).lower())
+    if IDENTIFIER_HINTS.intersection(words):
+        return True
+    text = series.dropna().astype("string").str.strip()
+    digits = text[text.str.fullmatch(r"\d+").fillna(False)]
+    if digits.empty:
+        return False
+    widths = digits.str.len()
+    return (
+        bool(digits.str.match(r"0\d").any())  # leading zeros
+        or widths.max() > 15  # beyond float64 precision
+        or (len(digits) == len(text) and widths.min() == widths.max() >= 5)  # fixed-width codes
+    )
+
+
+def _fix_column(series: pd.Series, name: str):
+    """Returns (converted series, conversion label) for a text column, or (series, None) if left alone."""
+    if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+        return series, None
+
+    # Amounts: strip currency symbols and thousands separators; "(12.50)" is a negative amount
+    if not _is_identifier(series, name):
+        cleaned = series.astype("string").str.replace(CURRENCY_CHARS, "", regex=True).str.replace(r"^\((.*)\)$", r"-\1", regex=True)
+        numeric = pd.to_numeric(cleaned, errors="coerce").astype("float64")
+        if _parse_ratio(numeric, series) >= config.INGEST_MIN_PARSE_RATIO:
+            # Whole-number columns (counts, years) stay integers; missing values become <NA>
+            if not cleaned.str.contains(r"[.eE]", na=False).any() and numeric.dropna().abs().max() < 2 ** 53:
+                numeric = numeric.round().astype("Int64")
+            return numeric, "numeric"
+
+    if any(hint in name.lower() for hint in DATE_HINTS):
+        dates = pd.to_datetime(series, errors="coerce", format="mixed")
+        if _parse_ratio(dates, series) >= config.INGEST_MIN_PARSE_RATIO:
+            return dates, "datetime"
+
+    unique = series.nunique(dropna=True)
+    if unique <= config.INGEST_MAX_CATEGORIES and unique <= 0.5 * len(series):
+        return series.astype("category"), "category"
+    return series, None
+
+
+def _value(value):
+    """JSON-friendly scalar for the profile."""
+    if pd.isna(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return value.item() if hasattr(value, "item") else value
+
+
+def profile_dataset(df: pd.DataFrame) -> dict:
+    """
+    Deterministic per-column profile: dtype, null rate and cardinality for every column,
+    date ranges for datetimes, quantiles for numeric columns and top values for categories/text.
+    """
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        entry = {
+            "dtype": str(series.dtype),
+            "null_rate": round(float(series.isna().mean()), 4) if len(series) else 0.0,
+            "unique": int(series.nunique(dropna=True)),
+        }
+        if pd.api.types.is_datetime64_any_dtype(series):
+            entry["min"], entry["max"] = _value(series.min()), _value(series.max())
+        elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            quantiles = series.quantile(config.PROFILE_QUANTILES)
+            entry["quantiles"] = {f"p{int(q * 100)}": _value(v) for q, v in quantiles.items()}
+            entry["mean"], entry["sum"] = _value(series.mean()), _value(series.sum())
+            entry["negative_share"] = round(float((series < 0).mean()), 4) if len(series) else 0.0
+        else:
+            top = series.astype("string").value_counts(dropna=True).head(config.PROFILE_TOP_VALUES)
+            entry["top_values"] = {str(value): int(count) for value, count in top.items()}
+        columns[str(column)] = entry
+    return {"rows": len(df), "columns": columns}
+
+
+def format_profile(profile: dict) -> str:
+    """Renders a dataset profile as a compact markdown schema handover."""
+    lines = [f"Rows: {profile['rows']:,}", "", "| Column | Dtype | Null % | Unique | Summary |", "|---|---|---|---|---|"]
+    for name, entry in profile["columns"].items():
+        if "quantiles" in entry:
+            summary = ", ".join(f"{q}={v:,.2f}" for q, v in entry["quantiles"].items() if v is not None)
+            summary += f"; negative share={entry['negative_share']:.1%}"
+        elif "min" in entry:
+            summary = f"{entry['min']} to {entry['max']}"
+        else:
+            summary = "top: " + ", ".join(f"{value} ({count:,})" for value, count in entry["top_values"].items())
+        lines.append(f"| `{name}` | {entry['dtype']} | {entry['null_rate']:.1%} | {entry['unique']:,} | {summary} |")
+    return "\n".join(lines)
+
+
+def ingest_csv(csv_path: str, output_dir: str = config.INGEST_DIR) -> dict:
+    """
+    Parses an uploaded CSV once, fixes dtypes (amounts, dates, categories) and writes a typed
+    Parquet copy that analysis scripts can load in milliseconds, along with a deterministic
+    dataset profile. Results are cached by file content, so re-uploading the same data skips
+    parsing entirely.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    base_path = os.path.join(output_dir, f"{stem}_{_file_hash(csv_path)[:12]}")
+    info_path = f"{base_path}.json"
+    if os.path.exists(info_path) and os.path.exists(f"{base_path}.parquet"):
+        with open(info_path, "r", encoding="utf-8") as f:
+            info = json.load(f)
+        if info.get("ingest_version") == INGEST_VERSION:
+            return info
+
+    # Read every column as text so identifiers keep their leading zeros; _fix_column assigns the dtypes
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=True)
+    df.columns = [str(column).strip() for column in df.columns]
+    conversions = {}
+    for column in df.columns:
+        df[column], conversion = _fix_column(df[column], column)
+        if conversion:
+            conversions[column] = conversion
+
+    parquet_path = f"{base_path}.parquet"
+    df.to_parquet(parquet_path, index=False)
+
+    info = {
+        "csv_path": csv_path.replace('\\', '/'),
+        "parquet_path": parquet_path.replace('\\', '/'),
+        "rows": len(df),
+        "columns": {column: str(dtype) for column, dtype in df.dtypes.items()},
+        "conversions": conversions,
+        "profile": profile_dataset(df),
+        "ingest_version": INGEST_VERSION,
+    }
+    with open(info_path, "w", encoding="utf-8") as f:
+        json.dump(info, f, indent=2)
+    return info
+
+
+def dataset_context(info: dict) -> str:
+    """Tells the agents where the typed copy lives and how to load it."""
+    columns = ", ".join(f"`{name}` ({dtype})" for name, dtype in info["columns"].items())
+    return (
+        f"The uploaded CSV `{info['csv_path']}` has been ingested once into a typed Parquet copy at "
+        f"`{info['parquet_path']}` ({info['rows']:,} rows). All scripts MUST load the data with "
+        f"`pd.read_parquet('{info['parquet_path']}')` instead of re-parsing the CSV; dates, amounts and "
+        f"categories already have the correct dtypes.\n\nColumns: {columns}"
+    )
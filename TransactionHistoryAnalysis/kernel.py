@@ -0,0 +1,211 @@
+# kernel.py
+
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import weakref
+
+import config
+
+# Executed when the kernel starts and after every reset so common libraries stay imported
+WARM_UP_CODE = """
+import pandas as pd
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+"""
+
+
+class KernelError(Exception):
+    """The kernel process timed out or died; its state has been discarded."""
+
+
+class PythonKernel:
+    """
+    A long-lived Python subprocess that executes analysis scripts in one persistent namespace,
+    so imports and loaded DataFrames stay warm across engineer attempts and statistician turns.
+    Each execution is bounded by a wall-clock timeout and, on POSIX, a CPU-time limit, and the
+    whole process by an address-space limit. Requests and replies are JSON lines over a private pipe.
+    """
+    def __init__(self, timeout: float = config.KERNEL_TIMEOUT_SECONDS, cpu_seconds: int = config.KERNEL_CPU_SECONDS,
+                 memory_mb: int = config.KERNEL_MEMORY_MB):
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self._process = None
+        self._replies = None
+        self._finalizer = None
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        self._process = subprocess.Popen(
+            [sys.executable, "-u", os.path.abspath(__file__),
+             "--cpu-seconds", str(self.cpu_seconds or 0), "--memory-mb", str(self.memory_mb or 0)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, cwd=os.getcwd()
+        )
+        # Replies are read on a thread so the wall-clock timeout works on Windows pipes too (no select)
+        self._replies = queue.Queue()
+        threading.Thread(target=_read_replies, args=(self._process.stdout, self._replies), daemon=True).start()
+        # Kill the process when the orchestrator is garbage collected or the interpreter exits,
+        # without the exit hook keeping this object alive
+        self._finalizer = weakref.finalize(self, _kill_process, self._process)
+        self._request({"op": "ping"}, timeout=120)
+
+    def _kill(self):
+        if self._finalizer is not None:
+            self._finalizer()
+        self._process = None
+        self._finalizer = None
+
+    def _request(self, message: dict, timeout: float) -> dict:
+        if not self.alive:
+            self.start()
+        try:
+            self._process.stdin.write(json.dumps(message) + "\n")
+            self._process.stdin.flush()
+            line = self._replies.get(timeout=timeout)
+        except queue.Empty:
+            self._kill()
+            raise KernelError(f"Execution exceeded the {timeout}s time limit; the kernel was restarted and its state cleared.")
+        except (BrokenPipeError, OSError) as e:
+            self._kill()
+            raise KernelError(f"The kernel process failed ({e}); it will be restarted with a clean state.")
+        if not line:
+            self._kill()
+            raise KernelError("The kernel process died (possibly out of memory); it will be restarted with a clean state.")
+        return json.loads(line)
+
+    def execute(self, code: str) -> str:
+        """Runs code in the persistent namespace and returns its printed output (or traceback)."""
+        try:
+            return self._request({"op": "execute", "code": code}, self.timeout)["output"]
+        except KernelError as e:
+            return f"Traceback (most recent call last):\nKernelError: {e}"
+
+    def describe(self) -> str:
+        """Summary of the DataFrames currently loaded in the kernel, for the engineer's prompt."""
+        if not self.alive:
+            return "None (fresh session)."
+        try:
+            frames = self._request({"op": "describe"}, timeout=30)["dataframes"]
+        except KernelError:
+            return "None (fresh session)."
+        if not frames:
+            return "None."
+        return "\n".join(f"- `{name}`: {rows} rows x {cols} columns ({', '.join(columns)})" for name, rows, cols, columns in frames)
+
+    def reset(self):
+        """Clears all user state (DataFrames, variables); common imports are re-run."""
+        if self.alive:
+            try:
+                self._request({"op": "reset"}, timeout=120)
+                return
+            except KernelError:
+                pass
+        self.start()
+
+    def shutdown(self):
+        if self.alive:
+            try:
+                self._process.stdin.write(json.dumps({"op": "shutdown"}) + "\n")
+                self._process.stdin.flush()
+                self._process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        self._kill()
+
+
+def _read_replies(stream, replies: queue.Queue):
+    for line in stream:
+        replies.put(line)
+    replies.put("")  # EOF: the process exited
+
+
+def _kill_process(process: subprocess.Popen):
+    if process.poll() is None:
+        process.kill()
+    process.wait()
+
+
+# --- Kernel process ---
+def _serve(cpu_seconds: int, memory_mb: int):
+    import contextlib
+    import io
+    import signal
+    import traceback
+    try:
+        import resource
+    except ImportError:
+        # Windows has no rlimits; executions are then bounded by the parent's wall-clock timeout only
+        resource = None
+
+    # Keep the protocol on a private copy of stdout; stray C-level writes go to stderr instead
+    protocol = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1)
+
+    if resource is None or not hasattr(signal, "SIGXCPU"):
+        cpu_seconds = memory_mb = 0
+    if memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    if cpu_seconds:
+        def on_cpu_limit(signum, frame):
+            raise TimeoutError(f"Execution exceeded the {cpu_seconds}s CPU time limit.")
+        signal.signal(signal.SIGXCPU, on_cpu_limit)
+        _, cpu_hard = resource.getrlimit(resource.RLIMIT_CPU)
+
+    def fresh_namespace():
+        namespace = {"__name__": "__main__"}
+        try:
+            exec(WARM_UP_CODE, namespace)
+        except ImportError:
+            pass
+        return namespace
+
+    namespace = fresh_namespace()
+    for line in sys.stdin:
+        message = json.loads(line)
+        op = message["op"]
+        if op == "shutdown":
+            break
+        if op == "ping":
+            reply = {"ok": True}
+        elif op == "reset":
+            namespace = fresh_namespace()
+            reply = {"ok": True}
+        elif op == "describe":
+            pd = sys.modules.get("pandas")
+            reply = {"dataframes": [
+                [name, value.shape[0], value.shape[1], [str(c) for c in value.columns[:20]]]
+                for name, value in namespace.items()
+                if pd is not None and isinstance(value, pd.DataFrame) and not name.startswith("_")
+            ]}
+        else:
+            buffer = io.StringIO()
+            if cpu_seconds:
+                usage = resource.getrusage(resource.RUSAGE_SELF)
+                resource.setrlimit(resource.RLIMIT_CPU, (int(usage.ru_utime + usage.ru_stime) + cpu_seconds, cpu_hard))
+            try:
+                with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+                    exec(compile(message["code"], "<analysis>", "exec"), namespace)
+            except BaseException:
+                buffer.write(traceback.format_exc())
+            finally:
+                if cpu_seconds:
+                    resource.setrlimit(resource.RLIMIT_CPU, (cpu_hard, cpu_hard))
+            reply = {"output": buffer.getvalue()}
+        protocol.write(json.dumps(reply) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    args = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+    _serve(int(args.get("--cpu-seconds", 0)), int(args.get("--memory-mb", 0)))
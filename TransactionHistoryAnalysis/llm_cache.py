@@ -0,0 +1,143 @@
+# llm_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+
+import config
+
+# Per-thread record of whether the most recent cache lookup was a hit (read by usage_tracking.py)
+_lookup_state = threading.local()
+
+
+def last_lookup_hit() -> bool:
+    return getattr(_lookup_state, "hit", False)
+
+
+class ResponseCache:
+    """SQLite-backed key/value store for LLM responses with TTL and LRU size eviction."""
+    def __init__(self, path: str, ttl_seconds: Optional[float] = None, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, "
+                "accessed REAL NOT NULL, size INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A short-lived connection per operation is safe across Streamlit threads and processes;
+        # sqlite3's own context manager only commits, so the connection is closed explicitly
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row:
+                conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        with self._lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if row else None
+
+    def put(self, key: str, value: str):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                         (key, value, now, now, len(value.encode("utf-8"))))
+        self.evict()
+
+    def evict(self) -> int:
+        """Drops expired entries, then the least recently used ones until under max_bytes."""
+        removed = 0
+        with self._connect() as conn:
+            if self.ttl_seconds is not None:
+                removed += conn.execute("DELETE FROM responses WHERE created < ?",
+                                        (time.time() - self.ttl_seconds,)).rowcount
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    total -= size
+                    removed += 1
+        return removed
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+class LangChainResponseCache(BaseCache):
+    """
+    LangChain cache adapter for ChatVertexAI. LangChain's llm_string already encodes the
+    model name, temperature and any bound tool schema, so hashing it with the serialized
+    messages gives the full cache key.
+    """
+    def __init__(self, store: ResponseCache):
+        self.store = store
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        value = self.store.get(self._key(prompt, llm_string))
+        _lookup_state.hit = value is not None
+        if value is None:
+            return None
+        return [loads(generation) for generation in json.loads(value)]
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        self.store.put(self._key(prompt, llm_string), json.dumps([dumps(generation) for generation in return_val]))
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear()
+
+
+_shared_cache = None
+
+
+def get_llm_cache() -> Optional[LangChainResponseCache]:
+    """The process-wide response cache configured in config.py, or None when disabled."""
+    global _shared_cache
+    if not config.LLM_CACHE_ENABLED:
+        return None
+    if _shared_cache is None:
+        _shared_cache = LangChainResponseCache(ResponseCache(
+            config.LLM_CACHE_PATH,
+            ttl_seconds=config.LLM_CACHE_TTL_SECONDS,
+            max_bytes=config.LLM_CACHE_MAX_BYTES,
+        ))
+    return _shared_cache
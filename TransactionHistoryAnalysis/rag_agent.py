@@ -1,6 +1,8 @@
 # rag_agent.py
 import os
 import config
+from llm_cache import get_llm_cache
+from usage_tracking import get_usage_tracker, call_config
 from langchain_google_vertexai import ChatVertexAI, VertexAIEmbeddings
 from langchain_community.vectorstores import FAISS
 from langchain_core.prompts import ChatPromptTemplate
@@ -27,7 +29,9 @@ class RAGAgent:
         )
         self.llm = ChatVertexAI(
             project=config.PROJECT_ID, 
-            model_name=config.MODEL_NAME
+            model_name=config.MODEL_NAME,
+            cache=get_llm_cache(),
+            callbacks=[get_usage_tracker()]
         )
 
         # 2. Load the local FAISS vector store
@@ -65,7 +69,7 @@ class RAGAgent:
     def answer(self, query: str):
         """Answers a query using the RAG chain."""
         print(f"\n--- 🤔 Querying RAG Agent with: '{query}' ---")
-        return self.rag_chain.invoke(query)
+        return self.rag_chain.invoke(query, config=call_config("RAG Agent"))
 
 # --- Example Usage (for testing) ---
 if __name__ == '__main__':
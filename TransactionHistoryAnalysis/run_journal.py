@@ -0,0 +1,177 @@
+# run_journal.py
+
+import fnmatch
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import config
+
+# Report files a run writes for itself; a base run's copies are kept apart so new cycles neither
+# overwrite them by name nor pick them up as their own
+RUN_REPORT_PATTERNS = ("intermediate_report_*.md", "final_business_report.md")
+
+
+def messages_to_records(messages: list) -> list:
+    """Serializes a statistician conversation history for the journal."""
+    return [{"role": "ai" if isinstance(msg, AIMessage) else "human", "content": msg.content} for msg in messages]
+
+
+def records_to_messages(records: list) -> list:
+    """Rebuilds a statistician conversation history from journal records."""
+    return [AIMessage(content=r["content"]) if r["role"] == "ai" else HumanMessage(content=r["content"]) for r in records]
+
+
+class RunJournal:
+    """
+    Records a workflow run under runs/<run_id>/ so it can be resumed after the session dies:
+    journal.jsonl holds every yielded event, cycle report and directive/result pair,
+    state.json holds the latest resumable position, and output/ mirrors the working
+    output directory (which app.py clears at the start of every run).
+    """
+    def __init__(self, run_id: Optional[str] = None, root: str = config.RUNS_DIR):
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S_") + uuid.uuid4().hex[:6]
+        self.directory = os.path.join(root, self.run_id)
+        self.journal_path = os.path.join(self.directory, "journal.jsonl")
+        self.state_path = os.path.join(self.directory, "state.json")
+        self.meta_path = os.path.join(self.directory, "meta.json")
+        self.output_mirror = os.path.join(self.directory, "output")
+        os.makedirs(self.directory, exist_ok=True)
+        self.state = self._read_json(self.state_path) or {}
+        self._entries = self._count_entries()
+
+    @staticmethod
+    def _read_json(path: str):
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_json(self, path: str, data: dict):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _count_entries(self) -> int:
+        if not os.path.exists(self.journal_path):
+            return 0
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            return sum(1 for line in f if line.strip())
+
+    def _append(self, kind: str, **payload):
+        entry = {"time": datetime.now().isoformat(timespec="seconds"), "kind": kind, **payload}
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        self._entries += 1
+
+    # --- Recording ---
+    def start(self, local_csv_path: str, user_prompt: str, parent_run_id: Optional[str] = None,
+              dataset: Optional[dict] = None):
+        meta = self.meta() or {"created": datetime.now().isoformat(timespec="seconds")}
+        meta.update({"run_id": self.run_id, "csv_path": local_csv_path, "user_prompt": user_prompt,
+                     "parent_run_id": parent_run_id, "dataset": dataset, "status": "running"})
+        self._write_json(self.meta_path, meta)
+
+    def set_status(self, status: str):
+        meta = self.meta() or {}
+        meta["status"] = status
+        self._write_json(self.meta_path, meta)
+
+    def record_event(self, event: dict):
+        self._append("event", event=event)
+
+    def record_directive_result(self, cycle_num: int, turn: int, directive: str, result: str, plots: list):
+        self._append("directive_result", cycle=cycle_num, turn=turn, directive=directive, result=result, plots=plots)
+
+    def record_cycle_report(self, cycle_num: int, report_content: str, figures: list):
+        self._append("cycle_report", cycle=cycle_num, report=report_content, figures=figures)
+
+    def checkpoint(self, **position):
+        """Saves the resumable position and mirrors the output directory alongside it."""
+        self.state.update(position)
+        self.state["journal_entries"] = self._entries
+        self.state["updated"] = datetime.now().isoformat(timespec="seconds")
+        self._write_json(self.state_path, self.state)
+        self.sync_output()
+
+    def sync_output(self, output_dir: str = "output"):
+        """Copies new or changed files from output/ into the run's mirror."""
+        if not os.path.exists(output_dir):
+            return
+        for dirpath, _, filenames in os.walk(output_dir):
+            for filename in filenames:
+                source = os.path.join(dirpath, filename)
+                target = os.path.join(self.output_mirror, os.path.relpath(source, output_dir))
+                if os.path.exists(target):
+                    src_stat, dst_stat = os.stat(source), os.stat(target)
+                    if src_stat.st_size == dst_stat.st_size and src_stat.st_mtime <= dst_stat.st_mtime:
+                        continue
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(source, target)
+
+    # --- Resuming ---
+    def meta(self) -> Optional[dict]:
+        return self._read_json(self.meta_path)
+
+    def rewind(self):
+        """
+        Drops journal entries recorded after the last checkpoint. A resumed run redoes that
+        work and journals it again, so replaying them as well would show those events twice.
+        """
+        keep = self.state.get("journal_entries")
+        if keep is None or keep >= self._entries:
+            return
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            lines = [line for line in f if line.strip()][:keep]
+        tmp_path = f"{self.journal_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        os.replace(tmp_path, self.journal_path)
+        self._entries = keep
+
+    def events(self) -> list:
+        """All events recorded so far, in order."""
+        if not os.path.exists(self.journal_path):
+            return []
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        return [entry["event"] for entry in entries if entry["kind"] == "event"]
+
+    def restore_output(self, output_dir: str = "output", as_base: bool = False):
+        """
+        Restores the mirrored output files into the working output directory.
+        as_base (a new run building on this one) moves this run's reports into
+        output/base_<run_id>/; plots and data files stay in place so their paths keep working.
+        """
+        if not os.path.exists(self.output_mirror):
+            return
+        if not as_base:
+            shutil.copytree(self.output_mirror, output_dir, dirs_exist_ok=True)
+            return
+        reports_dir = os.path.join(output_dir, f"base_{self.run_id}")
+        for dirpath, _, filenames in os.walk(self.output_mirror):
+            relative_dir = os.path.relpath(dirpath, self.output_mirror)
+            for filename in filenames:
+                is_report = relative_dir == "." and any(fnmatch.fnmatch(filename, p) for p in RUN_REPORT_PATTERNS)
+                target_dir = reports_dir if is_report else os.path.join(output_dir, relative_dir)
+                os.makedirs(target_dir, exist_ok=True)
+                shutil.copy2(os.path.join(dirpath, filename), os.path.join(target_dir, filename))
+
+
+def list_runs(root: str = config.RUNS_DIR) -> list:
+    """Metadata for all recorded runs, newest first."""
+    if not os.path.exists(root):
+        return []
+    runs = []
+    for run_id in os.listdir(root):
+        meta_path = os.path.join(root, run_id, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                runs.append(json.load(f))
+    return sorted(runs, key=lambda meta: meta.get("created", ""), reverse=True)
@@ -0,0 +1,156 @@
+# usage_tracking.py
+
+import json
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+import config
+from llm_cache import last_lookup_hit
+
+
+def _estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+class UsageTracker(BaseCallbackHandler):
+    """
+    LangChain callback handler that appends one JSON line per chat model call to the usage log:
+    the calling role and loop position (from the invoke config's metadata), input and output
+    tokens, latency, retries and whether the response came from the response cache.
+    """
+    def __init__(self, path: str = config.USAGE_LOG_PATH):
+        self.path = path
+        self._runs = {}
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Starts a fresh log (new runs); resumed runs keep appending to the restored one."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def on_chat_model_start(self, serialized: dict, messages: list, *, run_id, metadata: Optional[dict] = None, **kwargs: Any):
+        input_text = "\n".join(str(message.content) for batch in messages for message in batch)
+        with self._lock:
+            self._runs[run_id] = {
+                "start": time.monotonic(),
+                "metadata": dict(metadata or {}),
+                "input_estimate": _estimate_tokens(input_text),
+                "retries": 0,
+            }
+
+    def on_retry(self, retry_state: Any, *, run_id, **kwargs: Any):
+        with self._lock:
+            if run_id in self._runs:
+                self._runs[run_id]["retries"] += 1
+
+    def on_llm_end(self, response: Any, *, run_id, **kwargs: Any):
+        run = self._pop(run_id)
+        if run is None:
+            return
+        generation = response.generations[0][0] if response.generations and response.generations[0] else None
+        message = getattr(generation, "message", None)
+        usage = getattr(message, "usage_metadata", None) or {}
+        cache_hit = last_lookup_hit()
+        if cache_hit:
+            input_tokens, output_tokens, source = 0, 0, "cache"
+        elif usage:
+            input_tokens, output_tokens, source = usage.get("input_tokens", 0), usage.get("output_tokens", 0), "provider"
+        else:
+            text = getattr(generation, "text", "") or ""
+            input_tokens, output_tokens, source = run["input_estimate"], _estimate_tokens(text), "estimate"
+        self._write(run, input_tokens=input_tokens, output_tokens=output_tokens, token_source=source,
+                    cache_hit=cache_hit, error=None)
+
+    def on_llm_error(self, error: BaseException, *, run_id, **kwargs: Any):
+        run = self._pop(run_id)
+        if run is not None:
+            self._write(run, input_tokens=0, output_tokens=0, token_source="none", cache_hit=False,
+                        error=f"{type(error).__name__}: {error}")
+
+    def _pop(self, run_id) -> Optional[dict]:
+        with self._lock:
+            return self._runs.pop(run_id, None)
+
+    def _write(self, run: dict, **fields: Any):
+        metadata = run["metadata"]
+        record = {
+            "time": round(time.time(), 3),
+            "role": metadata.get("role", "unknown"),
+            "position": {key: metadata[key] for key in ("cycle", "turn", "attempt") if key in metadata},
+            "latency_seconds": round(time.monotonic() - run["start"], 3),
+            "retries": run["retries"],
+            **fields,
+        }
+        with self._lock:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+
+def write_usage_summary(log_path: str = config.USAGE_LOG_PATH, summary_path: str = config.USAGE_SUMMARY_PATH) -> Optional[str]:
+    """Aggregates the usage log per role into a markdown table; returns the summary path."""
+    if not os.path.exists(log_path):
+        return None
+    with open(log_path, "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+
+    roles = {}
+    for record in records:
+        roles.setdefault(record["role"], []).append(record)
+    rows = []
+    for role, calls in roles.items():
+        latencies = sorted(call["latency_seconds"] for call in calls)
+        rows.append({
+            "role": role,
+            "calls": len(calls),
+            "cache_hits": sum(1 for call in calls if call["cache_hit"]),
+            "retries": sum(call["retries"] for call in calls) + sum(1 for call in calls if call["error"]),
+            "input_tokens": sum(call["input_tokens"] for call in calls),
+            "output_tokens": sum(call["output_tokens"] for call in calls),
+            "latency": sum(latencies),
+            "p50": latencies[len(latencies) // 2],
+            "max": latencies[-1],
+        })
+    rows.sort(key=lambda row: row["input_tokens"] + row["output_tokens"], reverse=True)
+
+    estimated = [record for record in records if record["token_source"] == "estimate"]
+    lines = [
+        "# LLM Usage Summary",
+        "",
+        f"**Calls:** {len(records)} ({len(estimated)} with estimated token counts)",
+        f"**Input tokens:** {sum(row['input_tokens'] for row in rows):,} "
+        f"({sum(record['input_tokens'] for record in estimated):,} estimated)",
+        f"**Output tokens:** {sum(row['output_tokens'] for row in rows):,} "
+        f"({sum(record['output_tokens'] for record in estimated):,} estimated)",
+        f"**LLM time:** {sum(row['latency'] for row in rows):.1f}s",
+        "",
+        "| Role | Calls | Cache Hits | Retries | Input Tokens | Output Tokens | Total (s) | p50 (s) | Max (s) |",
+        "|---|---|---|---|---|---|---|---|---|",
+    ]
+    for row in rows:
+        lines.append(f"| {row['role']} | {row['calls']} | {row['cache_hits']} | {row['retries']} | {row['input_tokens']:,} | "
+                     f"{row['output_tokens']:,} | {row['latency']:.1f} | {row['p50']:.1f} | {row['max']:.1f} |")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return summary_path
+
+
+_shared_tracker = None
+
+
+def get_usage_tracker() -> UsageTracker:
+    """The process-wide usage tracker shared by every chat model."""
+    global _shared_tracker
+    if _shared_tracker is None:
+        _shared_tracker = UsageTracker()
+    return _shared_tracker
+
+
+def call_config(role: str, **position: Any) -> dict:
+    """Invoke config that tags a model call with its role and loop position for the usage log."""
+    return {"run_name": role, "metadata": {"role": role, **{key: value for key, value in position.items() if value is not None}}}
@@ -14,7 +14,7 @@ from pathlib import Path
 # Add src to Python path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from run_review import run_scientific_review
+from run_review import run_scientific_review, run_batch_review
 
 def main():
     """Main entry point for the Elite Scientific Review Crew"""
@@ -24,6 +24,8 @@ def main():
         epilog="""
 Examples:
   python elite_review.py research_paper.pdf
+  python elite_review.py papers/ --batch --max-in-flight 6
+  python elite_review.py manifest.txt --batch
   python elite_review.py --help
   python elite_review.py --version
         """
@@ -33,7 +35,7 @@ Examples:
         "pdf_path",
         nargs="?",
         default="research_paper.pdf",
-        help="Path to the PDF file to review (default: research_paper.pdf)"
+        help="Path to the PDF file to review, or a directory/manifest with --batch (default: research_paper.pdf)"
     )
     
     parser.add_argument(
@@ -49,8 +51,109 @@ Examples:
         help="Enable verbose output"
     )
     
+    parser.add_argument(
+        "--pdf-workers",
+        type=int,
+        default=1,
+        help="Worker processes for PDF page extraction (0 = one per CPU, default: 1)"
+    )
+    
+    parser.add_argument(
+        "--render-all-pages",
+        action="store_true",
+        help="Rasterize every page instead of only pages containing figures"
+    )
+    
+    parser.add_argument(
+        "--raw-text",
+        action="store_true",
+        help="Send raw page text instead of the structured section extraction"
+    )
+    
+    parser.add_argument(
+        "--specialist-token-budget",
+        type=int,
+        default=None,
+        help="Give each specialist only the abstract plus its most relevant sections, capped at this many tokens"
+    )
+    
+    parser.add_argument(
+        "--max-specialists",
+        type=int,
+        default=None,
+        help="Route the paper to at most this many relevant specialists (default: deploy all)"
+    )
+    
+    parser.add_argument(
+        "--min-specialists",
+        type=int,
+        default=3,
+        help="Minimum number of specialists kept when routing (default: 3)"
+    )
+    
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=None,
+        help="Run specialists on a bounded executor with at most this many concurrent LLM calls"
+    )
+    
+    parser.add_argument(
+        "--call-timeout",
+        type=float,
+        default=600.0,
+        help="Per-task timeout in seconds when using --max-in-flight (default: 600)"
+    )
+    
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Always call the model instead of reusing cached responses for identical prompts"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse checkpointed task outputs for this paper and prompt version; only unfinished tasks run"
+    )
+    
+    parser.add_argument(
+        "--search-index",
+        default=None,
+        help="Search an offline SQLite FTS5 index (built with src/tools/search_backends.py) instead of the web"
+    )
+    
+    parser.add_argument(
+        "--no-claim-verification",
+        action="store_true",
+        help="Skip the central claim extraction and verification stage; specialists search on their own"
+    )
+    
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Review every PDF in a directory or manifest (.txt with one path per line, or .json list)"
+    )
+    
+    parser.add_argument(
+        "--max-concurrent-papers",
+        type=int,
+        default=2,
+        help="Papers reviewed at once in batch mode; the next paper is extracted meanwhile (default: 2)"
+    )
+    
+    parser.add_argument(
+        "--output-dir",
+        default=None,
+        help="Batch mode output directory (default: reports/batch_<timestamp>)"
+    )
+    
     args = parser.parse_args()
     
+    if args.search_index:
+        # Read lazily by the shared search tool on its first query
+        os.environ["LOCAL_SEARCH_INDEX"] = args.search_index
+    
     # Check if PDF file exists
     if not os.path.exists(args.pdf_path):
         print(f"❌ Error: PDF file not found: {args.pdf_path}")
@@ -70,8 +173,45 @@ Examples:
     print("=" * 50)
     
     try:
+        if args.batch:
+            records = run_batch_review(
+                args.pdf_path,
+                output_dir=args.output_dir,
+                max_concurrent_papers=args.max_concurrent_papers,
+                max_in_flight=args.max_in_flight or 4,
+                call_timeout=args.call_timeout,
+                pdf_workers=args.pdf_workers,
+                render_all_pages=args.render_all_pages,
+                raw_text=args.raw_text,
+                specialist_token_budget=args.specialist_token_budget,
+                max_specialists=args.max_specialists,
+                min_specialists=args.min_specialists,
+                llm_cache=not args.no_llm_cache,
+                resume=args.resume,
+                verify_claims=not args.no_claim_verification
+            )
+            if not records or not any(record["status"] == "ok" for record in records):
+                print("\n❌ Batch review failed. Check the logs for details.")
+                sys.exit(1)
+            for record in records:
+                print(f"📊 {os.path.basename(record['pdf_path'])}: {record['decision'] or record['status']}")
+            return
+        
         # Run the scientific review
-        result = run_scientific_review(args.pdf_path)
+        result = run_scientific_review(
+            args.pdf_path,
+            pdf_workers=args.pdf_workers,
+            render_all_pages=args.render_all_pages,
+            raw_text=args.raw_text,
+            specialist_token_budget=args.specialist_token_budget,
+            max_specialists=args.max_specialists,
+            min_specialists=args.min_specialists,
+            max_in_flight=args.max_in_flight,
+            call_timeout=args.call_timeout,
+            llm_cache=not args.no_llm_cache,
+            resume=args.resume,
+            verify_claims=not args.no_claim_verification
+        )
         
         if result:
             print("\n🎉 Review completed successfully!")
@@ -9,11 +9,24 @@ from dotenv import load_dotenv
 sys.path.append(os.path.join(os.path.dirname(__file__), 'scientific_review_crew', 'src'))
 
 from tools.pdf_tools import PDFTool
+from tools.structure_tools import PaperStructureTool
 from crew import assemble_crew
+from agents import web_search_tool
+from claims import build_claim_evidence
+from context_slicing import estimate_tokens
+from router import route_domains
+from executor import SpecialistExecutor, kickoff_with_executor
+from batch import collect_pdfs, report_dir_names, run_pipeline, write_batch_summary
+from llm_cache import CachedLLM, ResponseCache
+from instrumentation import InstrumentedLLM, UsageRecorder
+from checkpoint import TaskCheckpointStore
+from tasks import PROMPT_VERSION
 from crewai.llm import LLM
 from datetime import datetime
+import time
+from typing import Optional
 
-def save_reports_to_files(crew, final_result, pdf_path, webapp_reports_dir=None):
+def save_reports_to_files(crew, final_result, pdf_path, webapp_reports_dir=None, routing=None):
     """Save all reports to markdown files"""
     # Use webapp reports directory if provided, otherwise use default
     if webapp_reports_dir:
@@ -80,18 +93,25 @@ def save_reports_to_files(crew, final_result, pdf_path, webapp_reports_dir=None)
         f.write("## Final Result\n\n")
         f.write(f"**Decision:** {final_result}\n\n")
         f.write("## Reports Generated\n\n")
-        f.write("- Individual specialist reports (9 domains)\n")
+        f.write(f"- Individual specialist reports ({len(crew.tasks) - 2} domains)\n")
         f.write("- Comprehensive synthesis report\n")
         f.write("- Editorial decision report\n")
+        f.write("- LLM usage summary (usage_summary.md, per-call log in usage.jsonl)\n")
         f.write("- This summary report\n")
+        if routing:
+            f.write("\n## Specialist Routing\n\n")
+            f.write(f"**Deployed:** {', '.join(routing['selected'])}\n")
+            f.write(f"**Skipped:** {', '.join(routing['skipped']) or 'none'}\n\n")
+            f.write("| Domain | Relevance Score |\n|---|---|\n")
+            for domain, score in routing['scores'].items():
+                f.write(f"| {domain} | {score:.3f} |\n")
     print(f"[OK] Saved review summary: {summary_filename}")
     
     print(f"\n[DIR] All reports saved to: {reports_dir}")
+    return reports_dir
 
-def run_scientific_review(pdf_path: str):
-    """Run the complete scientific review process"""
-    print("=== Scientific Review Crew System ===")
-    
+def setup_environment() -> bool:
+    """Load .env and export the credentials the crew needs; False if any are missing"""
     # Load environment variables from .env file
     load_dotenv()
     
@@ -99,67 +119,201 @@ def run_scientific_review(pdf_path: str):
     gcp_project_id = os.getenv("GCP_PROJECT_ID")
     gcp_region = os.getenv("GCP_REGION")
     serper_api_key = os.getenv("SERPER_API_KEY")
+    local_search_index = os.getenv("LOCAL_SEARCH_INDEX")
     
-    # Check if required environment variables are set
-    if not all([gcp_project_id, gcp_region, serper_api_key]):
+    # Check if required environment variables are set (a local search index replaces the Serper key)
+    if not all([gcp_project_id, gcp_region, serper_api_key or local_search_index]):
         print("[ERR] Error: Missing required environment variables")
         print("Please create a .env file with:")
         print("GCP_PROJECT_ID=your-gcp-project-id")
         print("GCP_REGION=us-central1")
-        print("SERPER_API_KEY=your-serper-api-key")
-        return None
+        print("SERPER_API_KEY=your-serper-api-key (or LOCAL_SEARCH_INDEX=path/to/index.sqlite)")
+        return False
     
     # Set environment variables
     os.environ["GCP_PROJECT_ID"] = gcp_project_id
     os.environ["GCP_REGION"] = gcp_region
-    os.environ["SERPER_API_KEY"] = serper_api_key
+    if serper_api_key:
+        os.environ["SERPER_API_KEY"] = serper_api_key
+    if local_search_index:
+        print(f"[SEARCH] Verifying claims offline against {local_search_index}")
     os.environ['GOOGLE_CLOUD_PROJECT'] = gcp_project_id
-    
-    # Set up Gemini 2.5 Flash
+    return True
+
+def create_llm(llm_cache: bool = True, cache_path: str = "output/llm_cache.sqlite"):
+    """Set up Gemini 2.5 Flash, optionally behind the persistent response cache"""
     print("[SETUP] Setting up Gemini 2.5 Flash...")
-    gemini_llm = LLM(
+    llm = LLM(
         model="vertex_ai/gemini-2.5-flash",
         api_key="",
         temperature=0.1
     )
-    
+    if llm_cache:
+        print(f"[CACHE] Reusing identical LLM responses from {cache_path}")
+        llm = CachedLLM(llm, ResponseCache(cache_path))
+    return llm
+
+def prepare_paper(pdf_path: str, pdf_workers: int = 1, render_all_pages: bool = False, raw_text: bool = False,
+                  max_specialists: Optional[int] = None, min_specialists: int = 3) -> dict:
+    """Extract, render and structure a PDF and route it to specialists; no LLM calls"""
     # Process the PDF
     print(f"[PDF] Processing PDF: {pdf_path}")
-    pdf_tool = PDFTool()
-    result = pdf_tool._run(pdf_path)
-    
-    print(f"[OK] Processed {result['summary']['total_pages']} pages")
-    print(f"[OK] Extracted {result['summary']['total_text_length']:,} characters of text")
+    pdf_tool = PDFTool(max_workers=pdf_workers, lazy=not render_all_pages)
     
-    # Prepare the paper content
+    # Build the paper content while later pages are still being extracted; structured mode
+    # parses the text itself below, so the page pass then only collects figures
     print("[PREP] Preparing paper content...")
     paper_text = ""
     figure_paths = []
+    figure_pages = []
+    estimated_tokens = 0
+    total_pages = 0
+    total_text_length = 0
     
-    for page in result['pages']:
-        paper_text += f"\n\n--- PAGE {page['page_number']} ---\n"
-        paper_text += page['text']
+    for page in pdf_tool.iter_pages(pdf_path, with_text=raw_text):
+        if raw_text:
+            page_block = f"\n\n--- PAGE {page['page_number']} ---\n" + page['text']
+            paper_text += page_block
+            estimated_tokens += estimate_tokens(page_block)
+            total_text_length += page['text_length']
+        total_pages += 1
         if page['image_path']:
             figure_paths.append(page['image_path'])
+        elif page.get('has_visuals'):
+            figure_pages.append(page['page_number'])
+    
+    print(f"[OK] Processed {total_pages} pages")
+    if raw_text:
+        print(f"[OK] Extracted {total_text_length:,} characters of text (~{estimated_tokens:,} tokens)")
+    
+    if figure_pages:
+        # Only pages with images or drawings are rasterized for the figure list
+        print(f"[PDF] Rendering {len(figure_pages)} pages with figures...")
+        render_stats = []
+        figure_paths = [path for path in pdf_tool.render_pages(pdf_path, figure_pages, render_stats).values() if path]
+        print(f"[OK] Wrote {sum(s['bytes_written'] for s in render_stats):,} bytes of page images "
+              f"in {sum(s['render_time'] for s in render_stats):.2f}s")
     
-    figure_paths_str = "\n".join(figure_paths)
+    paper_sections = None
+    if not raw_text:
+        # Send sections and figure captions instead of raw pages with headers, gutters and references
+        structure = PaperStructureTool()._run(pdf_path)
+        paper_text = structure['text']
+        paper_sections = structure['sections']
+        print(f"[OK] Structured {len(structure['sections'])} sections, {len(structure['figures'])} figures, "
+              f"{len(structure['references'])} references (~{estimate_tokens(paper_text):,} tokens)")
+    
+    # Route the paper to the most relevant specialists
+    routing = None
+    if max_specialists:
+        routing = route_domains(paper_text, min_specialists=min_specialists, max_specialists=max_specialists)
+        print(f"[ROUTE] Deploying {len(routing['selected'])} specialists: {', '.join(routing['selected'])}")
+        print(f"[ROUTE] Skipping: {', '.join(routing['skipped']) or 'none'}")
+    
+    return {
+        "paper_text": paper_text,
+        "figure_paths": "\n".join(figure_paths),
+        "paper_sections": paper_sections,
+        "routing": routing,
+    }
+
+def review_paper(llm, paper: dict, pdf_path: str, specialist_token_budget: Optional[int] = None,
+                 executor: Optional[SpecialistExecutor] = None, reports_dir: Optional[str] = None,
+                 resume: bool = False, verify_claims: bool = True):
+    """Run the review crew on a prepared paper and save its reports.
+    Every task output is checkpointed; resume skips tasks already completed for this paper.
+    Tokens and latency of every LLM call are recorded per agent role alongside the reports.
+    verify_claims extracts and searches the paper's key claims once, before the crew starts,
+    and hands the evidence to every specialist."""
+    routing = paper['routing']
+    usage = UsageRecorder()
+    
+    checkpoints = TaskCheckpointStore.for_paper(pdf_path, PROMPT_VERSION)
+    
+    claim_evidence = None
+    if verify_claims:
+        # The evidence is part of every specialist prompt and so of the checkpoint keys: reuse it on resume
+        claim_evidence = checkpoints.load_claim_evidence() if resume else None
+        if claim_evidence is not None:
+            print("[CLAIMS] Reusing the claim evidence stored with the checkpoints")
+        else:
+            print("[CLAIMS] Extracting key claims for central verification...")
+            try:
+                claim_evidence = build_claim_evidence(InstrumentedLLM(llm, usage, role="Claim Extractor"),
+                                                      paper['paper_text'], web_search_tool, paper['paper_sections'],
+                                                      executor=executor)
+            except Exception as e:
+                print(f"[WARN] Claim verification failed ({e}); specialists will verify claims themselves")
+                claim_evidence = None
+            checkpoints.save_claim_evidence(claim_evidence)
+    llm = InstrumentedLLM(llm, usage)
     
     # Assemble the crew
     print("[CREW] Assembling scientific review crew...")
-    crew = assemble_crew(gemini_llm, paper_text, figure_paths_str)
+    if specialist_token_budget and not paper['paper_sections']:
+        print("[WARN] Context slicing needs structured text; specialists will receive the full paper")
+    crew = assemble_crew(llm, paper['paper_text'], paper['figure_paths'], paper['paper_sections'],
+                         specialist_token_budget, routing['selected'] if routing else None, claim_evidence)
+    
+    # Checkpoint each task output as soon as it completes
+    checkpoints.attach(crew.tasks)
+    if resume:
+        restored = checkpoints.restore(crew.tasks)
+        print(f"[RESUME] Restored {len(restored)}/{len(crew.tasks)} task outputs from {checkpoints.directory}")
+        if not restored and checkpoints.has_task_outputs():
+            print("[WARN] Checkpoints exist for this paper but none match the current task prompts")
+        # Restored tasks are skipped by the executor, which runs the remaining specialists concurrently
+        executor = executor or SpecialistExecutor()
     
     # Execute the review
-    print("[START] Starting scientific review...")
+    print(f"[START] Starting scientific review of {pdf_path}...")
     print("=" * 60)
     
-    try:
+    if executor:
+        # Explicit executor: bounded in-flight LLM calls with timeouts and rate-limit retries
+        result = kickoff_with_executor(crew, executor)
+    else:
         result = crew.kickoff()
-        print("=" * 60)
-        print("[OK] Scientific review completed!")
+    print("=" * 60)
+    print("[OK] Scientific review completed!")
+    
+    # Save all reports to files
+    print("[SAVE] Saving reports to files...")
+    reports_dir = save_reports_to_files(crew, result, pdf_path, webapp_reports_dir=reports_dir, routing=routing)
+    usage_filename = usage.write(reports_dir)
+    print(f"[OK] Saved LLM usage summary: {usage_filename}")
+    return result
+
+def run_scientific_review(pdf_path: str, pdf_workers: int = 1, render_all_pages: bool = False,
+                          raw_text: bool = False, specialist_token_budget: Optional[int] = None,
+                          max_specialists: Optional[int] = None, min_specialists: int = 3,
+                          max_in_flight: Optional[int] = None, call_timeout: float = 600.0,
+                          llm_cache: bool = True, resume: bool = False, verify_claims: bool = True):
+    """Run the complete scientific review process"""
+    print("=== Scientific Review Crew System ===")
+    
+    if not setup_environment():
+        return None
+    
+    gemini_llm = create_llm(llm_cache)
+    paper = prepare_paper(pdf_path, pdf_workers, render_all_pages, raw_text, max_specialists, min_specialists)
+    
+    try:
+        executor = None
+        if max_in_flight:
+            executor = SpecialistExecutor(max_in_flight=max_in_flight, call_timeout=call_timeout)
+        result = review_paper(gemini_llm, paper, pdf_path, specialist_token_budget, executor, resume=resume,
+                              verify_claims=verify_claims)
+        if executor:
+            overlap = executor.overlap_report()
+            print(f"[EXEC] {overlap['calls']} calls, peak {overlap['peak_in_flight']} in flight, "
+                  f"overlap x{overlap['overlap_factor']}, {overlap['retries']} retries")
         
-        # Save all reports to files
-        print("[SAVE] Saving reports to files...")
-        save_reports_to_files(crew, result, pdf_path)
+        if llm_cache:
+            cache_stats = gemini_llm.cache.stats()
+            print(f"[CACHE] {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+        search_stats = web_search_tool.cache_stats()
+        print(f"[SEARCH] {search_stats['hits']} cached, {search_stats['misses']} sent to the search API")
         
         print(f"\n[RESULT] Final Result: {result}")
         
@@ -169,6 +323,53 @@ def run_scientific_review(pdf_path: str):
         print(f"[ERR] Error during review: {str(e)}")
         return None
 
+def run_batch_review(source: str, output_dir: Optional[str] = None, max_concurrent_papers: int = 2,
+                     max_in_flight: int = 4, call_timeout: float = 600.0, pdf_workers: int = 1,
+                     render_all_pages: bool = False, raw_text: bool = False,
+                     specialist_token_budget: Optional[int] = None, max_specialists: Optional[int] = None,
+                     min_specialists: int = 3, llm_cache: bool = True, resume: bool = False,
+                     verify_claims: bool = True):
+    """
+    Review every PDF in a directory or manifest. Extraction of the next paper overlaps
+    the LLM work of the papers in flight; one LLM client and one executor are shared,
+    so max_in_flight caps LLM calls across the whole batch.
+    """
+    print("=== Scientific Review Crew System (batch) ===")
+    
+    pdf_paths = collect_pdfs(source)
+    if not pdf_paths:
+        print(f"[ERR] No PDF files found in: {source}")
+        return None
+    print(f"[BATCH] {len(pdf_paths)} papers, up to {max_concurrent_papers} in review, "
+          f"{max_in_flight} LLM calls in flight")
+    
+    if not setup_environment():
+        return None
+    
+    gemini_llm = create_llm(llm_cache)
+    executor = SpecialistExecutor(max_in_flight=max_in_flight, call_timeout=call_timeout)
+    output_dir = output_dir or f"reports/batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    
+    def prepare(pdf_path):
+        return prepare_paper(pdf_path, pdf_workers, render_all_pages, raw_text, max_specialists, min_specialists)
+    
+    report_names = report_dir_names(pdf_paths)
+    
+    def review(pdf_path, paper):
+        reports_dir = os.path.join(output_dir, report_names[pdf_path])
+        return review_paper(gemini_llm, paper, pdf_path, specialist_token_budget, executor, reports_dir, resume,
+                            verify_claims)
+    
+    start = time.monotonic()
+    records = run_pipeline(pdf_paths, prepare, review, max_concurrent_papers)
+    summary_filename = write_batch_summary(records, output_dir, time.monotonic() - start, executor.overlap_report())
+    
+    print(f"[OK] Batch complete: {len([r for r in records if r['status'] == 'ok'])}/{len(records)} papers reviewed")
+    search_stats = web_search_tool.cache_stats()
+    print(f"[SEARCH] {search_stats['hits']} cached, {search_stats['misses']} sent to the search API")
+    print(f"[OK] Saved batch summary: {summary_filename}")
+    return records
+
 if __name__ == "__main__":
     # Run the review on the research paper
     pdf_path = "research_paper.pdf"
@@ -1,10 +1,14 @@
 from crewai import Agent
 from crewai.llm import LLM
+from typing import List, Optional
 from tools.search_tools import WebSearchCitationTool
 
 # Instantiate tools once to be shared
 web_search_tool = WebSearchCitationTool()
 
+# Specialist domains available to the review crew
+DOMAINS = ["medical", "engineering", "physics", "chemistry", "biology", "computer science", "mathematics", "artificial intelligence", "data science"]
+
 def create_specialist_agent(domain: str, llm_instance: LLM) -> Agent:
     """ Factory function to create a specialist agent for a given domain """
     return Agent(
@@ -17,9 +21,9 @@ def create_specialist_agent(domain: str, llm_instance: LLM) -> Agent:
         allow_delegation=False,
     )
 
-def get_agents(llm_instance: LLM) -> dict:
-    """ Returns a dictionary of specialist agents for different domains """
-    domains = ["medical", "engineering", "physics", "chemistry", "biology", "computer science", "mathematics", "artificial intelligence", "data science"]
+def get_agents(llm_instance: LLM, domains: Optional[List[str]] = None) -> dict:
+    """ Returns a dictionary of specialist agents for the given domains (all DOMAINS by default) """
+    domains = domains or DOMAINS
     specialist_agents = {domain: create_specialist_agent(domain, llm_instance) for domain in domains}
 
     compiler_agent = Agent(
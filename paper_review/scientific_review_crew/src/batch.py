@@ -0,0 +1,171 @@
+"""
+Multi-paper batch reviews.
+
+Collects PDFs from a directory or manifest and pipelines them: while the
+review crews for earlier papers are waiting on the LLM, the next paper's
+PDF extraction is already running. A bounded number of papers is in the
+pipeline at once, and the caller shares one LLM client and one executor
+across all of them so overall LLM concurrency stays capped.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Optional
+
+DECISION_PATTERN = re.compile(r"\b(PUBLISH|REJECT)\b", re.IGNORECASE)
+
+
+def collect_pdfs(source: str) -> List[str]:
+    """
+    PDF paths to review from a directory (all *.pdf, sorted), a .txt manifest
+    (one path per line, # comments) or a .json manifest (a list of paths).
+    Relative manifest entries are resolved against the manifest's directory; duplicates are dropped.
+    """
+    if os.path.isdir(source):
+        return sorted(os.path.join(source, name) for name in os.listdir(source) if name.lower().endswith(".pdf"))
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"Batch source not found: {source}")
+
+    with open(source, encoding="utf-8") as f:
+        if source.lower().endswith(".json"):
+            entries = json.load(f)
+        else:
+            entries = [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    paths = [entry if os.path.isabs(entry) else os.path.join(base_dir, entry) for entry in entries]
+    # A paper listed twice would be reviewed twice into the same report directory
+    return list(dict.fromkeys(os.path.normpath(path) for path in paths))
+
+
+def report_dir_names(pdf_paths: List[str]) -> Dict[str, str]:
+    """
+    A unique report directory name per PDF: its path relative to the papers' common
+    directory, without the extension and with separators as "__", so papers with the
+    same file name in different subdirectories do not overwrite each other's reports.
+    """
+    if not pdf_paths:
+        return {}
+    absolute = [os.path.abspath(path) for path in pdf_paths]
+    root = os.path.commonpath([os.path.dirname(path) for path in absolute])
+    return {path: os.path.splitext(os.path.relpath(full_path, root))[0].replace(os.sep, "__").replace("/", "__")
+            for path, full_path in zip(pdf_paths, absolute)}
+
+
+def extract_decision(result: Any) -> str:
+    """The editorial decision (PUBLISH / REJECT) from a review result, or UNKNOWN"""
+    match = DECISION_PATTERN.search(str(result or ""))
+    return match.group(1).upper() if match else "UNKNOWN"
+
+
+def run_pipeline(pdf_paths: List[str], prepare: Callable[[str], Dict[str, Any]],
+                 review: Callable[[str, Dict[str, Any]], Any], max_concurrent_papers: int = 2) -> List[Dict[str, Any]]:
+    """
+    Run prepare (PDF extraction) and review (LLM work) for every paper, overlapping
+    extraction of the next paper with reviews already in flight. At most
+    max_concurrent_papers reviews run at once and one extraction runs ahead of them.
+    Returns one record per paper, in input order, with its decision and timings.
+    """
+    records = [{"pdf_path": path, "status": "pending", "decision": None, "error": None,
+                "extract_seconds": None, "review_seconds": None, "queued_seconds": None} for path in pdf_paths]
+    # Papers admitted to the pipeline: the reviews in flight plus the one being extracted
+    admitted = threading.BoundedSemaphore(max_concurrent_papers + 1)
+
+    def extract(record):
+        start = time.monotonic()
+        try:
+            return prepare(record["pdf_path"])
+        finally:
+            record["extract_seconds"] = round(time.monotonic() - start, 3)
+            record["extracted_at"] = time.monotonic()
+
+    def review_when_ready(record, extraction):
+        try:
+            try:
+                paper = extraction.result()
+            except Exception as error:
+                record.update(status="extract_failed", error=str(error))
+                print(f"[BATCH] Extraction failed for {record['pdf_path']}: {error}")
+                return
+            record["queued_seconds"] = round(time.monotonic() - record.pop("extracted_at"), 3)
+            start = time.monotonic()
+            try:
+                result = review(record["pdf_path"], paper)
+                record.update(status="ok" if result else "failed", decision=extract_decision(result))
+            except Exception as error:
+                record.update(status="failed", error=str(error))
+                print(f"[BATCH] Review failed for {record['pdf_path']}: {error}")
+            finally:
+                record["review_seconds"] = round(time.monotonic() - start, 3)
+        finally:
+            admitted.release()
+
+    extract_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="extract")
+    review_pool = ThreadPoolExecutor(max_workers=max_concurrent_papers, thread_name_prefix="review")
+    try:
+        futures = []
+        for record in records:
+            admitted.acquire()
+            extraction = extract_pool.submit(extract, record)
+            futures.append(review_pool.submit(review_when_ready, record, extraction))
+        for future in futures:
+            future.result()
+    except KeyboardInterrupt:
+        # Admit no further papers and drop queued ones instead of waiting for every submitted review
+        print("[BATCH] Interrupted; cancelling papers that have not started")
+        extract_pool.shutdown(wait=False, cancel_futures=True)
+        review_pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    extract_pool.shutdown()
+    review_pool.shutdown()
+
+    for record in records:
+        record.pop("extracted_at", None)
+    return records
+
+
+def write_batch_summary(records: List[Dict[str, Any]], output_dir: str, wall_seconds: float,
+                        overlap: Optional[Dict[str, Any]] = None) -> str:
+    """Write batch_summary.md and batch_summary.json to output_dir; returns the markdown path"""
+    os.makedirs(output_dir, exist_ok=True)
+    summary = {
+        "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "papers": len(records),
+        "completed": len([r for r in records if r["status"] == "ok"]),
+        "wall_seconds": round(wall_seconds, 3),
+        "executor": overlap,
+        "records": records,
+    }
+    with open(os.path.join(output_dir, "batch_summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    summary_filename = os.path.join(output_dir, "batch_summary.md")
+    with open(summary_filename, "w", encoding="utf-8") as f:
+        f.write("# Batch Review Summary\n\n")
+        f.write(f"**Date:** {summary['date']}\n")
+        f.write(f"**Papers:** {summary['papers']} ({summary['completed']} completed)\n")
+        f.write(f"**Wall Time:** {summary['wall_seconds']:.1f}s\n")
+        if overlap:
+            f.write(f"**LLM Calls:** {overlap['calls']} (peak {overlap['peak_in_flight']} in flight, "
+                    f"overlap x{overlap['overlap_factor']}, {overlap['retries']} retries)\n")
+        f.write("\n| Paper | Status | Decision | Extract (s) | Queued (s) | Review (s) |\n")
+        f.write("|---|---|---|---|---|---|\n")
+        for record in records:
+            cells = [_format_seconds(record[key]) for key in ("extract_seconds", "queued_seconds", "review_seconds")]
+            f.write(f"| {os.path.basename(record['pdf_path'])} | {record['status']} | "
+                    f"{record['decision'] or '-'} | {' | '.join(cells)} |\n")
+        errors = [record for record in records if record["error"]]
+        if errors:
+            f.write("\n## Errors\n\n")
+            for record in errors:
+                f.write(f"- **{os.path.basename(record['pdf_path'])}:** {record['error']}\n")
+    return summary_filename
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}"
@@ -0,0 +1,115 @@
+"""
+Per-task checkpoints for review crews.
+
+Each task's output is written to disk the moment the task completes,
+under the paper's content hash and the prompt version. A resumed run
+restores those outputs and only executes the tasks that are missing, so a
+failure in the synthesis step no longer throws away finished specialist work.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from crewai.tasks.task_output import TaskOutput
+
+from tools.page_cache import hash_pdf
+
+CLAIM_EVIDENCE_FILE = "claim_evidence.json"
+
+
+def task_key(description: str, expected_output: Optional[str]) -> str:
+    """Identifies a task by its full prompt, which already embeds the paper content it was given"""
+    return hashlib.sha256(f"{description}\n{expected_output or ''}".encode("utf-8")).hexdigest()[:24]
+
+
+class TaskCheckpointStore:
+    """Task outputs stored as <root>/<paper hash>/<prompt version>/<task key>.json"""
+
+    def __init__(self, paper_hash: str, prompt_version: str, root: str = "output/checkpoints"):
+        self.paper_hash = paper_hash
+        self.prompt_version = prompt_version
+        self.directory = os.path.join(root, paper_hash, prompt_version)
+
+    @classmethod
+    def for_paper(cls, pdf_path: str, prompt_version: str, root: str = "output/checkpoints") -> "TaskCheckpointStore":
+        return cls(hash_pdf(pdf_path), prompt_version, root)
+
+    def path_for(self, description: str, expected_output: Optional[str]) -> str:
+        return os.path.join(self.directory, f"{task_key(description, expected_output)}.json")
+
+    def save_output(self, output: TaskOutput):
+        """Task callback: persist a finished task's output atomically"""
+        path = self.path_for(output.description, output.expected_output)
+        record = {
+            "agent": output.agent,
+            "raw": output.raw,
+            "prompt_version": self.prompt_version,
+            "saved_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._write_json(path, record)
+
+    def _write_json(self, path: str, record: Dict[str, Any]):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(tmp_path, path)
+
+    def save_claim_evidence(self, claim_evidence: Optional[str]):
+        """
+        Store the evidence block the tasks were built with. It is part of every
+        specialist prompt, and so of their task keys; resume must reuse it verbatim.
+        """
+        self._write_json(os.path.join(self.directory, CLAIM_EVIDENCE_FILE),
+                         {"claim_evidence": claim_evidence or "", "prompt_version": self.prompt_version})
+
+    def load_claim_evidence(self) -> Optional[str]:
+        """The stored evidence block ("" when the first run had none), or None if nothing was stored"""
+        path = os.path.join(self.directory, CLAIM_EVIDENCE_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["claim_evidence"]
+
+    def load(self, task: Any) -> Optional[TaskOutput]:
+        path = self.path_for(task.description, task.expected_output)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            record = json.load(f)
+        return TaskOutput(description=task.description, expected_output=task.expected_output,
+                          raw=record["raw"], agent=record["agent"])
+
+    def has_task_outputs(self) -> bool:
+        if not os.path.isdir(self.directory):
+            return False
+        return any(name.endswith(".json") and name != CLAIM_EVIDENCE_FILE for name in os.listdir(self.directory))
+
+    def attach(self, tasks: List[Any]):
+        """Persist every task's output as soon as it completes"""
+        for task in tasks:
+            task.callback = self.save_output
+
+    def restore(self, tasks: List[Any]) -> Dict[int, TaskOutput]:
+        """
+        Load stored outputs onto tasks, in order. A task is only restored when every
+        task in its context was restored too, so work after the first incomplete
+        task is redone. Returns {task index: output} for the restored tasks.
+        """
+        restored: Dict[int, TaskOutput] = {}
+        for index, task in enumerate(tasks):
+            dependencies = task.context if isinstance(task.context, list) else []
+            if any(dep.output is None for dep in dependencies):
+                continue
+            output = self.load(task)
+            if output is not None:
+                task.output = output
+                restored[index] = output
+        return restored
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,113 @@
+"""
+Central claim extraction and batched verification.
+
+Before the crew starts, one LLM call extracts the paper's key verifiable
+claims. Near-duplicate claims are merged, every remaining claim is searched
+concurrently through the shared web search tool, and the collected evidence
+is formatted once for injection into every specialist's task. Specialists
+then cite this evidence instead of spending an LLM round-trip per search
+and verifying the same claims several times over.
+"""
+
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from context_slicing import estimate_tokens, tokenize
+
+CLAIM_SECTION_HINTS = ("abstract", "introduction", "result", "discussion", "conclusion", "contribution")
+
+EXTRACTION_PROMPT = (
+    "Extract the key factual claims of the research paper below that can be checked against the published "
+    "literature: headline results, comparisons with prior work, stated novelty, datasets, and cited facts. "
+    "Write each claim as one self-contained sentence of at most 25 words, without pronouns referring to the paper. "
+    "Return ONLY a JSON array of at most {max_claims} strings.\n\n"
+    "--- PAPER ---\n{text}\n--- END OF PAPER ---"
+)
+
+
+def claim_source_text(paper_text: str, paper_sections: Optional[List[Dict[str, Any]]] = None,
+                      token_budget: int = 6000) -> str:
+    """The parts of the paper where claims are stated: abstract, introduction, results and conclusions"""
+    if paper_sections:
+        selected = [s for s in paper_sections if any(hint in s["heading"].lower() for hint in CLAIM_SECTION_HINTS)]
+        if selected:
+            paper_text = "\n\n".join(f"## {s['heading']}\n{s['text']}" for s in selected)
+    max_chars = token_budget * 4
+    if estimate_tokens(paper_text) > token_budget:
+        paper_text = paper_text[:max_chars].rsplit(" ", 1)[0] + " ..."
+    return paper_text
+
+
+def parse_claims(response: str) -> List[str]:
+    """Claims from a JSON array response, falling back to one claim per bulleted or numbered line"""
+    match = re.search(r"\[.*\]", response, re.DOTALL)
+    if match:
+        try:
+            claims = json.loads(match.group(0))
+            return [str(claim).strip() for claim in claims if str(claim).strip()]
+        except json.JSONDecodeError:
+            pass
+    lines = [re.sub(r"^\s*(?:[-*•]|\d+[.)])\s*", "", line).strip() for line in response.splitlines()]
+    return [line.strip('"') for line in lines if len(line.split()) >= 4]
+
+
+def dedupe_claims(claims: List[str], threshold: float = 0.7) -> List[str]:
+    """Drop claims whose word sets overlap an earlier claim by at least `threshold` (Jaccard)"""
+    kept: List[str] = []
+    kept_terms: List[set] = []
+    for claim in claims:
+        terms = set(tokenize(claim))
+        if not terms:
+            continue
+        if any(len(terms & other) / len(terms | other) >= threshold for other in kept_terms):
+            continue
+        kept.append(claim)
+        kept_terms.append(terms)
+    return kept
+
+
+def extract_claims(llm, paper_text: str, paper_sections: Optional[List[Dict[str, Any]]] = None,
+                   max_claims: int = 10) -> List[str]:
+    """Ask the model once for the paper's key claims; returns them deduplicated"""
+    prompt = EXTRACTION_PROMPT.format(max_claims=max_claims, text=claim_source_text(paper_text, paper_sections))
+    response = llm.call([{"role": "user", "content": prompt}])
+    return dedupe_claims(parse_claims(str(response)))[:max_claims]
+
+
+def verify_claims(claims: List[str], search_tool, max_concurrent: int = 8) -> List[Dict[str, Any]]:
+    """Search every claim at once (bounded by max_concurrent); results keep claim order"""
+    if not claims:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_concurrent, len(claims)), thread_name_prefix="verify") as pool:
+        results = list(pool.map(search_tool._run, claims))
+    return [{"claim": claim, "results": result} for claim, result in zip(claims, results)]
+
+
+def format_evidence(evidence: List[Dict[str, Any]]) -> str:
+    """Markdown evidence block shared by all specialist tasks"""
+    if not evidence:
+        return ""
+    lines = []
+    for number, item in enumerate(evidence, 1):
+        lines.append(f"### Claim {number}: {item['claim']}")
+        if isinstance(item["results"], list):
+            for result in item["results"]:
+                lines.append(f"- [{result['title']}]({result['link']}): {result['snippet']}")
+        else:
+            lines.append(f"- No evidence retrieved ({item['results']})")
+        lines.append("")
+    return "\n".join(lines).strip()
+
+
+def build_claim_evidence(llm, paper_text: str, search_tool, paper_sections: Optional[List[Dict[str, Any]]] = None,
+                         max_claims: int = 10, max_concurrent: int = 8, executor=None) -> str:
+    """Extract, deduplicate and verify the paper's claims; returns the evidence block (empty if no claims).
+    A SpecialistExecutor, if given, runs the extraction call so it counts against its in-flight cap."""
+    if executor is not None:
+        claims = executor.run_call("Claim Extractor", lambda: extract_claims(llm, paper_text, paper_sections, max_claims))
+    else:
+        claims = extract_claims(llm, paper_text, paper_sections, max_claims)
+    print(f"[CLAIMS] Verifying {len(claims)} key claims with {min(max_concurrent, len(claims) or 1)} concurrent searches")
+    return format_evidence(verify_claims(claims, search_tool, max_concurrent))
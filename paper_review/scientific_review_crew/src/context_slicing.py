@@ -0,0 +1,148 @@
+"""
+Per-specialist context slicing.
+
+Splits a structured paper into section chunks, ranks them against each
+specialist's domain vocabulary with BM25, and packs the abstract plus the
+best-scoring chunks into a fixed token budget.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import List, Dict, Any, Optional
+
+# Vocabulary used to score a section's relevance to each specialist domain
+DOMAIN_KEYWORDS = {
+    "medical": ["patient", "patients", "clinical", "diagnosis", "treatment", "disease", "hospital", "trial",
+                "therapy", "cohort", "mortality", "symptoms", "medicine", "health", "physician", "cancer"],
+    "engineering": ["design", "system", "prototype", "control", "mechanical", "electrical", "circuit", "sensor",
+                    "load", "efficiency", "manufacturing", "hardware", "signal", "device", "power", "robot"],
+    "physics": ["energy", "quantum", "particle", "field", "momentum", "thermodynamic", "wave", "optical",
+                "magnetic", "relativity", "photon", "spin", "lattice", "entropy", "plasma", "laser"],
+    "chemistry": ["molecule", "molecular", "reaction", "synthesis", "compound", "catalyst", "solvent", "bond",
+                  "spectroscopy", "chemical", "polymer", "oxidation", "concentration", "yield", "reagent"],
+    "biology": ["cell", "cells", "gene", "genes", "protein", "expression", "species", "organism", "tissue",
+                "dna", "rna", "genome", "evolution", "mutation", "pathway", "sequencing"],
+    "computer science": ["algorithm", "complexity", "software", "implementation", "runtime", "memory",
+                         "distributed", "database", "compiler", "network", "security", "benchmark", "code"],
+    "mathematics": ["theorem", "proof", "lemma", "equation", "matrix", "convergence", "bound", "function",
+                    "optimization", "probability", "proposition", "corollary", "derivative", "integral"],
+    "artificial intelligence": ["model", "models", "neural", "learning", "training", "llm", "language",
+                                "transformer", "agent", "reasoning", "inference", "prompt", "fine-tuning"],
+    "data science": ["dataset", "data", "statistical", "regression", "sample", "variance", "distribution",
+                     "correlation", "features", "validation", "significance", "analysis", "metrics", "accuracy"],
+}
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is", "it", "its",
+    "of", "on", "or", "that", "the", "this", "to", "was", "were", "which", "with", "we", "our", "these",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate (~4 characters per token for English prose)"""
+    return (len(text) + 3) // 4
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens with stop words removed"""
+    return [word for word in re.findall(r"[a-z][a-z0-9\-]+", text.lower()) if word not in STOP_WORDS]
+
+
+class BM25:
+    """Okapi BM25 over a small in-memory corpus of tokenized documents"""
+
+    def __init__(self, documents: List[List[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_counts = [Counter(doc) for doc in documents]
+        self.lengths = [len(doc) for doc in documents]
+        self.avg_length = (sum(self.lengths) / len(documents)) if documents else 0.0
+        doc_freq = Counter(term for doc in documents for term in set(doc))
+        n = len(documents)
+        self.idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()}
+
+    def scores(self, query: List[str]) -> List[float]:
+        results = []
+        for counts, length in zip(self.term_counts, self.lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self.avg_length) if self.avg_length else self.k1
+            for term in query:
+                tf = counts.get(term, 0)
+                if tf:
+                    score += self.idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            results.append(score)
+        return results
+
+
+def domain_query(domain: str) -> List[str]:
+    """BM25 query terms for a specialist domain"""
+    return tokenize(domain) + DOMAIN_KEYWORDS.get(domain, [])
+
+
+def chunk_sections(sections: List[Dict[str, Any]], chunk_tokens: int = 400) -> List[Dict[str, Any]]:
+    """Split section texts into line-aligned chunks of roughly chunk_tokens each"""
+    chunks = []
+    for section_index, section in enumerate(sections):
+        buffer, buffer_tokens = [], 0
+        for line in section["text"].splitlines():
+            line_tokens = estimate_tokens(line)
+            if buffer and buffer_tokens + line_tokens > chunk_tokens:
+                chunks.append({"section_index": section_index, "heading": section["heading"], "text": "\n".join(buffer)})
+                buffer, buffer_tokens = [], 0
+            buffer.append(line)
+            buffer_tokens += line_tokens
+        if buffer:
+            chunks.append({"section_index": section_index, "heading": section["heading"], "text": "\n".join(buffer)})
+    return chunks
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + " ..."
+
+
+def slice_context(sections: List[Dict[str, Any]], domain: str, token_budget: int,
+                  abstract: Optional[str] = None, chunk_tokens: int = 400) -> str:
+    """
+    Build a specialist's view of the paper: the abstract plus the section chunks
+    most relevant to `domain`, kept in document order and capped at token_budget.
+    """
+    abstract_sections = [s for s in sections if s["heading"].strip().rstrip(":.").lower() == "abstract"]
+    if abstract is None:
+        abstract = abstract_sections[0]["text"] if abstract_sections else ""
+    body = [s for s in sections if s not in abstract_sections]
+
+    parts = []
+    remaining = token_budget
+    if abstract:
+        abstract_block = _truncate_to_tokens(f"## Abstract\n{abstract}", token_budget)
+        parts.append(abstract_block)
+        remaining -= estimate_tokens(abstract_block)
+
+    chunks = chunk_sections(body, chunk_tokens)
+    if not chunks or remaining <= 0:
+        return "\n\n".join(parts)
+
+    scores = BM25([tokenize(chunk["heading"] + " " + chunk["text"]) for chunk in chunks]).scores(domain_query(domain))
+    selected = []
+    for index in sorted(range(len(chunks)), key=lambda i: scores[i], reverse=True):
+        cost = estimate_tokens(chunks[index]["text"]) + estimate_tokens(chunks[index]["heading"]) + 4
+        if cost <= remaining:
+            selected.append(index)
+            remaining -= cost
+
+    omitted = len(chunks) - len(selected)
+    current_section = None
+    for index in sorted(selected):
+        chunk = chunks[index]
+        if chunk["section_index"] != current_section:
+            parts.append(f"## {chunk['heading']}\n{chunk['text']}")
+            current_section = chunk["section_index"]
+        else:
+            parts[-1] += "\n" + chunk["text"]
+    if omitted:
+        parts.append(f"[{omitted} less relevant passages omitted to fit the {token_budget}-token review budget]")
+    return "\n\n".join(parts)
@@ -2,11 +2,17 @@ from crewai import Crew, Process
 from agents import get_agents
 from tasks import get_tasks
 from crewai.llm import LLM
+from typing import List, Dict, Any, Optional
 
-def assemble_crew(llm_instance: LLM, paper_text: str = "", figure_paths: str = ""):
-    """Assembles and returns the scientific review crew with parallel execution."""
-    agents = get_agents(llm_instance)
-    tasks = get_tasks(agents, paper_text, figure_paths)
+def assemble_crew(llm_instance: LLM, paper_text: str = "", figure_paths: str = "",
+                  paper_sections: Optional[List[Dict[str, Any]]] = None, token_budget: Optional[int] = None,
+                  domains: Optional[List[str]] = None, claim_evidence: Optional[str] = None):
+    """Assembles and returns the scientific review crew with parallel execution.
+    paper_sections and token_budget enable per-specialist context slicing;
+    domains restricts the crew to the specialists chosen by the router;
+    claim_evidence is injected into every specialist task."""
+    agents = get_agents(llm_instance, domains)
+    tasks = get_tasks(agents, paper_text, figure_paths, paper_sections, token_budget, claim_evidence)
     
     return Crew(
         agents=list(agents.values()),
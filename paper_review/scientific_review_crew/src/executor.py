@@ -0,0 +1,170 @@
+"""
+Bounded concurrent execution of the specialist analysis tasks.
+
+Runs each analysis task on its own thread while a semaphore caps how many
+LLM-backed task executions are in flight at once. Each call has a timeout, and
+rate-limit errors are retried with full-jitter exponential backoff. A call that
+times out cannot be cancelled, so it is given one more timeout period to finish
+rather than racing a retry of the same task against it. The
+executor records every call's start/end times so it can report how much
+the specialist calls actually overlapped.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Any, Optional
+
+RATE_LIMIT_MARKERS = ("ratelimit", "rate limit", "rate_limit", "429", "resource_exhausted",
+                      "resource exhausted", "quota", "too many requests")
+
+
+class CallTimeoutError(TimeoutError):
+    """A task execution exceeded the executor's per-call timeout"""
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """True for provider throttling errors (HTTP 429, Vertex RESOURCE_EXHAUSTED, quota messages)"""
+    text = f"{type(error).__name__} {error}".lower()
+    return any(marker in text for marker in RATE_LIMIT_MARKERS)
+
+
+class SpecialistExecutor:
+    """
+    Executes crew tasks with bounded concurrency, per-call timeouts and jittered retries.
+    One executor can be shared by several reviews to cap their combined in-flight calls.
+    """
+
+    def __init__(self, max_in_flight: int = 3, call_timeout: Optional[float] = 600.0, max_retries: int = 4,
+                 base_delay: float = 2.0, max_delay: float = 60.0):
+        self.max_in_flight = max_in_flight
+        self.call_timeout = call_timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._calls: List[Dict[str, Any]] = []
+
+    def run_tasks(self, tasks: List[Any], context: Optional[str] = None) -> List[Any]:
+        """Execute independent tasks concurrently and return their outputs in task order"""
+        if not tasks:
+            return []
+        with ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="specialist") as pool:
+            futures = [pool.submit(self.run_task, task, context) for task in tasks]
+            return [future.result() for future in futures]
+
+    def run_task(self, task: Any, context: Optional[str] = None) -> Any:
+        """Execute one task, retrying rate-limit errors with full-jitter backoff"""
+        return self.run_call(_task_label(task), lambda: task.execute_sync(context=context))
+
+    def run_call(self, label: str, fn: Callable[[], Any]) -> Any:
+        """Run any other LLM-backed call (e.g. claim extraction) under the same slots, timeout and retries"""
+        for attempt in range(self.max_retries + 1):
+            call, outcome, done = self._start(label, fn, attempt)
+            if not done.wait(self.call_timeout):
+                call["status"] = "timeout"
+                # The abandoned call still writes task.output and holds its slot; re-running the
+                # task now would pay for it twice and race the late call, so let it finish first
+                print(f"[TIMEOUT] {call['task']} exceeded {self.call_timeout}s; waiting for the call to finish")
+                if not done.wait(self.call_timeout):
+                    raise CallTimeoutError(f"{call['task']} still running after {2 * self.call_timeout}s")
+            try:
+                return self._result(call, outcome)
+            except Exception as error:
+                if not is_rate_limit_error(error) or attempt == self.max_retries:
+                    raise
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                print(f"[RETRY] {label} attempt {attempt + 1} failed ({error}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _start(self, label: str, fn: Callable[[], Any], attempt: int):
+        # A retry is only recorded once it holds a slot, i.e. once the previous attempt has returned
+        self._slots.acquire()
+        outcome: Dict[str, Any] = {}
+        done = threading.Event()
+        call = {"task": label, "attempt": attempt, "start": time.monotonic(), "end": None, "status": "running"}
+        with self._lock:
+            self._calls.append(call)
+
+        def target():
+            try:
+                outcome["result"] = fn()
+            except BaseException as error:
+                outcome["error"] = error
+            finally:
+                call["end"] = time.monotonic()
+                self._slots.release()
+                done.set()
+
+        threading.Thread(target=target, name=f"call-{call['task']}", daemon=True).start()
+        return call, outcome, done
+
+    @staticmethod
+    def _result(call: Dict[str, Any], outcome: Dict[str, Any]) -> Any:
+        if "error" in outcome:
+            call["status"] = "error"
+            raise outcome["error"]
+        call["status"] = "late" if call["status"] == "timeout" else "ok"
+        return outcome["result"]
+
+    def overlap_report(self) -> Dict[str, Any]:
+        """How much the recorded calls overlapped: peak concurrency, busy time vs. wall time"""
+        with self._lock:
+            intervals = [(c["start"], c["end"]) for c in self._calls if c["end"] is not None]
+            retries = len([c for c in self._calls if c["attempt"] > 0])
+            failures = len([c for c in self._calls if c["status"] in ("error", "timeout")])
+            late = len([c for c in self._calls if c["status"] == "late"])
+        if not intervals:
+            return {"calls": 0, "peak_in_flight": 0, "busy_seconds": 0.0, "wall_seconds": 0.0,
+                    "overlap_factor": 0.0, "retries": retries, "failures": failures, "late": late}
+
+        events = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals],
+                        key=lambda event: (event[0], event[1]))
+        in_flight = peak = 0
+        for _, delta in events:
+            in_flight += delta
+            peak = max(peak, in_flight)
+
+        busy = sum(end - start for start, end in intervals)
+        wall = max(end for _, end in intervals) - min(start for start, _ in intervals)
+        return {
+            "calls": len(intervals),
+            "peak_in_flight": peak,
+            "busy_seconds": round(busy, 3),
+            "wall_seconds": round(wall, 3),
+            # 1.0 means fully serial; max_in_flight means perfectly parallel
+            "overlap_factor": round(busy / wall, 2) if wall else 0.0,
+            "retries": retries,
+            "failures": failures,
+            # Calls that exceeded call_timeout but still returned a result
+            "late": late,
+        }
+
+
+def _task_label(task: Any) -> str:
+    agent = getattr(task, "agent", None)
+    return getattr(agent, "role", None) or getattr(task, "name", None) or "task"
+
+
+def kickoff_with_executor(crew, executor: SpecialistExecutor):
+    """
+    Run a review crew through the executor: specialist analyses concurrently,
+    then the synthesis and editorial tasks in order, each fed its context explicitly.
+    Tasks that already carry an output (restored from a checkpoint) are not re-run.
+    Returns the editorial task output (the same final result crew.kickoff() yields).
+    """
+    analysis_tasks, (synthesis_task, editorial_task) = crew.tasks[:-2], crew.tasks[-2:]
+    outputs = {id(task): task.output for task in crew.tasks if getattr(task, "output", None) is not None}
+
+    pending = [task for task in analysis_tasks if id(task) not in outputs]
+    for task, output in zip(pending, executor.run_tasks(pending)):
+        outputs[id(task)] = output
+
+    if id(synthesis_task) not in outputs:
+        specialist_context = "\n\n----------\n\n".join(str(outputs[id(task)].raw) for task in analysis_tasks)
+        outputs[id(synthesis_task)] = executor.run_task(synthesis_task, specialist_context)
+    if id(editorial_task) not in outputs:
+        outputs[id(editorial_task)] = executor.run_task(editorial_task, str(outputs[id(synthesis_task)].raw))
+    return outputs[id(editorial_task)]
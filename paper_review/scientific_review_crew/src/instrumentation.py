@@ -0,0 +1,203 @@
+"""
+Token and latency accounting for LLM calls.
+
+InstrumentedLLM wraps the crew's LLM (including the response cache) and
+records one entry per call: the calling agent role and task, input and
+output tokens, latency, whether the response came from the cache and
+whether the call failed (failed calls are retried by the agent loop or the
+executor). Token counts come from the usage the provider reports for that
+call; they are estimated from the text only when the provider reports none.
+A UsageRecorder exports the entries as JSONL and a per-role markdown summary
+next to the review reports.
+"""
+
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from crewai.llms.base_llm import BaseLLM, call_stop_override
+from crewai.types.usage_metrics import UsageMetrics
+
+from context_slicing import estimate_tokens
+from llm_cache import last_call_cached
+
+# Provider usage reported during the current call. Each call sets its own counters, so concurrent
+# calls sharing one model instance are still attributed exactly.
+_call_usage: ContextVar[Optional[Dict[str, int]]] = ContextVar("_call_usage", default=None)
+_route_lock = threading.Lock()
+
+
+def _provider_llm(llm: Any) -> Any:
+    """The innermost wrapped LLM, which reports the provider usage"""
+    while getattr(llm, "llm", None) is not None:
+        llm = llm.llm
+    return llm
+
+
+def _route_usage(provider: Any):
+    """Also credit the provider's usage reports to the call in progress (once per model instance)"""
+    with _route_lock:
+        track = provider._track_token_usage_internal
+        if getattr(track, "routes_call_usage", False):
+            return
+
+        def tracked(usage_data: Dict[str, Any]):
+            track(usage_data)
+            usage = _call_usage.get()
+            metrics = UsageMetrics.from_provider_dict(usage_data)
+            if usage is not None and metrics is not None:
+                usage["prompt_tokens"] += metrics.prompt_tokens
+                usage["completion_tokens"] += metrics.completion_tokens
+
+        tracked.routes_call_usage = True
+        # Instance attribute, bypassing pydantic's field validation
+        object.__setattr__(provider, "_track_token_usage_internal", tracked)
+
+
+def _message_text(messages: Any) -> str:
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(str(message.get("content", "")) if isinstance(message, dict) else str(message)
+                     for message in messages or [])
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+class UsageRecorder:
+    """Thread-safe collection of per-call usage records"""
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, **fields: Any):
+        with self._lock:
+            self.records.append(fields)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-role totals, most expensive (by input + output tokens) first"""
+        with self._lock:
+            records = list(self.records)
+        roles: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            roles.setdefault(record["role"], []).append(record)
+        rows = []
+        for role, calls in roles.items():
+            latencies = [call["latency_seconds"] for call in calls]
+            rows.append({
+                "role": role,
+                "calls": len(calls),
+                "cache_hits": sum(1 for call in calls if call["cache_hit"]),
+                "retries": sum(1 for call in calls if call["error"]),
+                "input_tokens": sum(call["input_tokens"] for call in calls),
+                "output_tokens": sum(call["output_tokens"] for call in calls),
+                "latency_seconds": round(sum(latencies), 2),
+                "p50_seconds": round(_percentile(latencies, 0.5), 2),
+                "max_seconds": round(max(latencies), 2),
+            })
+        return sorted(rows, key=lambda row: row["input_tokens"] + row["output_tokens"], reverse=True)
+
+    def write(self, output_dir: str, prefix: str = "usage") -> str:
+        """Write <prefix>.jsonl and <prefix>_summary.md to output_dir; returns the summary path"""
+        os.makedirs(output_dir, exist_ok=True)
+        with self._lock:
+            records = list(self.records)
+        with open(os.path.join(output_dir, f"{prefix}.jsonl"), "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+        rows = self.summary()
+        estimated = [record for record in records if record["token_source"] == "estimate"]
+        estimated_input = sum(record["input_tokens"] for record in estimated)
+        estimated_output = sum(record["output_tokens"] for record in estimated)
+        summary_path = os.path.join(output_dir, f"{prefix}_summary.md")
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write("# LLM Usage Summary\n\n")
+            f.write(f"**Calls:** {len(records)} ({len(estimated)} with estimated token counts)\n")
+            f.write(f"**Input tokens:** {sum(row['input_tokens'] for row in rows):,} "
+                    f"({estimated_input:,} estimated)\n")
+            f.write(f"**Output tokens:** {sum(row['output_tokens'] for row in rows):,} "
+                    f"({estimated_output:,} estimated)\n")
+            f.write(f"**LLM time:** {sum(row['latency_seconds'] for row in rows):.1f}s\n\n")
+            f.write("| Role | Calls | Cache Hits | Retries | Input Tokens | Output Tokens | Total (s) | p50 (s) | Max (s) |\n")
+            f.write("|---|---|---|---|---|---|---|---|---|\n")
+            for row in rows:
+                f.write(f"| {row['role']} | {row['calls']} | {row['cache_hits']} | {row['retries']} | "
+                        f"{row['input_tokens']:,} | {row['output_tokens']:,} | {row['latency_seconds']:.1f} | "
+                        f"{row['p50_seconds']:.1f} | {row['max_seconds']:.1f} |\n")
+        return summary_path
+
+
+class InstrumentedLLM(BaseLLM):
+    """Wraps a CrewAI LLM and records tokens, latency and cache hits for every call"""
+
+    llm: Any
+    recorder: Any
+    role: Optional[str] = None  # Recorded for calls made outside an agent (e.g. claim extraction)
+
+    def __init__(self, llm: BaseLLM, recorder: UsageRecorder, role: Optional[str] = None, **kwargs: Any):
+        super().__init__(llm=llm, recorder=recorder, role=role, model=llm.model, temperature=llm.temperature,
+                         stop=list(llm.stop or []), **kwargs)
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None,
+             from_agent=None, response_model=None):
+        stop = list(self.stop_sequences or [])
+        _route_usage(_provider_llm(self.llm))
+        usage = {"prompt_tokens": 0, "completion_tokens": 0}
+        usage_token = _call_usage.set(usage)
+
+        start = time.monotonic()
+        response, error = None, None
+        try:
+            with call_stop_override(self.llm, stop):
+                response = self.llm.call(messages, tools=tools, callbacks=callbacks,
+                                         available_functions=available_functions, from_task=from_task,
+                                         from_agent=from_agent, response_model=response_model)
+            return response
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            latency = time.monotonic() - start
+            _call_usage.reset(usage_token)
+            cache_hit = error is None and last_call_cached()
+            if cache_hit:
+                input_tokens, output_tokens, source = 0, 0, "cache"
+            elif error is not None:
+                input_tokens, output_tokens, source = 0, 0, "none"
+            elif usage["prompt_tokens"] > 0:
+                input_tokens, output_tokens, source = usage["prompt_tokens"], usage["completion_tokens"], "provider"
+            else:
+                input_tokens = estimate_tokens(_message_text(messages))
+                output_tokens = estimate_tokens(response) if isinstance(response, str) else 0
+                source = "estimate"
+            self.recorder.record(
+                time=round(time.time(), 3),
+                role=getattr(from_agent, "role", None) or self.role or "unknown",
+                task=(getattr(from_task, "name", None) or getattr(from_task, "description", None) or "")[:80],
+                model=self.llm.model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                token_source=source,
+                latency_seconds=round(latency, 3),
+                cache_hit=cache_hit,
+                error=error,
+            )
+
+    def supports_function_calling(self) -> bool:
+        return getattr(self.llm, "supports_function_calling", lambda: False)()
+
+    def supports_stop_words(self) -> bool:
+        return self.llm.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.llm.get_context_window_size()
+
+    def supports_multimodal(self) -> bool:
+        return self.llm.supports_multimodal()
@@ -0,0 +1,77 @@
+"""
+Persistent LLM response cache.
+
+Responses are stored in SQLite keyed by a hash of the model name,
+temperature, messages and tool schema, so re-running a review after a
+crash or after editing a downstream prompt only pays for the calls whose
+inputs actually changed. Entries expire after a TTL and the least recently
+used entries are evicted once the store grows past its size limit.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Optional
+
+from crewai.llms.base_llm import BaseLLM, call_stop_override
+
+from response_cache import ResponseCache  # noqa: F401  (re-exported for callers of this module)
+
+# Per-thread record of whether the most recent CachedLLM call was served from the cache
+_call_state = threading.local()
+
+
+def last_call_cached() -> bool:
+    """True if the last CachedLLM call made on this thread was a cache hit"""
+    return getattr(_call_state, "hit", False)
+
+
+def cache_key(model: str, temperature: Optional[float], messages: Any, tools: Any = None, **extra: Any) -> str:
+    """Stable hash of everything that determines an LLM response"""
+    payload = {"model": model, "temperature": temperature, "messages": messages, "tools": tools, **extra}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class CachedLLM(BaseLLM):
+    """
+    Wraps a CrewAI LLM and serves byte-identical requests from a ResponseCache.
+    Only plain text responses are cached; tool-call objects always go to the model.
+    """
+
+    llm: Any
+    cache: Any
+
+    def __init__(self, llm: BaseLLM, cache: ResponseCache, **kwargs: Any):
+        super().__init__(llm=llm, cache=cache, model=llm.model, temperature=llm.temperature,
+                         stop=list(llm.stop or []), **kwargs)
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None,
+             from_agent=None, response_model=None):
+        # Agents apply their stop words per call (call_stop_override); forward them the same way
+        # rather than setting them on the inner LLM, which concurrent agents share
+        stop = list(self.stop_sequences or [])
+        key = cache_key(self.llm.model, self.llm.temperature, messages, tools, stop=stop,
+                        response_model=getattr(response_model, "__name__", None))
+        cached = self.cache.get(key)
+        _call_state.hit = cached is not None
+        if cached is not None:
+            return cached
+
+        with call_stop_override(self.llm, stop):
+            response = self.llm.call(messages, tools=tools, callbacks=callbacks, available_functions=available_functions,
+                                     from_task=from_task, from_agent=from_agent, response_model=response_model)
+        if isinstance(response, str):
+            self.cache.put(key, response)
+        return response
+
+    def supports_function_calling(self) -> bool:
+        return getattr(self.llm, "supports_function_calling", lambda: False)()
+
+    def supports_stop_words(self) -> bool:
+        return self.llm.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.llm.get_context_window_size()
+
+    def supports_multimodal(self) -> bool:
+        return self.llm.supports_multimodal()
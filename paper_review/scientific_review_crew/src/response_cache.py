@@ -0,0 +1,98 @@
+"""
+SQLite store for LLM responses with TTL expiry and LRU size eviction.
+
+Standard library only, so it can be used without importing crewai;
+llm_cache.CachedLLM wraps it for the crew.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class ResponseCache:
+    """SQLite-backed key/value store for LLM responses with TTL and LRU size eviction"""
+
+    def __init__(self, path: str = "output/llm_cache.sqlite", ttl_seconds: Optional[float] = 7 * 24 * 3600,
+                 max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, "
+                "accessed REAL NOT NULL, size INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation keeps the cache safe across threads and processes;
+        # sqlite3's own context manager only commits, so the connection is closed explicitly
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row:
+                conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        with self._lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if row else None
+
+    def put(self, key: str, value: str):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                         (key, value, now, now, len(value.encode("utf-8"))))
+        self.evict()
+
+    def size(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones until under max_bytes; returns rows removed"""
+        removed = 0
+        with self._connect() as conn:
+            if self.ttl_seconds is not None:
+                removed += conn.execute("DELETE FROM responses WHERE created < ?",
+                                        (time.time() - self.ttl_seconds,)).rowcount
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    total -= size
+                    removed += 1
+        return removed
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "bytes": self.size()}
@@ -0,0 +1,65 @@
+"""
+Domain routing for the review crew.
+
+Scores a paper against each specialist domain's vocabulary and picks the
+top-k specialists to deploy, so papers outside a domain do not pay for
+that specialist's LLM calls.
+"""
+
+import logging
+import math
+from collections import Counter
+from typing import List, Dict, Any, Optional
+
+from context_slicing import DOMAIN_KEYWORDS, tokenize
+
+logger = logging.getLogger(__name__)
+
+
+def score_domains(paper_text: str, domains: Optional[List[str]] = None) -> Dict[str, float]:
+    """
+    Relevance of the paper to each domain: log-damped keyword frequency per
+    thousand words, normalized by vocabulary size so domains are comparable.
+    """
+    domains = domains or list(DOMAIN_KEYWORDS)
+    words = tokenize(paper_text)
+    counts = Counter(words)
+    per_thousand = 1000 / max(len(words), 1)
+
+    scores = {}
+    for domain in domains:
+        terms = set(tokenize(domain) + DOMAIN_KEYWORDS.get(domain, []))
+        score = sum(math.log1p(counts[term] * per_thousand) for term in terms)
+        scores[domain] = round(score / math.sqrt(len(terms)), 4) if terms else 0.0
+    return scores
+
+
+def route_domains(paper_text: str, min_specialists: int = 3, max_specialists: int = 5,
+                  relative_threshold: float = 0.35, domains: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Choose which specialists to deploy. The top min_specialists domains are always
+    kept; further domains up to max_specialists are added while their score is at
+    least relative_threshold of the best domain's score.
+    """
+    scores = score_domains(paper_text, domains)
+    ranked = sorted(scores, key=lambda domain: scores[domain], reverse=True)
+    min_specialists = max(1, min(min_specialists, len(ranked)))
+    max_specialists = max(min_specialists, min(max_specialists, len(ranked)))
+
+    top_score = scores[ranked[0]] if ranked else 0.0
+    selected = ranked[:min_specialists]
+    for domain in ranked[min_specialists:max_specialists]:
+        if top_score and scores[domain] >= relative_threshold * top_score:
+            selected.append(domain)
+
+    decision = {
+        "selected": selected,
+        "skipped": [domain for domain in ranked if domain not in selected],
+        "scores": {domain: scores[domain] for domain in ranked},
+        "min_specialists": min_specialists,
+        "max_specialists": max_specialists,
+        "relative_threshold": relative_threshold,
+    }
+    logger.info("Routing decision: deploy %s; skip %s; scores %s",
+                decision["selected"], decision["skipped"], decision["scores"])
+    return decision
@@ -1,6 +1,10 @@
 from crewai import Task, Agent
 from pydantic import BaseModel, Field
-from typing import Literal, List
+from typing import Literal, List, Optional, Dict, Any
+from context_slicing import slice_context
+
+# Bump when task prompts change so checkpoints from older prompts are not resumed
+PROMPT_VERSION = "2"
 
 
 # pydantic model for the final, structured output
@@ -9,8 +13,25 @@ class PublicationDecision(BaseModel):
     justification: str = Field(description="A concise, one-paragraph justification for the decision based on the synthesized report.")
 
 
-def create_analysis_task(agent_instance: Agent, domain: str, paper_text: str = "", figure_paths: str = "") -> Task:
-    """ Create a standardized multimodal analysis task for a specialist agent """
+def create_analysis_task(agent_instance: Agent, domain: str, paper_text: str = "", figure_paths: str = "",
+                         paper_sections: Optional[List[Dict[str, Any]]] = None,
+                         token_budget: Optional[int] = None, claim_evidence: Optional[str] = None) -> Task:
+    """ Create a standardized multimodal analysis task for a specialist agent.
+    When paper_sections and token_budget are given, the specialist only sees the abstract
+    plus the sections most relevant to its domain instead of the full paper_text.
+    claim_evidence is the centrally collected verification evidence (see claims.py); with it,
+    specialists cite the shared evidence instead of searching for each claim themselves. """
+    if paper_sections and token_budget:
+        paper_text = slice_context(paper_sections, domain, token_budget)
+    if claim_evidence:
+        verification = (
+            "The paper's key claims have already been extracted and searched centrally; the evidence is below. "
+            "Base your verification of at least three key claims on it and cite its sources. Only use your web search "
+            "tool for a claim critical to your domain that the evidence does not cover.\n\n"
+            f"--- PRE-COLLECTED CLAIM EVIDENCE ---\n{claim_evidence}\n--- END OF EVIDENCE ---"
+        )
+    else:
+        verification = "Use your web search tool to verify at least three key claims and check for reproducibility concerns."
     return Task(
         description=(
             f"As an elite {domain} scientific reviewer, conduct an uncompromising, rigorous analysis of the provided research paper. You are part of a movement to restore scientific publishing to its noble purpose. Evaluate this paper based on the highest standards of scientific integrity: methodological rigor, reproducibility, genuine novelty, logical consistency, and intellectual honesty.\n\n"
@@ -24,7 +45,8 @@ def create_analysis_task(agent_instance: Agent, domain: str, paper_text: str = "
             "• Appropriate scope and realistic claims\n"
             "• Ethical considerations and conflicts of interest\n"
             "• Evidence of p-hacking, selective reporting, or data manipulation\n\n"
-            "Reject the current paradigm of publishing for clicks, citations, or commercial interests. Your mission is to uphold the highest standards of scientific integrity. Use your web search tool to verify at least three key claims and check for reproducibility concerns."
+            "Reject the current paradigm of publishing for clicks, citations, or commercial interests. Your mission is to uphold the highest standards of scientific integrity. "
+            f"{verification}"
         ),
         expected_output=(
             "Write your response in proper markdown format with the following five sections:\n\n"
@@ -53,11 +75,16 @@ def create_analysis_task(agent_instance: Agent, domain: str, paper_text: str = "
         async_execution=True  # Enable parallel execution for specialist tasks
     )
 
-def get_tasks(agents: dict, paper_text: str = "", figure_paths: str = "") -> List[Task]:
+def get_tasks(agents: dict, paper_text: str = "", figure_paths: str = "",
+              paper_sections: Optional[List[Dict[str, Any]]] = None, token_budget: Optional[int] = None,
+              claim_evidence: Optional[str] = None) -> List[Task]:
     """ Create a list of all tasks for the crew with proper dependencies for parallel execution"""
 
     specialist_agents = {k: v for k, v in agents.items() if k not in ['compiler', 'editor']}
-    analysis_tasks = [create_analysis_task(agent, domain, paper_text, figure_paths) for domain, agent in specialist_agents.items()]
+    analysis_tasks = [
+        create_analysis_task(agent, domain, paper_text, figure_paths, paper_sections, token_budget, claim_evidence)
+        for domain, agent in specialist_agents.items()
+    ]
 
     synthesis_task = Task(
         description="Synthesize the independent elite specialist reviews into one comprehensive, uncompromising scientific assessment. You are part of the movement to restore scientific publishing to its noble purpose. Your synthesis must maintain the highest standards of scientific integrity, highlighting both genuine contributions and critical flaws identified by the specialist reviewers. Do not sugar-coat serious scientific concerns or downplay methodological flaws.",
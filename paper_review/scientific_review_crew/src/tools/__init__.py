@@ -4,10 +4,23 @@ Tools for Elite Scientific Review Crew
 This module contains specialized tools for PDF processing and web search verification.
 """
 
-from .pdf_tools import PDFTool
+from .pdf_tools import PDFTool, RenderProfile
+from .page_cache import PageImageCache
+from .rate_limiter import RateLimiter
+from .search_backends import SearchBackend, LocalSearchBackend, build_index
+from .search_cache import SearchCache
 from .search_tools import WebSearchCitationTool
+from .structure_tools import PaperStructureTool
 
 __all__ = [
     "PDFTool",
-    "WebSearchCitationTool"
+    "RenderProfile",
+    "PageImageCache",
+    "RateLimiter",
+    "SearchBackend",
+    "LocalSearchBackend",
+    "build_index",
+    "SearchCache",
+    "WebSearchCitationTool",
+    "PaperStructureTool"
 ]
@@ -0,0 +1,121 @@
+import hashlib
+import os
+import time
+import uuid
+from typing import Optional
+
+
+def hash_pdf(pdf_path: str, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a PDF's bytes"""
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def matrix_key(matrix) -> str:
+    """Stable filename fragment for a fitz.Matrix zoom (e.g. '3x3')"""
+    return f"{matrix.a:g}x{matrix.d:g}"
+
+
+class PageImageCache:
+    """
+    Content-addressed on-disk cache for rendered page images.
+
+    Images live at <cache_dir>/<pdf hash>/page_<n>_<variant>.<ext>, so identical
+    uploads share images and different papers never overwrite each other.
+    File mtimes double as LRU timestamps: hits touch the file and eviction
+    removes the least recently used images once the cache exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir: str = "output/page_cache", max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path_for(self, doc_hash: str, page_num: int, variant: str, ext: str = "png") -> str:
+        """Path of the cached image for a 0-based page index and render variant"""
+        return os.path.join(self.cache_dir, doc_hash, f"page_{page_num + 1}_{variant}.{ext}")
+
+    def lookup(self, doc_hash: str, page_num: int, variant: str, ext: str = "png") -> Optional[str]:
+        """Return the cached image path and mark it recently used, or None on a miss"""
+        path = self.path_for(doc_hash, page_num, variant, ext)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def store(self, pixmap, doc_hash: str, page_num: int, variant: str, ext: str = "png",
+              quality: Optional[int] = None) -> str:
+        """Atomically save a rendered pixmap into the cache and return its path"""
+        path = self.path_for(doc_hash, page_num, variant, ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a unique temp name first so concurrent renders never expose partial files
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            if ext == "webp":
+                # MuPDF has no WebP encoder; go through Pillow
+                pixmap.pil_save(tmp_path, format="WEBP", quality=quality or 80)
+            elif ext == "jpg":
+                pixmap.save(tmp_path, output="jpg", jpg_quality=quality or 95)
+            else:
+                pixmap.save(tmp_path, output=ext)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return path
+
+    def size(self) -> int:
+        """Total bytes currently held in the cache"""
+        return sum(os.path.getsize(path) for path, _ in self._entries())
+
+    def evict(self, keep: Optional[str] = None, min_age_seconds: float = 0.0) -> int:
+        """
+        Remove least recently used images until the cache fits max_bytes; returns bytes freed.
+        Images of the document hash `keep` and images used within min_age_seconds are never
+        removed, since a review may still be about to send them to the model.
+        """
+        entries = []
+        total = 0
+        cutoff = time.time() - min_age_seconds
+        for path, stat in self._entries():
+            total += stat.st_size
+            recently_used = min_age_seconds and stat.st_mtime > cutoff
+            if not recently_used and not (keep and os.path.basename(os.path.dirname(path)) == keep):
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                freed += size
+            except FileNotFoundError:
+                pass
+
+        self._prune_empty_dirs()
+        return freed
+
+    def _entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    yield path, os.stat(path)
+                except FileNotFoundError:
+                    continue
+
+    def _prune_empty_dirs(self):
+        for name in os.listdir(self.cache_dir):
+            doc_dir = os.path.join(self.cache_dir, name)
+            if os.path.isdir(doc_dir) and not os.listdir(doc_dir):
+                try:
+                    os.rmdir(doc_dir)
+                except OSError:
+                    pass
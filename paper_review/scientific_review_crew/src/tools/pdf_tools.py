@@ -1,7 +1,140 @@
 import fitz  # PyMuPDF
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from crewai.tools.base_tool import BaseTool
-from typing import List, Dict, Any
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Optional, Literal, Tuple, Iterator
+
+from .page_cache import PageImageCache, hash_pdf, matrix_key
+
+
+class RenderProfile(BaseModel):
+    """How page images are rasterized and encoded"""
+    dpi: int = Field(default=216, description="Target resolution for pages with figures (216 dpi = 3x zoom).")
+    text_dpi: Optional[int] = Field(default=144, description="Lower resolution for text-dominated pages; None disables.")
+    text_coverage_threshold: float = Field(
+        default=0.05,
+        description="Max fraction of the page covered by images/drawings for a page to count as text-dominated."
+    )
+    grayscale: bool = False
+    image_format: Literal["png", "jpeg", "webp"] = "png"
+    quality: int = Field(default=85, ge=1, le=100, description="Encoder quality for JPEG/WebP.")
+
+    @property
+    def extension(self) -> str:
+        return "jpg" if self.image_format == "jpeg" else self.image_format
+
+    def dpi_for(self, page) -> int:
+        """Resolution to render this page at, dropping to text_dpi for text-dominated pages"""
+        if self.text_dpi is not None and _visual_coverage(page) <= self.text_coverage_threshold:
+            return min(self.dpi, self.text_dpi)
+        return self.dpi
+
+
+def _visual_coverage(page) -> float:
+    """Fraction of the page area covered by embedded images and vector drawings"""
+    page_area = abs(page.rect)
+    if not page_area:
+        return 0.0
+    boxes = [info["bbox"] for info in page.get_image_info()] + [drawing["rect"] for drawing in page.get_drawings()]
+    covered = sum(abs(fitz.Rect(box) & page.rect) for box in boxes)
+    return min(1.0, covered / page_area)
+
+
+def _create_page_image(page, page_num: int, cache: PageImageCache, doc_hash: str,
+                       profile: RenderProfile) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Create a page image for vision model input, reusing cached renders; returns (path, render stats)"""
+    stats = {"page_number": page_num + 1, "dpi": None, "bytes_written": 0, "render_time": 0.0, "cached": False}
+    try:
+        started = time.perf_counter()
+        dpi = profile.dpi_for(page)
+        mat = fitz.Matrix(dpi / 72, dpi / 72)
+        variant = f"{matrix_key(mat)}_{'gray' if profile.grayscale else 'rgb'}"
+        if profile.image_format != "png":
+            variant += f"_q{profile.quality}"
+        stats["dpi"] = dpi
+
+        cached_path = cache.lookup(doc_hash, page_num, variant, profile.extension)
+        if cached_path:
+            stats["cached"] = True
+            stats["render_time"] = time.perf_counter() - started
+            return cached_path, stats
+
+        colorspace = fitz.csGRAY if profile.grayscale else fitz.csRGB
+        pix = page.get_pixmap(matrix=mat, colorspace=colorspace, alpha=False)
+        image_path = cache.store(pix, doc_hash, page_num, variant, profile.extension, profile.quality)
+        stats["bytes_written"] = os.path.getsize(image_path)
+        stats["render_time"] = time.perf_counter() - started
+        return image_path, stats
+    except Exception as e:
+        print(f"Error creating page image for page {page_num + 1}: {e}")
+        return None, stats
+
+
+def _page_has_visuals(page, profile: RenderProfile) -> bool:
+    """
+    True if images or drawings cover more of the page than a text-dominated page may
+    (the renderer's own test); header rules, footnote lines and table borders do not count
+    """
+    return _visual_coverage(page) > profile.text_coverage_threshold
+
+
+def _extract_page(page, page_num: int, cache: Optional[PageImageCache], doc_hash: Optional[str],
+                  profile: RenderProfile, lazy: bool = False, with_text: bool = True) -> Dict[str, Any]:
+    """Extract the text and page image of a single page into a page record"""
+    # Callers that parse the text themselves (see structure_tools.py) skip the plain-text pass
+    page_text = page.get_text() if with_text else ""
+    page_data = {
+        "page_number": page_num + 1,
+        "text": page_text,
+        "image_path": None,
+        "text_length": len(page_text),
+        "has_content": len(page_text.strip()) > 0
+    }
+    if lazy:
+        # Defer rasterization; consumers render visual pages on demand via PDFTool.render_pages
+        page_data["has_visuals"] = _page_has_visuals(page, profile)
+    else:
+        page_data["image_path"], page_data["render_stats"] = _create_page_image(page, page_num, cache, doc_hash, profile)
+    return page_data
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int, cache: Optional[PageImageCache], doc_hash: Optional[str],
+                        profile: RenderProfile, lazy: bool = False, with_text: bool = True) -> List[Dict[str, Any]]:
+    """Worker entry point: open a private document handle and extract pages [start, stop)"""
+    doc = fitz.open(pdf_path)
+    try:
+        return [
+            _extract_page(doc[page_num], page_num, cache, doc_hash, profile, lazy, with_text)
+            for page_num in range(start, stop)
+        ]
+    finally:
+        doc.close()
+
+
+def _summarize_render_stats(render_stats: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summary fields describing how much image data was produced and how long it took"""
+    return {
+        "render_stats": render_stats,
+        "total_image_bytes": sum(s["bytes_written"] for s in render_stats),
+        "total_render_time": sum(s["render_time"] for s in render_stats),
+        "pages_from_cache": len([s for s in render_stats if s["cached"]])
+    }
+
+
+def _split_page_range(page_count: int, chunks: int) -> List[tuple]:
+    """Split range(page_count) into at most `chunks` contiguous (start, stop) ranges"""
+    chunks = max(1, min(chunks, page_count))
+    size, extra = divmod(page_count, chunks)
+    ranges = []
+    start = 0
+    for i in range(chunks):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
 
 class PDFTool(BaseTool):
     name: str = "Page-Based PDF Processor"
@@ -10,59 +143,114 @@ class PDFTool(BaseTool):
         "Optimized for AI analysis - provides high-quality page images and text for vision-language models. "
         "No image fragmentation - just complete pages that AI can understand."
     )
+    # Number of worker processes used to extract pages; 1 keeps extraction in-process
+    max_workers: int = 1
+    # Content-addressed page image cache shared across runs and documents
+    cache_dir: str = "output/page_cache"
+    cache_max_bytes: int = 512 * 1024 * 1024
+    # Images used this recently are kept even over cache_max_bytes (concurrent reviews may still send them)
+    cache_min_age_seconds: float = 600.0
+    # Extract text only and rasterize pages with images/drawings when a consumer asks for them
+    lazy: bool = False
+    # Resolution, colour and encoding used for page images
+    render_profile: RenderProfile = Field(default_factory=RenderProfile)
 
-    def _run(self, pdf_path: str) -> Dict[str, Any]:
+    def _run(self, pdf_path: str, max_workers: Optional[int] = None, lazy: Optional[bool] = None) -> Dict[str, Any]:
         if not os.path.exists(pdf_path):
             return {"pages": [], "error": f"File not found: {pdf_path}"}
-        
+
+        lazy = self.lazy if lazy is None else lazy
+        pages_data = list(self.iter_pages(pdf_path, max_workers=max_workers, lazy=lazy))
+
+        summary = {
+            "total_pages": len(pages_data),
+            "pages_with_content": len([p for p in pages_data if p["has_content"]]),
+            "total_text_length": sum(p["text_length"] for p in pages_data)
+        }
+        if lazy:
+            summary["pages_with_visuals"] = len([p for p in pages_data if p["has_visuals"]])
+        else:
+            render_stats = [p.pop("render_stats") for p in pages_data]
+            summary.update(_summarize_render_stats(render_stats))
+
+        return {
+            "pages": pages_data,
+            "summary": summary
+        }
+
+    def iter_pages(self, pdf_path: str, max_workers: Optional[int] = None,
+                   lazy: Optional[bool] = None, with_text: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Yield page records in page order as soon as each page is extracted.
+        Records match `_run`'s `pages` entries, plus `render_stats` when pages are rendered eagerly.
+        with_text=False leaves the text fields empty for callers that only need images and visuals.
+        """
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"File not found: {pdf_path}")
+
+        lazy = self.lazy if lazy is None else lazy
+        workers = max_workers if max_workers is not None else self.max_workers
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+
+        # Lazy extraction never renders, so skip hashing the document up front
+        cache, doc_hash = None, None
+        if not lazy:
+            cache = PageImageCache(self.cache_dir, self.cache_max_bytes)
+            doc_hash = hash_pdf(pdf_path)
+            # Make room before rendering: evicting afterwards could delete the pages just returned
+            cache.evict(keep=doc_hash, min_age_seconds=self.cache_min_age_seconds)
+
         doc = fitz.open(pdf_path)
-        pages_data = []
-        
-        # Create output directory
-        pages_dir = "output/pages"
-        os.makedirs(pages_dir, exist_ok=True)
-        
         try:
-            for page_num, page in enumerate(doc):
-                # Extract text from the page
-                page_text = page.get_text()
-                
-                # Create high-quality page image
-                page_image_path = self._create_page_image(page, page_num, pages_dir)
-                
-                # Create page data structure
-                page_data = {
-                    "page_number": page_num + 1,
-                    "text": page_text,
-                    "image_path": page_image_path,
-                    "text_length": len(page_text),
-                    "has_content": len(page_text.strip()) > 0
-                }
-                
-                pages_data.append(page_data)
-        
+            if workers > 1 and doc.page_count > 1:
+                yield from self._iter_parallel(pdf_path, doc.page_count, workers, cache, doc_hash, lazy, with_text)
+            else:
+                for page_num, page in enumerate(doc):
+                    yield _extract_page(page, page_num, cache, doc_hash, self.render_profile, lazy, with_text)
         finally:
             doc.close()
-        
-        return {
-            "pages": pages_data,
-            "summary": {
-                "total_pages": len(pages_data),
-                "pages_with_content": len([p for p in pages_data if p["has_content"]]),
-                "total_text_length": sum(p["text_length"] for p in pages_data)
-            }
-        }
-    
-    def _create_page_image(self, page, page_num: int, output_dir: str) -> str:
-        """Create a high-quality page image for vision model input"""
+
+    def render_pages(self, pdf_path: str, page_numbers: List[int],
+                     render_stats: Optional[List[Dict[str, Any]]] = None) -> Dict[int, Optional[str]]:
+        """
+        Rasterize the given 1-based page numbers on demand, returning {page_number: image_path}.
+        Per-page render stats are appended to `render_stats` when a list is supplied.
+        """
+        cache = PageImageCache(self.cache_dir, self.cache_max_bytes)
+        doc_hash = hash_pdf(pdf_path)
+        cache.evict(keep=doc_hash, min_age_seconds=self.cache_min_age_seconds)
+        image_paths = {}
+
+        doc = fitz.open(pdf_path)
         try:
-            # Use high resolution for better quality (3x zoom)
-            mat = fitz.Matrix(3.0, 3.0)
-            pix = page.get_pixmap(matrix=mat)
-            filename = f"page_{page_num+1}.png"
-            image_path = os.path.join(output_dir, filename)
-            pix.save(image_path)
-            return image_path
-        except Exception as e:
-            print(f"Error creating page image for page {page_num + 1}: {e}")
-            return None
+            for page_number in page_numbers:
+                image_paths[page_number], stats = _create_page_image(
+                    doc[page_number - 1], page_number - 1, cache, doc_hash, self.render_profile
+                )
+                if render_stats is not None:
+                    render_stats.append(stats)
+        finally:
+            doc.close()
+        return image_paths
+
+    def _iter_parallel(self, pdf_path: str, page_count: int, workers: int,
+                       cache: Optional[PageImageCache], doc_hash: Optional[str],
+                       lazy: bool = False, with_text: bool = True) -> Iterator[Dict[str, Any]]:
+        """Extract contiguous page ranges in worker processes and yield them back in page order"""
+        # Several small ranges per worker let the first pages stream out before the whole document is done
+        ranges = _split_page_range(page_count, workers * 4)
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+            futures = [
+                executor.submit(_extract_page_range, pdf_path, start, stop, cache, doc_hash, self.render_profile,
+                                lazy, with_text)
+                for start, stop in ranges
+            ]
+            for future in futures:
+                yield from future.result()
+
+    def _create_page_image(self, page, page_num: int, doc_hash: str) -> Optional[str]:
+        """Create a page image for vision model input using the tool's render profile"""
+        cache = PageImageCache(self.cache_dir, self.cache_max_bytes)
+        image_path, _ = _create_page_image(page, page_num, cache, doc_hash, self.render_profile)
+        return image_path
@@ -0,0 +1,78 @@
+import asyncio
+import os
+import sqlite3
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every thread and process using the same SQLite file.
+
+    The bucket refills at `rate` tokens per second up to `capacity`. Each call
+    reserves one token in a single IMMEDIATE transaction; when the bucket is
+    empty the balance goes negative and the caller sleeps until its token has
+    refilled, so concurrent callers queue up instead of all retrying at once.
+    """
+
+    def __init__(self, path: str = "output/search_rate_limit.sqlite", rate: float = 5.0,
+                 capacity: float = 10.0, name: str = "serper"):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.path = path
+        self.rate = rate
+        self.capacity = capacity
+        self.name = name
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode so BEGIN IMMEDIATE below takes the write lock explicitly
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _update(self, take: float, ceiling: Optional[float] = None) -> float:
+        """Refill, subtract `take` tokens and cap the balance at `ceiling`; returns the new balance"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (self.name,)).fetchone()
+            now = time.time()
+            tokens = self.capacity if row is None else min(self.capacity, row[0] + (now - row[1]) * self.rate)
+            tokens -= take
+            if ceiling is not None:
+                tokens = min(tokens, ceiling)
+            conn.execute("INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)", (self.name, tokens, now))
+            conn.execute("COMMIT")
+            return tokens
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def reserve(self) -> float:
+        """Reserve one token; returns the seconds to wait before using it (0.0 if available now)"""
+        return max(0.0, -self._update(1.0)) / self.rate
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def aacquire(self):
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def drain(self):
+        """Empty the bucket, e.g. after a 429, so every process slows down rather than only this caller"""
+        self._update(0.0, ceiling=0.0)
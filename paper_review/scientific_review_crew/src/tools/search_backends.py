@@ -0,0 +1,124 @@
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import sys
+from abc import ABC, abstractmethod
+from contextlib import closing
+from typing import Iterable, Iterator, List, Optional
+
+LOCAL_INDEX_ENV = "LOCAL_SEARCH_INDEX"
+
+
+class SearchBackend(ABC):
+    """
+    Interface for WebSearchCitationTool backends.
+
+    search() returns up to `limit` results as {"title", "link", "snippet"}
+    dicts, or an explanatory string when nothing was found. Backends that
+    answer locally set cacheable = False so the tool skips its result cache.
+    """
+
+    cacheable = True
+
+    @abstractmethod
+    def search(self, query: str, limit: int = 5) -> List[dict] | str:
+        """Up to `limit` results for the query, or a message when there are none"""
+
+    async def asearch(self, query: str, limit: int = 5) -> List[dict] | str:
+        return await asyncio.to_thread(self.search, query, limit)
+
+
+def read_corpus(corpus_path: str) -> Iterator[dict]:
+    """Documents from a JSONL file (one object per line) or a JSON array"""
+    with open(corpus_path, "r", encoding="utf-8") as f:
+        if corpus_path.endswith(".json"):
+            yield from json.load(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def build_index(documents: Iterable[dict], index_path: str, batch_size: int = 5000) -> int:
+    """
+    Build (or extend) an SQLite FTS5 index from documents with a title, a link or url,
+    and an abstract, text or snippet field; returns the number of documents added.
+    """
+    if os.path.dirname(index_path):
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    added = 0
+    with closing(sqlite3.connect(index_path)) as conn, conn:
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5("
+            "title, body, link UNINDEXED, tokenize='porter unicode61')"
+        )
+        batch = []
+        for doc in documents:
+            body = doc.get("abstract") or doc.get("text") or doc.get("snippet") or ""
+            batch.append((doc.get("title", ""), body, doc.get("link") or doc.get("url") or ""))
+            if len(batch) >= batch_size:
+                conn.executemany("INSERT INTO documents VALUES (?, ?, ?)", batch)
+                added += len(batch)
+                batch = []
+        if batch:
+            conn.executemany("INSERT INTO documents VALUES (?, ?, ?)", batch)
+            added += len(batch)
+        conn.execute("INSERT INTO documents(documents) VALUES ('optimize')")
+    return added
+
+
+def fts_query(query: str) -> str:
+    """Free text to an FTS5 OR-query of quoted terms, so BM25 ranks partial matches"""
+    terms = re.findall(r"\w+", query.lower())
+    return " OR ".join(f'"{term}"' for term in dict.fromkeys(terms))
+
+
+class LocalSearchBackend(SearchBackend):
+    """
+    Offline BM25 search over an SQLite FTS5 index built by build_index(),
+    e.g. from an arXiv or PubMed abstract dump. Titles weigh twice as much
+    as abstracts; snippets are the best-matching abstract fragment.
+    """
+
+    cacheable = False
+
+    def __init__(self, index_path: str, snippet_tokens: int = 40):
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(f"Search index not found: {index_path}")
+        self.index_path = index_path
+        self.snippet_tokens = snippet_tokens
+
+    def _connect(self) -> sqlite3.Connection:
+        # Read-only connection per query: cheap to open, safe across threads and nothing left open
+        return sqlite3.connect(f"file:{self.index_path}?mode=ro", uri=True)
+
+    def search(self, query: str, limit: int = 5) -> List[dict] | str:
+        match = fts_query(query)
+        if not match:
+            return "No search results found"
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT title, link, snippet(documents, 1, '', '', ' ... ', ?) FROM documents "
+                "WHERE documents MATCH ? ORDER BY bm25(documents, 2.0, 1.0) LIMIT ?",
+                (self.snippet_tokens, match, limit),
+            ).fetchall()
+        if not rows:
+            return "No search results found"
+        return [{"title": title, "link": link, "snippet": snippet} for title, link, snippet in rows]
+
+
+def backend_from_env() -> Optional[SearchBackend]:
+    """LocalSearchBackend when LOCAL_SEARCH_INDEX points at an index, else None (remote search)"""
+    index_path = os.getenv(LOCAL_INDEX_ENV)
+    return LocalSearchBackend(index_path) if index_path else None
+
+
+if __name__ == "__main__":
+    # Usage: python search_backends.py <corpus.jsonl|corpus.json> <index.sqlite>
+    if len(sys.argv) != 3:
+        print("Usage: python search_backends.py <corpus.jsonl|corpus.json> <index.sqlite>")
+        sys.exit(1)
+    count = build_index(read_corpus(sys.argv[1]), sys.argv[2])
+    print(f"[OK] Indexed {count} documents into {sys.argv[2]}")
@@ -0,0 +1,115 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+STOP_WORDS = frozenset((
+    "a", "an", "and", "are", "as", "at", "be", "by", "does", "for", "from", "has", "have", "how", "in", "is",
+    "it", "its", "of", "on", "or", "that", "the", "this", "to", "was", "were", "what", "which", "with",
+))
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, drop punctuation and stop words, collapse whitespace; word order is kept"""
+    words = re.findall(r"[\w.+-]+", query.lower())
+    kept = [word.strip(".") for word in words if word not in STOP_WORDS]
+    return " ".join(word for word in kept if word) or " ".join(words)
+
+
+class SearchCache:
+    """
+    Persistent cache of formatted search results keyed by normalized query.
+
+    Results live in SQLite (WAL mode, one connection per operation), so the
+    specialists of one review, later reviews and concurrent processes all see
+    the same entries. Entries older than ttl_seconds are misses and are deleted;
+    every write also evicts expired entries and then the least recently used
+    ones until the store is under max_bytes.
+    """
+
+    def __init__(self, path: str = "output/search_cache.sqlite", ttl_seconds: Optional[float] = 7 * 24 * 3600,
+                 max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+            if columns and "size" not in columns:
+                # Stores written before size eviction cannot be evicted by size; they are only a cache
+                conn.execute("DROP TABLE results")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, query TEXT NOT NULL, value TEXT NOT NULL, created REAL NOT NULL, "
+                "accessed REAL NOT NULL, size INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Commit and close: sqlite3's own context manager leaves the connection open
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, query: str) -> Optional[list]:
+        key = normalize_query(query)
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, created FROM results WHERE key = ?", (key,)).fetchone()
+            if row and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                row = None
+            if row:
+                conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+        with self._lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return json.loads(row[0]) if row else None
+
+    def put(self, query: str, results: list):
+        value = json.dumps(results)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                         (normalize_query(query), query, value, now, now, len(value.encode("utf-8"))))
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones until under max_bytes; returns rows removed"""
+        removed = 0
+        with self._connect() as conn:
+            if self.ttl_seconds is not None:
+                removed += conn.execute("DELETE FROM results WHERE created < ?",
+                                        (time.time() - self.ttl_seconds,)).rowcount
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                for key, size in conn.execute("SELECT key, size FROM results ORDER BY accessed").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                    total -= size
+                    removed += 1
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        lookups = hits + misses
+        return {"hits": hits, "misses": misses, "hit_rate": round(hits / lookups, 3) if lookups else 0.0, "entries": entries}
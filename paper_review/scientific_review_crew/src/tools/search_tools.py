@@ -1,42 +1,335 @@
+import asyncio
+import importlib.util
 import os
-import json
-import requests
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
 from crewai.tools.base_tool import BaseTool
-from typing import Dict, Any
+from pydantic import PrivateAttr
+
+from .search_backends import SearchBackend, backend_from_env
+from .rate_limiter import RateLimiter
+from .search_cache import SearchCache, normalize_query
+
+SERPER_URL = "https://google.serper.dev/search"
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+def _format_results(data: Dict[str, Any]) -> list[dict] | str:
+    search_results = data.get("organic", [])
+    if not search_results:
+        return "No search results found"
+    return [
+        {
+            "title": result.get("title", ""),
+            "link": result.get("link", ""),
+            "snippet": result.get("snippet", ""),
+        }
+        for result in search_results[:5]
+    ]
+
+
+async def _aclose_quietly(client: httpx.AsyncClient):
+    # Best effort: the pool's connections may already have been dropped with their loop
+    try:
+        await client.aclose()
+    except Exception:
+        pass
+
 
 class WebSearchCitationTool(BaseTool):
+    """
+    Serper web search over a pooled keep-alive connection.
+
+    One tool instance is shared by all specialists, so its httpx clients are
+    too: connections (HTTP/2 when the h2 package is installed) are reused
+    across calls and threads instead of paying a TCP/TLS handshake per query.
+    Results are cached on disk by normalized query (see search_cache.py), so
+    overlapping queries from different agents, reviews and processes are only
+    sent once per TTL; set cache_path to None to disable the cache.
+    A SearchBackend (see search_backends.py) replaces the Serper API, e.g. an
+    offline BM25 index; by default one is picked up from LOCAL_SEARCH_INDEX.
+    Serper requests draw from a token bucket shared across threads and
+    processes through rate_limit_path (None disables it), identical queries
+    already in flight wait for that request instead of sending their own, and
+    429/5xx responses are retried with jittered exponential backoff.
+    """
+
     name: str = "Web Search Citation Tool"
     description: str = (
         "Performs a web search for a given query and returns the top 5 results,"
         "each with a title, source URL (link), and a text snippet for citation"
     )
+    timeout: float = 10.0
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+    cache_path: Optional[str] = "output/search_cache.sqlite"
+    cache_ttl_seconds: Optional[float] = 7 * 24 * 3600
+    cache_max_bytes: int = 64 * 1024 * 1024
+    backend: Optional[Any] = None
+    rate_limit_path: Optional[str] = "output/search_rate_limit.sqlite"
+    rate_limit_per_second: float = 5.0
+    rate_limit_burst: float = 10.0
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
 
-    def _run(self, query: str) -> list[dict] | str:
+    _client: Optional[httpx.Client] = PrivateAttr(default=None)
+    _async_clients: Dict[int, tuple] = PrivateAttr(default_factory=dict)
+    _client_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _cache: Optional[SearchCache] = PrivateAttr(default=None)
+    _env_backend_checked: bool = PrivateAttr(default=False)
+    _rate_limiter: Optional[RateLimiter] = PrivateAttr(default=None)
+    _in_flight: Dict[str, Future] = PrivateAttr(default_factory=dict)
+
+    def _client_options(self) -> Dict[str, Any]:
+        limits = httpx.Limits(max_connections=self.max_connections,
+                              max_keepalive_connections=self.max_keepalive_connections,
+                              keepalive_expiry=self.keepalive_expiry)
+        # HTTP/2 needs the optional h2 package; fall back to keep-alive HTTP/1.1 without it
+        http2 = self.http2 and importlib.util.find_spec("h2") is not None
+        return {"limits": limits, "timeout": self.timeout, "http2": http2}
+
+    @property
+    def client(self) -> httpx.Client:
+        """Shared, thread-safe connection pool for synchronous searches"""
+        with self._client_lock:
+            if self._client is None or self._client.is_closed:
+                self._client = httpx.Client(**self._client_options())
+            return self._client
+
+    async def _async_client(self) -> httpx.AsyncClient:
+        # Async connections belong to the event loop that opened them, so keep one pool per loop;
+        # the loop is stored with its client so a new loop reusing a dead loop's id gets a fresh pool
+        loop = asyncio.get_running_loop()
+        with self._client_lock:
+            stale = self._pop_stale_async_clients(loop)
+            owner, client = self._async_clients.get(id(loop), (None, None))
+            if owner is not loop or client.is_closed:
+                client = httpx.AsyncClient(**self._client_options())
+                self._async_clients[id(loop)] = (loop, client)
+        for old_client in stale:
+            await _aclose_quietly(old_client)
+        return client
+
+    def _pop_stale_async_clients(self, current_loop=None) -> list:
+        """Remove and return the clients of closed loops (and of a dead loop whose id was reused)"""
+        stale = []
+        for key, (owner, client) in list(self._async_clients.items()):
+            if owner.is_closed() or (key == id(current_loop) and owner is not current_loop):
+                del self._async_clients[key]
+                stale.append(client)
+        return stale
+
+    @property
+    def cache(self) -> Optional[SearchCache]:
+        """Result cache shared through its SQLite file; created on first use"""
+        if self.cache_path is None:
+            return None
+        with self._client_lock:
+            if self._cache is None:
+                self._cache = SearchCache(self.cache_path, self.cache_ttl_seconds, self.cache_max_bytes)
+            return self._cache
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process and the number of cached queries"""
+        return self.cache.stats() if self.cache else {"hits": 0, "misses": 0, "hit_rate": 0.0, "entries": 0}
+
+    def _cached(self, query: str) -> Optional[list]:
+        return self.cache.get(query) if self.cache else None
+
+    def _store(self, query: str, results: list[dict] | str) -> list[dict] | str:
+        # Only real result lists are cached; errors and empty searches are retried next time
+        if self.cache and isinstance(results, list):
+            self.cache.put(query, results)
+        return results
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """Token bucket shared through its SQLite file; created on first use"""
+        if self.rate_limit_path is None:
+            return None
+        with self._client_lock:
+            if self._rate_limiter is None:
+                self._rate_limiter = RateLimiter(self.rate_limit_path, self.rate_limit_per_second,
+                                                 self.rate_limit_burst)
+            return self._rate_limiter
+
+    @property
+    def search_backend(self) -> Optional[SearchBackend]:
+        """The configured backend, or None for the Serper API"""
+        if self.backend is None and not self._env_backend_checked:
+            self._env_backend_checked = True
+            self.backend = backend_from_env()
+        return self.backend
+
+    def _request(self, query: str) -> Optional[Dict[str, Any]]:
         api_key = os.getenv("SERPER_API_KEY")
         if not api_key:
+            return None
+        return {"url": SERPER_URL, "json": {"q": query},
+                "headers": {'X-API-KEY': api_key, 'Content-Type': 'application/json'}}
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None when the outcome is final"""
+        if attempt >= self.max_retries:
+            return None
+        if response is not None and response.status_code not in RETRY_STATUSES:
+            return None
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        delay = random.uniform(delay / 2, delay)
+        retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+        if retry_after.replace(".", "", 1).isdigit():
+            delay = max(delay, min(self.backoff_max, float(retry_after)))
+        if response is not None and response.status_code == 429 and self.rate_limiter:
+            self.rate_limiter.drain()
+        return delay
+
+    def _post(self, request: Dict[str, Any]) -> httpx.Response:
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            try:
+                response = self.client.post(**request)
+            except httpx.TransportError:
+                delay = self._retry_delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(attempt, response)
+                if delay is None:
+                    response.raise_for_status()
+                    return response
+            time.sleep(delay)
+            attempt += 1
+
+    async def _apost(self, request: Dict[str, Any]) -> httpx.Response:
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                await self.rate_limiter.aacquire()
+            try:
+                response = await (await self._async_client()).post(**request)
+            except httpx.TransportError:
+                delay = self._retry_delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(attempt, response)
+                if delay is None:
+                    response.raise_for_status()
+                    return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _join_or_lead(self, query: str) -> tuple[str, Future, bool]:
+        # The first caller for a normalized query leads; later callers wait on its future
+        key = normalize_query(query)
+        with self._client_lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return key, future, False
+            future = self._in_flight[key] = Future()
+            return key, future, True
+
+    def _finish(self, key: str, future: Future, result=None, error: Optional[BaseException] = None):
+        with self._client_lock:
+            self._in_flight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _coalesced(self, query: str, fetch: Callable[[], list[dict] | str]) -> list[dict] | str:
+        key, future, leader = self._join_or_lead(query)
+        if not leader:
+            return future.result()
+        try:
+            result = fetch()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def _acoalesced(self, query: str, fetch: Callable[[], Awaitable[list[dict] | str]]) -> list[dict] | str:
+        key, future, leader = self._join_or_lead(query)
+        if not leader:
+            return await asyncio.wrap_future(future)
+        try:
+            result = await fetch()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    def _fetch(self, query: str) -> list[dict] | str:
+        backend = self.search_backend
+        if backend is not None:
+            return self._store(query, backend.search(query))
+        request = self._request(query)
+        if request is None:
             return "Error: SERPER_API_KEY environment variable is not set"
-        
-        url = "https://google.serper.dev/search"
-        payload = json.dumps({"q": query})
-        headers = {'X-API-KEY': api_key, 'Content-Type': 'application/json'}
+        try:
+            return self._store(query, _format_results(self._post(request).json()))
+        except httpx.HTTPError as e:
+            return f"Error performing web search: {str(e)}"
 
+    async def _afetch(self, query: str) -> list[dict] | str:
+        backend = self.search_backend
+        if backend is not None:
+            return self._store(query, await backend.asearch(query))
+        request = self._request(query)
+        if request is None:
+            return "Error: SERPER_API_KEY environment variable is not set"
         try:
-            response = requests.post(url, headers=headers, data=payload, timeout=10)
-            response.raise_for_status()
-            search_results = response.json().get("organic", [])
-
-            if not search_results:
-                return "No search results found"
-
-            formatted_results = []
-            for result in search_results[:5]:
-                formatted_results.append({
-                    "title": result.get("title", ""),
-                    "link": result.get("link", ""),
-                    "snippet": result.get("snippet", ""),
-                })
-
-            return formatted_results
-        except requests.exceptions.RequestException as e:
+            return self._store(query, _format_results((await self._apost(request)).json()))
+        except httpx.HTTPError as e:
             return f"Error performing web search: {str(e)}"
-        
\ No newline at end of file
+
+    def _run(self, query: str) -> list[dict] | str:
+        backend = self.search_backend
+        if backend is not None and not backend.cacheable:
+            return backend.search(query)
+        cached = self._cached(query)
+        if cached is not None:
+            return cached
+        return self._coalesced(query, lambda: self._fetch(query))
+
+    async def _arun(self, query: str) -> list[dict] | str:
+        backend = self.search_backend
+        if backend is not None and not backend.cacheable:
+            return await backend.asearch(query)
+        cached = self._cached(query)
+        if cached is not None:
+            return cached
+        return await self._acoalesced(query, lambda: self._afetch(query))
+
+    def close(self):
+        """
+        Close the synchronous pool and the async pools of event loops that have finished.
+        Pools of loops still running are closed by the next async search on another loop,
+        or by calling close() again once their loop has ended.
+        """
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+            stale = self._pop_stale_async_clients()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for client in stale:
+            if running is not None:
+                running.create_task(_aclose_quietly(client))
+            else:
+                asyncio.run(_aclose_quietly(client))
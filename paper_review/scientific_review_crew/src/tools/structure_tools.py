@@ -0,0 +1,245 @@
+import fitz  # PyMuPDF
+import os
+import re
+from collections import Counter
+from crewai.tools.base_tool import BaseTool
+from typing import List, Dict, Any
+
+# Headings that are recognised regardless of font size
+KNOWN_HEADINGS = {
+    "abstract", "introduction", "background", "related work", "method", "methods", "methodology",
+    "materials and methods", "experiments", "experimental setup", "results", "discussion",
+    "results and discussion", "conclusion", "conclusions", "limitations", "future work",
+    "acknowledgements", "acknowledgments", "references", "bibliography", "appendix",
+    "supplementary material",
+}
+REFERENCE_HEADINGS = {"references", "bibliography", "works cited", "literature cited"}
+NUMBERED_HEADING = re.compile(r"^(\d+(\.\d+)*\.?|[IVX]+\.|[A-Z]\.)\s+[A-Z][^.]{1,80}$")
+CAPTION = re.compile(r"^(fig\.|figure|table)\s*(\d+|[IVX]+)[.:]?", re.IGNORECASE)
+REFERENCE_START = re.compile(r"^(\[\d+\]|\d+\.\s|\d+\s+[A-Z])")
+
+MARGIN_FRACTION = 0.08  # top/bottom band where running headers and footers live
+GUTTER_FRACTION = 0.12  # left/right band where line-number gutters live
+
+
+def _normalize_line(text: str) -> str:
+    """Normalize a margin line so running headers match across pages (page numbers vary)"""
+    return re.sub(r"\d+", "#", text.strip().lower())
+
+
+def _heading_key(text: str) -> str:
+    """Strip section numbering and punctuation from a heading for comparison"""
+    text = re.sub(r"^(\d+(\.\d+)*\.?|[IVX]+\.|[A-Z]\.)\s+", "", text.strip())
+    return text.rstrip(":.").strip().lower()
+
+
+def _page_lines(page, page_num: int) -> List[Dict[str, Any]]:
+    """Flatten a page's text dict into lines carrying font size, boldness and position"""
+    lines = []
+    for block_num, block in enumerate(page.get_text("dict")["blocks"]):
+        if block.get("type") != 0:
+            continue
+        for line in block["lines"]:
+            spans = [span for span in line["spans"] if span["text"].strip()]
+            if not spans:
+                continue
+            text = " ".join(span["text"].strip() for span in spans)
+            lines.append({
+                "text": text,
+                "size": round(max(span["size"] for span in spans), 1),
+                "bold": all(span["flags"] & 16 for span in spans),
+                "bbox": fitz.Rect(line["bbox"]),
+                "page_number": page_num + 1,
+                "block": (page_num, block_num),
+            })
+    return lines
+
+
+def _find_running_lines(pages: List[List[Dict[str, Any]]], heights: List[float]) -> set:
+    """Normalized margin lines that repeat on at least half of the pages"""
+    counts = Counter()
+    for lines, height in zip(pages, heights):
+        seen = set()
+        for line in lines:
+            if line["bbox"].y1 <= height * MARGIN_FRACTION or line["bbox"].y0 >= height * (1 - MARGIN_FRACTION):
+                seen.add(_normalize_line(line["text"]))
+        counts.update(seen)
+    threshold = max(2, (len(pages) + 1) // 2)
+    return {text for text, count in counts.items() if count >= threshold}
+
+
+def _is_margin_noise(line: Dict[str, Any], width: float, height: float, running: set) -> bool:
+    text = line["text"].strip()
+    in_margin = line["bbox"].y1 <= height * MARGIN_FRACTION or line["bbox"].y0 >= height * (1 - MARGIN_FRACTION)
+    if in_margin and (_normalize_line(text) in running or text.isdigit()):
+        return True
+    # Line-number gutters: bare integers hugging the left or right edge
+    in_gutter = line["bbox"].x1 <= width * GUTTER_FRACTION or line["bbox"].x0 >= width * (1 - GUTTER_FRACTION)
+    return in_gutter and text.isdigit()
+
+
+def _is_heading(line: Dict[str, Any], body_size: float) -> bool:
+    text = line["text"].strip()
+    if not text or len(text) > 100 or CAPTION.match(text):
+        return False
+    if _heading_key(text) in KNOWN_HEADINGS:
+        return True
+    if line["size"] >= body_size + 1.5 and not text.endswith("."):
+        return True
+    return line["bold"] and bool(NUMBERED_HEADING.match(text))
+
+
+def _split_references(lines: List[str]) -> List[str]:
+    """Group reference-list lines into entries starting at [n] / n. markers"""
+    entries = []
+    for text in lines:
+        if not entries or REFERENCE_START.match(text):
+            entries.append(text)
+        else:
+            entries[-1] += " " + text
+    return entries
+
+
+def _attach_figures(doc, captions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Pair each caption with the nearest image or drawing above or below it on its page"""
+    figures = []
+    for caption in captions:
+        page = doc[caption["page_number"] - 1]
+        visuals = [fitz.Rect(info["bbox"]) for info in page.get_image_info()]
+        visuals += [fitz.Rect(drawing["rect"]) for drawing in page.get_drawings()]
+        visuals = [rect for rect in visuals if not rect.is_empty and rect.width > 20 and rect.height > 20]
+        bbox = None
+        if visuals:
+            nearest = min(visuals, key=lambda rect: min(abs(rect.y1 - caption["bbox"].y0),
+                                                        abs(rect.y0 - caption["bbox"].y1)))
+            bbox = [round(v, 1) for v in nearest]
+        figures.append({
+            "label": CAPTION.match(caption["text"]).group(0).rstrip(".:").strip(),
+            "caption": caption["text"],
+            "page_number": caption["page_number"],
+            "bbox": bbox,
+        })
+    return figures
+
+
+def extract_paper_structure(pdf_path: str) -> Dict[str, Any]:
+    """
+    Split a paper into title, sections, figure captions and references.
+    Running headers/footers and line-number gutters are dropped along the way.
+    """
+    doc = fitz.open(pdf_path)
+    try:
+        pages = [_page_lines(page, page_num) for page_num, page in enumerate(doc)]
+        sizes = [(page.rect.width, page.rect.height) for page in doc]
+        running = _find_running_lines(pages, [height for _, height in sizes])
+
+        kept, removed = [], 0
+        for lines, (width, height) in zip(pages, sizes):
+            for line in lines:
+                if _is_margin_noise(line, width, height, running):
+                    removed += 1
+                else:
+                    kept.append(line)
+
+        size_weights = Counter()
+        for line in kept:
+            size_weights[line["size"]] += len(line["text"])
+        body_size = size_weights.most_common(1)[0][0] if size_weights else 10.0
+
+        # The title is the largest text on the first page
+        title, title_size = "", None
+        first_page = [line for line in kept if line["page_number"] == 1]
+        if first_page:
+            largest = max(line["size"] for line in first_page)
+            if largest > body_size:
+                title_size = largest
+                title = " ".join(line["text"] for line in first_page if line["size"] == largest)
+
+        sections: List[Dict[str, Any]] = []
+        captions: List[Dict[str, Any]] = []
+        reference_lines: List[str] = []
+        current = {"heading": "Front Matter", "page_number": 1, "lines": []}
+        in_references = False
+        caption_block = None
+
+        for line in kept:
+            text = line["text"].strip()
+            if line["page_number"] == 1 and line["size"] == title_size:
+                continue
+            if _is_heading(line, body_size):
+                in_references = _heading_key(text) in REFERENCE_HEADINGS
+                caption_block = None
+                if not in_references:
+                    sections.append(current)
+                    current = {"heading": text, "page_number": line["page_number"], "lines": []}
+                continue
+            if in_references:
+                reference_lines.append(text)
+                continue
+            if CAPTION.match(text):
+                caption_block = line["block"]
+                captions.append({"text": text, "page_number": line["page_number"], "bbox": line["bbox"]})
+                continue
+            if caption_block == line["block"]:
+                captions[-1]["text"] += " " + text
+                continue
+            current["lines"].append(text)
+        sections.append(current)
+
+        figures = _attach_figures(doc, captions)
+    finally:
+        doc.close()
+
+    sections = [
+        {"heading": s["heading"], "page_number": s["page_number"], "text": "\n".join(s["lines"])}
+        for s in sections if s["lines"] or s["heading"] != "Front Matter"
+    ]
+    abstract = next((s["text"] for s in sections if _heading_key(s["heading"]) == "abstract"), "")
+
+    return {
+        "title": title,
+        "abstract": abstract,
+        "sections": sections,
+        "figures": figures,
+        "references": _split_references(reference_lines),
+        "stats": {
+            "body_font_size": body_size,
+            "removed_margin_lines": removed,
+        },
+    }
+
+
+def format_structured_text(structure: Dict[str, Any], include_references: bool = False) -> str:
+    """Render an extracted structure as compact markdown for the review prompts"""
+    parts = []
+    if structure["title"]:
+        parts.append(f"# {structure['title']}")
+    for section in structure["sections"]:
+        parts.append(f"## {section['heading']}\n{section['text']}".rstrip())
+    if structure["figures"]:
+        figure_lines = [f"- {fig['caption']} (page {fig['page_number']})" for fig in structure["figures"]]
+        parts.append("## Figures and Tables\n" + "\n".join(figure_lines))
+    if structure["references"]:
+        if include_references:
+            parts.append("## References\n" + "\n".join(f"- {ref}" for ref in structure["references"]))
+        else:
+            parts.append(f"## References\n[{len(structure['references'])} references omitted]")
+    return "\n\n".join(parts)
+
+
+class PaperStructureTool(BaseTool):
+    name: str = "Structured Paper Extractor"
+    description: str = (
+        "Extracts a research paper's title, abstract, sections, figure captions and references from a PDF. "
+        "Drops running headers, footers and line-number gutters so only the scientific content remains."
+    )
+    include_references: bool = False
+
+    def _run(self, pdf_path: str) -> Dict[str, Any]:
+        if not os.path.exists(pdf_path):
+            return {"sections": [], "error": f"File not found: {pdf_path}"}
+
+        structure = extract_paper_structure(pdf_path)
+        structure["text"] = format_structured_text(structure, self.include_references)
+        structure["stats"]["structured_text_length"] = len(structure["text"])
+        return structure
@@ -0,0 +1,129 @@
+"""
+Tests for the multi-paper batch pipeline
+"""
+
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch import collect_pdfs, extract_decision, report_dir_names, run_pipeline, write_batch_summary
+
+
+def test_collect_pdfs_from_directory_and_manifests(tmp_path):
+    for name in ("b.pdf", "a.PDF", "notes.txt"):
+        (tmp_path / name).write_text("x")
+    assert collect_pdfs(str(tmp_path)) == [str(tmp_path / "a.PDF"), str(tmp_path / "b.pdf")]
+
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# papers\nb.pdf\n\n/abs/c.pdf\n")
+    assert collect_pdfs(str(manifest)) == [str(tmp_path / "b.pdf"), "/abs/c.pdf"]
+
+    json_manifest = tmp_path / "manifest.json"
+    json_manifest.write_text(json.dumps(["a.PDF"]))
+    assert collect_pdfs(str(json_manifest)) == [str(tmp_path / "a.PDF")]
+
+
+def test_report_dirs_are_unique_for_same_named_papers(tmp_path):
+    paths = [str(tmp_path / "2023" / "paper.pdf"), str(tmp_path / "2024" / "paper.pdf")]
+    assert report_dir_names(paths) == {paths[0]: "2023__paper", paths[1]: "2024__paper"}
+    assert report_dir_names([str(tmp_path / "only.pdf")]) == {str(tmp_path / "only.pdf"): "only"}
+
+
+def test_extract_decision():
+    assert extract_decision("After review the decision is: publish with minor revisions") == "PUBLISH"
+    assert extract_decision("REJECT - methodology is unsound") == "REJECT"
+    assert extract_decision(None) == "UNKNOWN"
+
+
+def test_pipeline_overlaps_extraction_with_reviews():
+    lock = threading.Lock()
+    events = []
+
+    def prepare(path):
+        with lock:
+            events.append(("extract_start", path, time.monotonic()))
+        time.sleep(0.05)
+        return {"paper_text": path}
+
+    def review(path, paper):
+        with lock:
+            events.append(("review_start", path, time.monotonic()))
+        time.sleep(0.2)
+        with lock:
+            events.append(("review_end", path, time.monotonic()))
+        return f"{path}: PUBLISH"
+
+    paths = [f"paper_{i}.pdf" for i in range(4)]
+    records = run_pipeline(paths, prepare, review, max_concurrent_papers=1)
+
+    assert [r["pdf_path"] for r in records] == paths
+    assert all(r["status"] == "ok" and r["decision"] == "PUBLISH" for r in records)
+    assert all(r["extract_seconds"] is not None and r["review_seconds"] is not None for r in records)
+
+    times = {(kind, path): at for kind, path, at in events}
+    # The second paper is extracted while the first one is still under review
+    assert times[("extract_start", "paper_1.pdf")] < times[("review_end", "paper_0.pdf")]
+    # Only one paper is extracted ahead of the review in flight
+    assert times[("extract_start", "paper_2.pdf")] >= times[("review_end", "paper_0.pdf")]
+
+
+def test_pipeline_records_failures_and_continues():
+    def prepare(path):
+        if path == "broken.pdf":
+            raise ValueError("not a PDF")
+        return {}
+
+    def review(path, paper):
+        if path == "flaky.pdf":
+            raise RuntimeError("LLM unavailable")
+        return "REJECT"
+
+    records = run_pipeline(["broken.pdf", "flaky.pdf", "good.pdf"], prepare, review, max_concurrent_papers=2)
+    assert [r["status"] for r in records] == ["extract_failed", "failed", "ok"]
+    assert records[0]["error"] == "not a PDF"
+    assert records[2]["decision"] == "REJECT"
+
+
+@pytest.mark.skipif(not hasattr(signal, "pthread_kill"), reason="needs POSIX signals")
+def test_pipeline_interrupt_does_not_wait_for_queued_reviews():
+    reviewed = []
+
+    def review(path, paper):
+        reviewed.append(path)
+        time.sleep(0.5)
+        return "PUBLISH"
+
+    # Other modules (crewai telemetry) may have replaced the handler that raises KeyboardInterrupt
+    previous_handler = signal.signal(signal.SIGINT, signal.default_int_handler)
+    # Ctrl-C while the first review runs and the second paper is queued behind it
+    threading.Timer(0.1, signal.pthread_kill, (threading.main_thread().ident, signal.SIGINT)).start()
+    start = time.monotonic()
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            run_pipeline([f"paper_{i}.pdf" for i in range(4)], lambda path: {}, review, max_concurrent_papers=1)
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+    assert time.monotonic() - start < 0.4
+
+    time.sleep(0.6)
+    assert reviewed == ["paper_0.pdf"]
+
+
+def test_write_batch_summary(tmp_path):
+    records = run_pipeline(["a.pdf", "b.pdf"], lambda path: {}, lambda path, paper: "PUBLISH")
+    summary_path = write_batch_summary(records, str(tmp_path), 1.5, {
+        "calls": 4, "peak_in_flight": 2, "overlap_factor": 1.8, "retries": 0})
+
+    summary = open(summary_path, encoding="utf-8").read()
+    assert "| a.pdf | ok | PUBLISH |" in summary
+    assert "peak 2 in flight" in summary
+    data = json.loads((tmp_path / "batch_summary.json").read_text())
+    assert data["papers"] == 2 and data["completed"] == 2
@@ -0,0 +1,81 @@
+"""
+Tests for central claim extraction and batched verification
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from claims import build_claim_evidence, claim_source_text, dedupe_claims, parse_claims, verify_claims
+
+
+class FakeLLM:
+    def __init__(self, response):
+        self.response = response
+        self.prompts = []
+
+    def call(self, messages):
+        self.prompts.append(messages[0]["content"])
+        return self.response
+
+
+class SlowSearchTool:
+    """Records how many searches overlap"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _run(self, query):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        if "unknown" in query:
+            return "No search results found"
+        return [{"title": f"Source for {query}", "link": "https://example.org", "snippet": "confirms it"}]
+
+
+def test_parse_claims_accepts_json_or_lists():
+    assert parse_claims('Here you go:\n["Claim one is stated here", "Claim two is stated here"]') == [
+        "Claim one is stated here", "Claim two is stated here"]
+    assert parse_claims("1. The model beats BERT on GLUE\n- Training took three days\nok") == [
+        "The model beats BERT on GLUE", "Training took three days"]
+
+
+def test_dedupe_merges_rephrased_claims():
+    claims = [
+        "The method reduces error rates by 40% on ImageNet",
+        "The method reduces the error rates by 40% on ImageNet.",
+        "Training requires 8 GPUs for two days",
+    ]
+    assert dedupe_claims(claims) == [claims[0], claims[2]]
+
+
+def test_claim_source_prefers_claim_bearing_sections():
+    sections = [{"heading": "Abstract", "text": "We show X."}, {"heading": "Methods", "text": "Long setup."},
+                {"heading": "Conclusion", "text": "X holds."}]
+    text = claim_source_text("full text", sections)
+    assert "We show X." in text and "X holds." in text and "Long setup." not in text
+
+
+def test_verification_runs_searches_concurrently_and_builds_evidence():
+    tool = SlowSearchTool()
+    claims = [f"Claim number {i} about graphene" for i in range(6)] + ["An unknown claim"]
+    evidence = verify_claims(claims, tool, max_concurrent=4)
+    assert tool.peak == 4
+    assert [item["claim"] for item in evidence] == claims
+
+    llm = FakeLLM('["Graphene conducts heat well", "Graphene conducts heat very well", "An unknown claim here"]')
+    block = build_claim_evidence(llm, "paper text", SlowSearchTool())
+    assert len(llm.prompts) == 1
+    assert block.count("### Claim") == 2
+    assert "[Source for Graphene conducts heat well](https://example.org)" in block
+    assert "No evidence retrieved (No search results found)" in block
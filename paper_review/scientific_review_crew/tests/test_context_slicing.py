@@ -0,0 +1,51 @@
+"""
+Tests for per-specialist context slicing
+"""
+
+import os
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from context_slicing import BM25, estimate_tokens, slice_context, tokenize
+
+SECTIONS = [
+    {"heading": "Abstract", "page_number": 1, "text": "We evaluate a screening model on hospital records."},
+    {"heading": "1 Clinical Cohort", "page_number": 1,
+     "text": "Patients admitted to the hospital were enrolled in a clinical trial.\n"
+             "Diagnosis and treatment outcomes were recorded for every patient."},
+    {"heading": "2 Convergence Proof", "page_number": 2,
+     "text": "Theorem 1 gives a bound on convergence.\nThe proof follows from the lemma and the matrix equation."},
+    {"heading": "3 Training", "page_number": 3,
+     "text": "The neural model was trained with a transformer language model and prompt tuning."},
+]
+
+
+def test_bm25_prefers_matching_documents():
+    bm25 = BM25([tokenize(s["text"]) for s in SECTIONS])
+    scores = bm25.scores(tokenize("theorem proof lemma"))
+    assert scores.index(max(scores)) == 2
+
+
+def test_slice_keeps_abstract_and_domain_sections():
+    medical = slice_context(SECTIONS, "medical", token_budget=60)
+    mathematics = slice_context(SECTIONS, "mathematics", token_budget=60)
+
+    assert medical.startswith("## Abstract\nWe evaluate a screening model")
+    assert "1 Clinical Cohort" in medical and "Convergence Proof" not in medical
+    assert "2 Convergence Proof" in mathematics and "Clinical Cohort" not in mathematics
+
+
+def test_slice_respects_token_budget():
+    sliced = slice_context(SECTIONS, "artificial intelligence", token_budget=40)
+    body = sliced.rsplit("\n\n[", 1)[0]
+
+    assert estimate_tokens(body) <= 40
+    assert "less relevant passages omitted" in sliced
+
+
+def test_large_budget_keeps_document_order():
+    sliced = slice_context(SECTIONS, "physics", token_budget=10_000)
+    headings = [line for line in sliced.splitlines() if line.startswith("## ")]
+    assert headings == ["## Abstract", "## 1 Clinical Cohort", "## 2 Convergence Proof", "## 3 Training"]
@@ -0,0 +1,111 @@
+"""
+Tests for the bounded specialist executor
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from executor import CallTimeoutError, SpecialistExecutor, is_rate_limit_error
+
+
+class FakeTask:
+    """Stands in for a crewai Task: execute_sync sleeps and can fail a few times first"""
+
+    def __init__(self, role, duration=0.05, failures=None):
+        self.agent = SimpleNamespace(role=role)
+        self.duration = duration
+        self.failures = list(failures or [])
+        self.contexts = []
+
+    def execute_sync(self, context=None):
+        self.contexts.append(context)
+        time.sleep(self.duration)
+        if self.failures:
+            raise self.failures.pop(0)
+        return SimpleNamespace(raw=f"{self.agent.role} review")
+
+
+def test_bounded_concurrency_and_order():
+    executor = SpecialistExecutor(max_in_flight=2, base_delay=0)
+    tasks = [FakeTask(f"Reviewer {i}") for i in range(6)]
+
+    outputs = executor.run_tasks(tasks)
+    report = executor.overlap_report()
+
+    assert [o.raw for o in outputs] == [f"Reviewer {i} review" for i in range(6)]
+    assert report["calls"] == 6
+    assert report["peak_in_flight"] == 2
+    assert report["overlap_factor"] > 1.2
+
+
+def test_rate_limit_errors_are_retried():
+    executor = SpecialistExecutor(max_in_flight=1, base_delay=0.001)
+    task = FakeTask("Reviewer", failures=[RuntimeError("429 RESOURCE_EXHAUSTED: quota exceeded")])
+
+    assert executor.run_task(task).raw == "Reviewer review"
+    assert executor.overlap_report()["retries"] == 1
+
+
+def test_other_errors_are_not_retried():
+    executor = SpecialistExecutor(max_in_flight=1, base_delay=0.001)
+    task = FakeTask("Reviewer", failures=[ValueError("bad prompt")])
+
+    with pytest.raises(ValueError):
+        executor.run_task(task)
+    assert len(task.contexts) == 1
+
+
+def test_call_timeout():
+    executor = SpecialistExecutor(max_in_flight=1, call_timeout=0.01, max_retries=0)
+    with pytest.raises(CallTimeoutError):
+        executor.run_task(FakeTask("Slow Reviewer", duration=0.2))
+
+
+def test_timed_out_call_is_not_run_twice():
+    executor = SpecialistExecutor(max_in_flight=1, call_timeout=0.1)
+    task = FakeTask("Slow Reviewer", duration=0.15)
+
+    assert executor.run_task(task).raw == "Slow Reviewer review"
+    assert len(task.contexts) == 1
+    report = executor.overlap_report()
+    assert report["late"] == 1 and report["retries"] == 0
+
+
+def test_other_calls_share_the_in_flight_cap():
+    executor = SpecialistExecutor(max_in_flight=1)
+    claim_task = FakeTask("Claim Extractor", duration=0.1)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        claims = pool.submit(executor.run_call, "Claim Extractor", claim_task.execute_sync)
+        review = pool.submit(executor.run_task, FakeTask("Reviewer", duration=0.1))
+        assert claims.result().raw == "Claim Extractor review" and review.result().raw == "Reviewer review"
+
+    report = executor.overlap_report()
+    assert report["calls"] == 2 and report["peak_in_flight"] == 1
+
+
+def test_is_rate_limit_error():
+    assert is_rate_limit_error(Exception("Too Many Requests"))
+    assert not is_rate_limit_error(threading.ThreadError("lock"))
+
+
+def test_kickoff_with_executor_feeds_context_forward():
+    from executor import kickoff_with_executor
+
+    specialists = [FakeTask("Physics"), FakeTask("Biology")]
+    synthesis, editorial = FakeTask("Compiler"), FakeTask("Editor")
+    crew = SimpleNamespace(tasks=[*specialists, synthesis, editorial])
+
+    result = kickoff_with_executor(crew, SpecialistExecutor(max_in_flight=2))
+
+    assert result.raw == "Editor review"
+    assert synthesis.contexts == ["Physics review\n\n----------\n\nBiology review"]
+    assert editorial.contexts == ["Compiler review"]
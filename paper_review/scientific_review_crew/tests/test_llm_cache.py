@@ -0,0 +1,80 @@
+"""
+Tests for the persistent LLM response cache
+"""
+
+import os
+import sys
+import time
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from crewai.llms.base_llm import BaseLLM, call_stop_override
+
+from llm_cache import CachedLLM, ResponseCache, cache_key
+
+
+class CountingLLM(BaseLLM):
+    """Fake model that numbers its responses so cache hits are visible"""
+
+    calls: int = 0
+    seen_stops: list = []
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None,
+             from_agent=None, response_model=None):
+        self.calls += 1
+        self.seen_stops.append(list(self.stop_sequences))
+        return f"response {self.calls}"
+
+
+def test_cache_key_covers_model_temperature_messages_and_tools():
+    messages = [{"role": "user", "content": "Review this paper"}]
+    key = cache_key("gemini", 0.1, messages)
+    assert key == cache_key("gemini", 0.1, [dict(m) for m in messages])
+    assert key != cache_key("gemini", 0.2, messages)
+    assert key != cache_key("other", 0.1, messages)
+    assert key != cache_key("gemini", 0.1, messages, tools=[{"name": "search"}])
+
+
+def test_cached_llm_reuses_identical_requests(tmp_path):
+    inner = CountingLLM(model="fake", temperature=0.1)
+    llm = CachedLLM(inner, ResponseCache(str(tmp_path / "cache.sqlite")))
+
+    assert llm.call("What is the method?") == "response 1"
+    assert llm.call("What is the method?") == "response 1"
+    assert llm.call("What are the results?") == "response 2"
+    assert inner.calls == 2
+    assert llm.cache.hits == 1 and llm.cache.misses == 2
+
+    # A second process (or a re-run) sees the same store
+    rerun = CachedLLM(CountingLLM(model="fake", temperature=0.1), ResponseCache(str(tmp_path / "cache.sqlite")))
+    assert rerun.call("What is the method?") == "response 1"
+
+
+def test_ttl_and_size_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl_seconds=0.05)
+    cache.put("old", "value")
+    time.sleep(0.1)
+    assert cache.get("old") is None
+
+    cache = ResponseCache(str(tmp_path / "sized.sqlite"), ttl_seconds=None, max_bytes=10)
+    cache.put("a", "12345")
+    time.sleep(0.01)
+    cache.put("b", "12345")
+    cache.get("a")  # a is now the most recently used entry
+    time.sleep(0.01)
+    cache.put("c", "12345")
+    assert cache.get("b") is None
+    assert cache.get("a") == "12345" and cache.get("c") == "12345"
+    assert cache.size() <= 10
+
+
+def test_stop_words_are_forwarded_per_call(tmp_path):
+    inner = CountingLLM(model="fake", temperature=0.1)
+    llm = CachedLLM(inner, ResponseCache(str(tmp_path / "cache.sqlite")))
+
+    with call_stop_override(llm, ["\nObservation:"]):
+        llm.call("Use a tool")
+    llm.call("Plain question")
+    assert inner.seen_stops == [["\nObservation:"], []]
+    assert inner.stop == [] and llm.stop == []
@@ -0,0 +1,177 @@
+"""
+Tests for the page-based PDF processor
+"""
+
+import os
+import sys
+
+import fitz
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tools.pdf_tools import PDFTool, _split_page_range
+
+
+def make_pdf(path, page_texts):
+    """Write a small PDF with one text block per page"""
+    doc = fitz.open()
+    for text in page_texts:
+        page = doc.new_page()
+        page.insert_text((72, 72), text)
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def sample_pdf(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return make_pdf(tmp_path / "paper.pdf", [f"Page {i + 1} body text" for i in range(5)])
+
+
+def test_split_page_range_covers_all_pages():
+    assert _split_page_range(5, 2) == [(0, 3), (3, 5)]
+    assert _split_page_range(2, 8) == [(0, 1), (1, 2)]
+    assert _split_page_range(7, 1) == [(0, 7)]
+
+
+def test_sequential_extraction(sample_pdf):
+    result = PDFTool()._run(sample_pdf)
+
+    assert result["summary"]["total_pages"] == 5
+    assert [p["page_number"] for p in result["pages"]] == [1, 2, 3, 4, 5]
+    assert "Page 3 body text" in result["pages"][2]["text"]
+    assert all(os.path.exists(p["image_path"]) for p in result["pages"])
+
+
+def test_parallel_extraction_matches_sequential(sample_pdf):
+    sequential = PDFTool()._run(sample_pdf)
+    parallel = PDFTool(max_workers=3)._run(sample_pdf)
+
+    for key in ("total_pages", "pages_with_content", "total_text_length"):
+        assert parallel["summary"][key] == sequential["summary"][key]
+    assert [p["image_path"] for p in parallel["pages"]] == [p["image_path"] for p in sequential["pages"]]
+    assert [p["text"] for p in parallel["pages"]] == [p["text"] for p in sequential["pages"]]
+    assert [p["page_number"] for p in parallel["pages"]] == [1, 2, 3, 4, 5]
+
+
+def test_missing_file():
+    result = PDFTool()._run("does_not_exist.pdf")
+    assert result["pages"] == []
+    assert "error" in result
+
+
+def test_page_images_are_reused_from_cache(sample_pdf, monkeypatch):
+    first = PDFTool()._run(sample_pdf)
+
+    def fail_render(*args, **kwargs):
+        raise AssertionError("page was re-rasterized despite a cache hit")
+
+    monkeypatch.setattr(fitz.Page, "get_pixmap", fail_render)
+    second = PDFTool()._run(sample_pdf)
+
+    assert [p["image_path"] for p in second["pages"]] == [p["image_path"] for p in first["pages"]]
+
+
+def test_different_papers_do_not_share_images(sample_pdf, tmp_path):
+    other_pdf = make_pdf(tmp_path / "other.pdf", ["A different paper"])
+    first = PDFTool()._run(sample_pdf)
+    second = PDFTool()._run(other_pdf)
+
+    assert first["pages"][0]["image_path"] != second["pages"][0]["image_path"]
+    assert os.path.exists(first["pages"][0]["image_path"])
+
+
+def test_cache_evicts_least_recently_used(sample_pdf, tmp_path):
+    from tools.page_cache import PageImageCache
+
+    PDFTool()._run(sample_pdf)
+    cache = PageImageCache("output/page_cache", max_bytes=0)
+    assert cache.size() > 0
+
+    cache.evict()
+    assert cache.size() == 0
+
+
+def test_eviction_keeps_the_pages_being_returned(sample_pdf, tmp_path):
+    other_pdf = make_pdf(tmp_path / "other.pdf", ["A different paper"])
+    first = PDFTool(cache_max_bytes=0)._run(sample_pdf)
+    # Another review's recent pages survive; this call's pages are never evicted under it
+    second = PDFTool(cache_max_bytes=0)._run(other_pdf)
+    assert all(os.path.exists(p["image_path"]) for p in first["pages"] + second["pages"])
+
+    third = PDFTool(cache_max_bytes=0, cache_min_age_seconds=0)._run(other_pdf)
+    assert not any(os.path.exists(p["image_path"]) for p in first["pages"])
+    assert all(os.path.exists(p["image_path"]) for p in third["pages"])
+
+
+def test_lazy_mode_renders_only_requested_visual_pages(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Introduction text only")
+    figure_page = doc.new_page()
+    figure_page.insert_text((72, 72), "Figure 1: a box")
+    figure_page.draw_rect(fitz.Rect(100, 100, 300, 300))
+    ruled_page = doc.new_page()
+    ruled_page.insert_text((72, 72), "Running header above a rule")
+    ruled_page.draw_line((72, 80), (540, 80))
+    ruled_page.draw_line((72, 700), (200, 700))
+    doc.save(tmp_path / "figures.pdf")
+    doc.close()
+    pdf_path = str(tmp_path / "figures.pdf")
+
+    pdf_tool = PDFTool(lazy=True)
+    result = pdf_tool._run(pdf_path)
+
+    # Header rules and footnote lines are not figures
+    assert [p["has_visuals"] for p in result["pages"]] == [False, True, False]
+    assert all(p["image_path"] is None for p in result["pages"])
+    assert result["summary"]["pages_with_visuals"] == 1
+    assert not os.path.exists("output/page_cache")
+
+    rendered = pdf_tool.render_pages(pdf_path, [2])
+    assert list(rendered) == [2]
+    assert os.path.exists(rendered[2])
+
+
+def test_render_profile_reports_bytes_and_time(sample_pdf):
+    from tools.pdf_tools import RenderProfile
+
+    profile = RenderProfile(dpi=150, text_dpi=72, grayscale=True, image_format="jpeg", quality=60)
+    result = PDFTool(render_profile=profile)._run(sample_pdf)
+    summary = result["summary"]
+
+    assert "render_stats" not in result["pages"][0]
+    assert len(summary["render_stats"]) == 5
+    # Text-only pages fall back to the lower text resolution
+    assert all(stats["dpi"] == 72 for stats in summary["render_stats"])
+    assert summary["total_image_bytes"] == sum(os.path.getsize(p["image_path"]) for p in result["pages"])
+    assert all(p["image_path"].endswith(".jpg") for p in result["pages"])
+
+    webp = PDFTool(render_profile=RenderProfile(image_format="webp"))._run(sample_pdf)
+    assert webp["pages"][0]["image_path"].endswith(".webp")
+    assert webp["summary"]["pages_from_cache"] == 0
+
+
+def test_iter_pages_streams_records_in_order(sample_pdf):
+    pages = PDFTool(lazy=True).iter_pages(sample_pdf)
+
+    first = next(pages)
+    assert first["page_number"] == 1
+    assert "Page 1 body text" in first["text"]
+    assert [p["page_number"] for p in pages] == [2, 3, 4, 5]
+
+    parallel = list(PDFTool(max_workers=2).iter_pages(sample_pdf))
+    assert [p["page_number"] for p in parallel] == [1, 2, 3, 4, 5]
+    assert all("render_stats" in p for p in parallel)
+
+    figures_only = list(PDFTool(lazy=True, max_workers=2).iter_pages(sample_pdf, with_text=False))
+    assert [p["text"] for p in figures_only] == [""] * 5
+    assert all("has_visuals" in p for p in figures_only)
+
+
+def test_iter_pages_missing_file():
+    with pytest.raises(FileNotFoundError):
+        next(PDFTool().iter_pages("does_not_exist.pdf"))
@@ -0,0 +1,37 @@
+"""
+Tests for specialist domain routing
+"""
+
+import os
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from router import route_domains, score_domains
+
+MATH_PAPER = (
+    "We prove a new theorem on the convergence of iterative matrix methods. "
+    "The proof relies on a lemma bounding the spectral radius, and a corollary "
+    "gives an explicit bound for every symmetric matrix equation. "
+) * 5
+
+
+def test_math_paper_scores_mathematics_highest():
+    scores = score_domains(MATH_PAPER)
+    assert max(scores, key=scores.get) == "mathematics"
+    assert scores["medical"] == 0.0
+
+
+def test_route_skips_irrelevant_domains():
+    cs_text = " The algorithm implementation is benchmarked for runtime, memory and complexity." * 4
+    decision = route_domains(MATH_PAPER + cs_text, min_specialists=1, max_specialists=4)
+
+    assert decision["selected"] == ["mathematics", "computer science"]
+    assert set(decision["selected"]) | set(decision["skipped"]) == set(decision["scores"])
+    assert "medical" in decision["skipped"]
+
+
+def test_route_always_keeps_minimum():
+    decision = route_domains("", min_specialists=3, max_specialists=5)
+    assert len(decision["selected"]) == 3
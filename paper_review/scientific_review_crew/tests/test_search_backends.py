@@ -0,0 +1,61 @@
+"""
+Tests for the offline BM25 search backend
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tools.search_backends import LocalSearchBackend, SearchBackend, build_index, fts_query, read_corpus
+from tools.search_tools import WebSearchCitationTool
+
+ABSTRACTS = [
+    {"title": "Graphene thermal conductivity", "url": "https://arxiv.org/abs/1",
+     "abstract": "We measure the thermal conductivity of suspended single-layer graphene at room temperature."},
+    {"title": "Protein folding with deep learning", "url": "https://arxiv.org/abs/2",
+     "abstract": "A neural network predicts protein structures with near-experimental accuracy."},
+    {"title": "Dark matter halo profiles", "url": "https://arxiv.org/abs/3",
+     "abstract": "Simulations of dark matter halos show cuspy density profiles."},
+]
+
+
+def make_index(tmp_path):
+    corpus = tmp_path / "abstracts.jsonl"
+    corpus.write_text("\n".join(json.dumps(doc) for doc in ABSTRACTS), encoding="utf-8")
+    index_path = str(tmp_path / "index.sqlite")
+    assert build_index(read_corpus(str(corpus)), index_path) == 3
+    return index_path
+
+
+def test_local_backend_ranks_with_bm25(tmp_path):
+    backend = LocalSearchBackend(make_index(tmp_path))
+    results = backend.search("Is graphene's thermal conductivity really that high?")
+    assert results[0]["title"] == "Graphene thermal conductivity"
+    assert results[0]["link"] == "https://arxiv.org/abs/1"
+    assert "thermal conductivity" in results[0]["snippet"]
+    assert set(results[0]) == {"title", "link", "snippet"}
+    assert backend.search("superconducting qubits") == "No search results found"
+    assert fts_query('"quoted" AND (x)') == '"quoted" OR "and" OR "x"'
+
+
+def test_backends_must_implement_search():
+    class NoSearch(SearchBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        NoSearch()
+
+
+def test_tool_uses_local_backend_from_environment(tmp_path, monkeypatch):
+    monkeypatch.delenv("SERPER_API_KEY", raising=False)
+    monkeypatch.setenv("LOCAL_SEARCH_INDEX", make_index(tmp_path))
+    tool = WebSearchCitationTool(cache_path=str(tmp_path / "cache.sqlite"))
+    results = tool._run("protein structure prediction")
+    assert results[0]["title"] == "Protein folding with deep learning"
+    # Local lookups bypass the result cache
+    assert tool.cache_stats()["misses"] == 0
@@ -0,0 +1,178 @@
+"""
+Tests for the pooled web search tool
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import httpx
+
+from tools.rate_limiter import RateLimiter
+from tools.search_cache import SearchCache, normalize_query
+from tools.search_tools import WebSearchCitationTool
+
+
+def serper(request):
+    query = request.read().decode()
+    organic = [{"title": f"Result {i}", "link": f"https://example.org/{i}", "snippet": query} for i in range(8)]
+    return httpx.Response(200, json={"organic": organic})
+
+
+def test_sync_searches_reuse_one_pool(monkeypatch):
+    monkeypatch.setenv("SERPER_API_KEY", "test-key")
+    tool = WebSearchCitationTool(max_connections=4, max_keepalive_connections=2, cache_path=None,
+                                 rate_limit_path=None)
+    options = tool._client_options()
+    assert options["limits"].max_connections == 4 and options["limits"].max_keepalive_connections == 2
+
+    tool._client = httpx.Client(transport=httpx.MockTransport(serper))
+    client = tool.client
+    results = tool._run("dark matter halo profiles")
+    assert len(results) == 5 and results[0]["link"] == "https://example.org/0"
+    tool._run("another claim")
+    assert tool.client is client
+
+
+def test_async_search_and_http_errors(monkeypatch):
+    monkeypatch.setenv("SERPER_API_KEY", "test-key")
+    tool = WebSearchCitationTool(cache_path=None, rate_limit_path=None, max_retries=0)
+
+    async def search():
+        loop = asyncio.get_running_loop()
+        tool._async_clients[id(loop)] = (loop, httpx.AsyncClient(transport=httpx.MockTransport(serper)))
+        return await tool._arun("claim")
+
+    assert [result["title"] for result in asyncio.run(search())][:2] == ["Result 0", "Result 1"]
+    (_, first_client), = tool._async_clients.values()
+
+    # A later loop drops and closes the pool of the loop that has finished
+    async def next_loop_client():
+        return await tool._async_client()
+
+    second_client = asyncio.run(next_loop_client())
+    assert first_client.is_closed and not second_client.is_closed
+    assert len(tool._async_clients) == 1
+    tool.close()
+    assert second_client.is_closed and not tool._async_clients
+
+    tool._client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+    assert tool._run("claim").startswith("Error performing web search")
+
+    monkeypatch.delenv("SERPER_API_KEY")
+    assert tool._run("claim") == "Error: SERPER_API_KEY environment variable is not set"
+
+
+def test_query_normalization():
+    assert normalize_query("  What is the  Hubble tension? ") == normalize_query("hubble TENSION")
+    assert normalize_query("the") == "the"
+
+
+def test_results_are_cached_across_tool_instances(monkeypatch, tmp_path):
+    monkeypatch.setenv("SERPER_API_KEY", "test-key")
+    requests_sent = []
+
+    def counting_serper(request):
+        requests_sent.append(request)
+        return serper(request)
+
+    cache_path = str(tmp_path / "search_cache.sqlite")
+    tool = WebSearchCitationTool(cache_path=cache_path, rate_limit_path=None)
+    tool._client = httpx.Client(transport=httpx.MockTransport(counting_serper))
+    first = tool._run("Is the Hubble tension real?")
+    assert tool._run("is the hubble tension real") == first
+    assert len(requests_sent) == 1
+    assert tool.cache_stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+
+    # Another agent, review or process sharing the file reuses the result
+    other = WebSearchCitationTool(cache_path=cache_path, rate_limit_path=None)
+    other._client = httpx.Client(transport=httpx.MockTransport(counting_serper))
+    assert other._run("hubble tension real") == first
+    assert len(requests_sent) == 1
+
+    # Expired entries are fetched again
+    assert SearchCache(cache_path, ttl_seconds=0).get("hubble tension real") is None
+
+
+def test_cache_deletes_expired_and_least_recently_used_entries(tmp_path):
+    path = str(tmp_path / "search_cache.sqlite")
+    result = [{"title": "t", "link": "https://example.org", "snippet": "x" * 100}]
+    SearchCache(path).put("old query", result)
+    assert SearchCache(path, ttl_seconds=0).get("old query") is None
+    assert SearchCache(path).stats()["entries"] == 0
+
+    cache = SearchCache(path, max_bytes=400)  # room for two entries
+    cache.put("first query", result)
+    cache.put("second query", result)
+    cache.get("first query")
+    cache.put("third query", result)
+    assert cache.get("first query") == result and cache.get("second query") is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_rate_limiter_is_shared_through_its_file(tmp_path):
+    path = str(tmp_path / "rate_limit.sqlite")
+    limiter = RateLimiter(path, rate=10.0, capacity=2)
+    assert limiter.reserve() == 0.0 and limiter.reserve() == 0.0
+    # A second limiter on the same file (e.g. another process) sees the emptied bucket and queues behind it
+    other = RateLimiter(path, rate=10.0, capacity=2)
+    assert 0.05 < other.reserve() <= 0.1
+    assert 0.15 < limiter.reserve() <= 0.2
+    limiter.drain()
+
+
+def test_retries_429_and_5xx_with_backoff(monkeypatch, tmp_path):
+    monkeypatch.setenv("SERPER_API_KEY", "test-key")
+    statuses = [429, 503]
+
+    def flaky_serper(request):
+        if statuses:
+            return httpx.Response(statuses.pop(0), headers={"Retry-After": "0"})
+        return serper(request)
+
+    tool = WebSearchCitationTool(cache_path=None, rate_limit_path=str(tmp_path / "rate_limit.sqlite"),
+                                 backoff_base=0.01)
+    tool._client = httpx.Client(transport=httpx.MockTransport(flaky_serper))
+    assert tool._run("claim")[0]["title"] == "Result 0"
+    assert not statuses
+
+    statuses.extend([500] * 3)
+    tool.max_retries = 2
+    assert tool._run("claim").startswith("Error performing web search")
+    assert len(statuses) == 0
+
+    # Client errors are not retried
+    tool._client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(401)))
+    assert tool._run("claim").startswith("Error performing web search")
+
+
+def test_identical_in_flight_queries_are_coalesced(monkeypatch):
+    monkeypatch.setenv("SERPER_API_KEY", "test-key")
+    requests_sent = []
+
+    def slow_serper(request):
+        requests_sent.append(request)
+        time.sleep(0.1)
+        return serper(request)
+
+    tool = WebSearchCitationTool(cache_path=None, rate_limit_path=None)
+    tool._client = httpx.Client(transport=httpx.MockTransport(slow_serper))
+    queries = ["Is the Hubble tension real?", "hubble tension real", "the Hubble tension, real", "dark matter"]
+    results = [None] * len(queries)
+
+    def search(i):
+        results[i] = tool._run(queries[i])
+
+    threads = [threading.Thread(target=search, args=(i,)) for i in range(len(queries))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(requests_sent) == 2
+    assert results[0] == results[1] == results[2] and results[3] != results[0]
+    assert not tool._in_flight
@@ -0,0 +1,76 @@
+"""
+Tests for the structured paper extractor
+"""
+
+import os
+import sys
+
+import fitz
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tools.structure_tools import PaperStructureTool
+
+
+@pytest.fixture
+def structured_pdf(tmp_path):
+    """Three-page paper with a running header, page-number footers and a line-number gutter"""
+    doc = fitz.open()
+    for n in range(3):
+        page = doc.new_page()
+        page.insert_text((72, 30), "Journal of Reproducible Tests 2025", fontsize=8)
+        page.insert_text((300, 820), str(n + 1), fontsize=8)
+        for i in range(5):
+            page.insert_text((20, 120 + i * 20), str(n * 5 + i + 1), fontsize=7)
+        if n == 0:
+            page.insert_text((72, 80), "A Study of Things", fontsize=20)
+            page.insert_text((72, 120), "Abstract", fontsize=14)
+            page.insert_text((72, 140), "We study things carefully and report results.", fontsize=10)
+            page.insert_text((72, 180), "1 Introduction", fontsize=14)
+            page.insert_text((72, 200), "Things matter because of reasons.", fontsize=10)
+        elif n == 1:
+            page.insert_text((72, 120), "2 Methods", fontsize=14)
+            page.insert_text((72, 140), "We measured things with a ruler.", fontsize=10)
+            page.draw_rect(fitz.Rect(100, 200, 400, 400))
+            page.insert_text((72, 420), "Figure 1: Measured things over time.", fontsize=9)
+        else:
+            page.insert_text((72, 120), "References", fontsize=14)
+            page.insert_text((72, 140), "[1] Smith J. Things. 2020.", fontsize=9)
+            page.insert_text((72, 155), "[2] Doe A. More things.", fontsize=9)
+            page.insert_text((72, 170), "Journal of Stuff.", fontsize=9)
+    path = tmp_path / "structured.pdf"
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+def test_sections_and_abstract(structured_pdf):
+    structure = PaperStructureTool()._run(structured_pdf)
+
+    assert structure["title"] == "A Study of Things"
+    assert [s["heading"] for s in structure["sections"]] == ["Abstract", "1 Introduction", "2 Methods"]
+    assert structure["abstract"] == "We study things carefully and report results."
+
+
+def test_drops_running_headers_footers_and_gutters(structured_pdf):
+    structure = PaperStructureTool()._run(structured_pdf)
+
+    assert "Journal of Reproducible Tests" not in structure["text"]
+    assert not any(line.strip().isdigit() for line in structure["text"].splitlines())
+    assert structure["stats"]["removed_margin_lines"] == 21
+
+
+def test_references_and_figures_are_separated(structured_pdf):
+    structure = PaperStructureTool()._run(structured_pdf)
+
+    assert structure["references"] == ["[1] Smith J. Things. 2020.", "[2] Doe A. More things. Journal of Stuff."]
+    assert "Smith J." not in structure["text"]
+    assert structure["figures"] == [{
+        "label": "Figure 1",
+        "caption": "Figure 1: Measured things over time.",
+        "page_number": 2,
+        "bbox": [100.0, 200.0, 400.0, 400.0],
+    }]
+    assert "Measured things over time. (page 2)" in structure["text"]